@@ -4,8 +4,9 @@ Execution History Storage and Analysis
 Stores and analyzes chain execution history for ML training and optimization.
 """
 import json
+import threading
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Protocol, Tuple
 from pathlib import Path
 from pydantic import BaseModel, Field
 
@@ -25,14 +26,48 @@ class ExecutionRecord(BaseModel):
     error_message: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    class Config:
+        # Stores hand out their cached instances; see HistoryStore.load
+        frozen = True
 
-class ExecutionHistoryManager:
-    """Manages storage and retrieval of execution history"""
 
-    def __init__(self, data_dir: str = "app/data/execution_history"):
-        self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.history_file = self.data_dir / "executions.jsonl"
+class HistoryStore(Protocol):
+    """Storage backend for execution records"""
+
+    def load(self) -> List[ExecutionRecord]:
+        """Return all records, oldest first.
+
+        The list is the caller's, but the records may be shared with the
+        store's cache and must be treated as read-only (the model is frozen;
+        its dict and list fields are not, so do not mutate those either).
+        """
+        ...
+
+    def append(self, record: ExecutionRecord) -> None:
+        """Persist one record"""
+        ...
+
+    def append_many(self, records: List[ExecutionRecord]) -> None:
+        """Persist several records, in order"""
+        ...
+
+    def clear(self) -> None:
+        """Remove all records"""
+        ...
+
+
+class FileHistoryStore:
+    """JSON Lines file store; parsed records are reused until the file changes.
+
+    Writes may come from a worker thread while reads run on the event loop,
+    so the cached records are only touched under a lock.
+    """
+
+    def __init__(self, history_file: Path):
+        self.history_file = history_file
+        self._records: Optional[List[ExecutionRecord]] = None
+        self._stat: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
         self._ensure_file_exists()
 
     def _ensure_file_exists(self):
@@ -40,25 +75,101 @@ class ExecutionHistoryManager:
         if not self.history_file.exists():
             self.history_file.touch()
 
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.history_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self) -> List[ExecutionRecord]:
+        with self._lock:
+            stat = self._file_stat()
+            if stat is None:
+                return []
+            # Another manager (or process) may append to the same file
+            if self._records is None or stat != self._stat:
+                records = []
+                with open(self.history_file, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            try:
+                                records.append(ExecutionRecord(**json.loads(line)))
+                            except Exception:
+                                continue  # Skip malformed records
+                self._records = records
+                self._stat = stat
+            return list(self._records)
+
+    def append(self, record: ExecutionRecord) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: List[ExecutionRecord]) -> None:
+        with self._lock:
+            in_sync = self._records is not None and self._file_stat() == self._stat
+            with open(self.history_file, 'a') as f:
+                f.write(''.join(record.model_dump_json() + '\n' for record in records))
+            if in_sync:
+                self._records.extend(records)
+                self._stat = self._file_stat()
+            else:
+                self._records = None
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.history_file.exists():
+                self.history_file.unlink()
+            self._records = None
+            self._ensure_file_exists()
+
+
+class InMemoryHistoryStore:
+    """Process-local store, for tests and throwaway managers"""
+
+    def __init__(self):
+        self._records: List[ExecutionRecord] = []
+
+    def load(self) -> List[ExecutionRecord]:
+        return list(self._records)
+
+    def append(self, record: ExecutionRecord) -> None:
+        self._records.append(record)
+
+    def append_many(self, records: List[ExecutionRecord]) -> None:
+        self._records.extend(records)
+
+    def clear(self) -> None:
+        self._records.clear()
+
+
+class ExecutionHistoryManager:
+    """Manages storage and retrieval of execution history"""
+
+    def __init__(
+        self,
+        data_dir: str = "app/data/execution_history",
+        store: Optional[HistoryStore] = None
+    ):
+        # Set for every backend so callers see the same attributes; only the
+        # default file store creates and uses them
+        self.data_dir = Path(data_dir)
+        self.history_file = self.data_dir / "executions.jsonl"
+        if store is None:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            store = FileHistoryStore(self.history_file)
+        self.store = store
+
     def record_execution(self, record: ExecutionRecord):
         """Record a chain execution"""
-        with open(self.history_file, 'a') as f:
-            f.write(record.model_dump_json() + '\n')
+        self.store.append(record)
+
+    def record_executions(self, records: List[ExecutionRecord]):
+        """Record several chain executions with a single store write"""
+        self.store.append_many(records)
 
     def get_all_executions(self, limit: Optional[int] = None) -> List[ExecutionRecord]:
         """Get all execution records"""
-        records = []
-
-        if not self.history_file.exists():
-            return records
-
-        with open(self.history_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        records.append(ExecutionRecord(**json.loads(line)))
-                    except Exception:
-                        continue  # Skip malformed records
+        records = self.store.load()
 
         # Return most recent first
         records.reverse()
@@ -207,6 +318,4 @@ class ExecutionHistoryManager:
 
     def clear_history(self):
         """Clear all execution history (use with caution!)"""
-        if self.history_file.exists():
-            self.history_file.unlink()
-        self._ensure_file_exists()
+        self.store.clear()
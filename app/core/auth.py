@@ -2,6 +2,7 @@
 Authentication and authorization module using JWT tokens
 """
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -72,6 +73,9 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Users are only read from the in-memory table, so lookups are memoized; call
+# get_user.cache_clear() after editing fake_users_db. Returned models are shared
+@lru_cache(maxsize=256)
 def get_user(username: str) -> Optional[UserInDB]:
     """Get user from database"""
     if username in fake_users_db:
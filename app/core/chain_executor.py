@@ -1,72 +1,158 @@
 import asyncio
+import os
+import time
 import uuid
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
 from datetime import datetime
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 
 from ..models.chain import (
     ChainDefinition, ChainExecutionResult, ChainNode, ChainConnection, 
-    ChainNodeType, ChainValidationResult
+    ChainNodeType, ChainValidationResult, NodeExecutionStats, ValidationErrorCode
 )
 from ..models.plugin import PluginInput
 from .plugin_manager import PluginManager
 
 
+# Plugin nodes run on their own pool so a wide fan-out of blocking plugins is
+# not queued behind (or starving) other users of the loop's default executor
+PLUGIN_NODE_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+_PLUGIN_NODE_POOL = ThreadPoolExecutor(max_workers=PLUGIN_NODE_WORKERS, thread_name_prefix="chain-plugin")
+
+# Validation results kept per ChainValidator, least recently used dropped first
+VALIDATION_CACHE_SIZE = 256
+_RESULT_COPIED_FIELDS = ("errors", "error_codes", "warnings", "missing_plugins", "cycle_path", "disconnected_nodes")
+
+
 class ChainValidator:
     """Validates chain definitions for correctness"""
     
     def __init__(self, plugin_manager: PluginManager):
         self.plugin_manager = plugin_manager
+        self._validation_cache: "OrderedDict[Tuple, ChainValidationResult]" = OrderedDict()
+        # (found, compliance error) per plugin id, valid for one plugin set generation
+        self._plugin_statuses: Dict[str, Tuple[bool, Optional[str]]] = {}
+        self._plugin_statuses_generation: Optional[int] = None
+    
+    def _structure_key(self, chain: ChainDefinition) -> Tuple:
+        """Everything validation reads from a chain, plus the plugin set generation"""
+        return (
+            tuple((node.id, node.type, node.plugin_id) for node in chain.nodes),
+            tuple(
+                (conn.id, conn.source_node_id, conn.target_node_id, tuple(conn.data_mappings))
+                for conn in chain.connections
+            ),
+            getattr(self.plugin_manager, "generation", 0),
+        )
     
     def validate_chain(self, chain: ChainDefinition) -> ChainValidationResult:
+        """Chain validation, memoized on the chain's structure"""
+        key = self._structure_key(chain)
+        cached = self._validation_cache.get(key)
+        if cached is None:
+            cached = self._validate_chain(chain)
+            self._validation_cache[key] = cached
+            if len(self._validation_cache) > VALIDATION_CACHE_SIZE:
+                self._validation_cache.popitem(last=False)
+        else:
+            self._validation_cache.move_to_end(key)
+        # Callers get their own copies of the reported lists and sets; the
+        # connection index is shared and treated as read-only
+        return cached.model_copy(
+            update={name: getattr(cached, name).copy() for name in _RESULT_COPIED_FIELDS}
+        )
+    
+    def _plugin_status(self, plugin_id: str) -> Tuple[bool, Optional[str]]:
+        """Whether a plugin exists and its compliance error, cached until the plugin set changes"""
+        generation = getattr(self.plugin_manager, "generation", 0)
+        if generation != self._plugin_statuses_generation or len(self._plugin_statuses) > VALIDATION_CACHE_SIZE:
+            self._plugin_statuses.clear()
+            self._plugin_statuses_generation = generation
+        
+        status = self._plugin_statuses.get(plugin_id)
+        if status is None:
+            plugin = self.plugin_manager.get_plugin(plugin_id)
+            if not plugin:
+                status = (False, None)
+            elif hasattr(plugin, 'compliance_status') and not plugin.compliance_status.get("compliant", False):
+                status = (True, plugin.compliance_status.get('error', 'Unknown error'))
+            else:
+                status = (True, None)
+            self._plugin_statuses[plugin_id] = status
+        return status
+    
+    def _validate_chain(self, chain: ChainDefinition) -> ChainValidationResult:
         """Comprehensive chain validation"""
         errors = []
+        error_codes = []
         warnings = []
-        missing_plugins = []
+        missing_plugins = set()
         disconnected_nodes = []
         
+        def add_error(code: ValidationErrorCode, message: str):
+            error_codes.append(code)
+            errors.append(message)
+        
         # Check for empty chain
         if not chain.nodes:
-            errors.append("Chain must contain at least one node")
+            add_error(ValidationErrorCode.EMPTY_CHAIN, "Chain must contain at least one node")
         
         # Validate nodes
-        node_ids = {node.id for node in chain.nodes}
+        nodes_by_id = {node.id: node for node in chain.nodes}
+        node_ids = nodes_by_id.keys()
         plugin_nodes = [node for node in chain.nodes if node.type == ChainNodeType.PLUGIN]
         
         # Check plugin existence and compliance
         for node in plugin_nodes:
             if not node.plugin_id:
-                errors.append(f"Plugin node {node.id} missing plugin_id")
+                add_error(ValidationErrorCode.MISSING_PLUGIN_ID, f"Plugin node {node.id} missing plugin_id")
                 continue
                 
-            plugin = self.plugin_manager.get_plugin(node.plugin_id)
-            if not plugin:
-                missing_plugins.append(node.plugin_id)
-                errors.append(f"Plugin '{node.plugin_id}' not found for node {node.id}")
+            found, compliance_error = self._plugin_status(node.plugin_id)
+            if not found:
+                missing_plugins.add(node.plugin_id)
+                add_error(ValidationErrorCode.PLUGIN_NOT_FOUND, f"Plugin '{node.plugin_id}' not found for node {node.id}")
                 continue
             
             # Check plugin compliance
-            if hasattr(plugin, 'compliance_status') and not plugin.compliance_status.get("compliant", False):
-                warnings.append(f"Plugin '{node.plugin_id}' is not compliant: {plugin.compliance_status.get('error', 'Unknown error')}")
+            if compliance_error is not None:
+                warnings.append(f"Plugin '{node.plugin_id}' is not compliant: {compliance_error}")
         
-        # Validate connections
+        # Validate connections, indexing successors and in-degrees in the same
+        # pass for cycle detection and for the executor
         connection_sources = set()
         connection_targets = set()
-        
-        for conn in chain.connections:
-            # Check node references
-            if conn.source_node_id not in node_ids:
-                errors.append(f"Connection {conn.id} references non-existent source node {conn.source_node_id}")
-            if conn.target_node_id not in node_ids:
-                errors.append(f"Connection {conn.id} references non-existent target node {conn.target_node_id}")
+        adjacency: Dict[str, List[str]] = {}
+        in_degree: Dict[str, int] = dict.fromkeys(node_ids, 0)
+        cycle_path = None
+        
+        # A chain without connections has no graph to analyse
+        if chain.connections:
+            adjacency = {node.id: [] for node in chain.nodes}
+            for conn in chain.connections:
+                # Check node references
+                if conn.source_node_id not in node_ids:
+                    add_error(ValidationErrorCode.UNKNOWN_SOURCE_NODE, f"Connection {conn.id} references non-existent source node {conn.source_node_id}")
+                if conn.target_node_id not in node_ids:
+                    add_error(ValidationErrorCode.UNKNOWN_TARGET_NODE, f"Connection {conn.id} references non-existent target node {conn.target_node_id}")
+                else:
+                    in_degree[conn.target_node_id] += 1
+                
+                connection_sources.add(conn.source_node_id)
+                connection_targets.add(conn.target_node_id)
+                adjacency.setdefault(conn.source_node_id, []).append(conn.target_node_id)
             
-            connection_sources.add(conn.source_node_id)
-            connection_targets.add(conn.target_node_id)
+            # Check for cycles
+            cycle_path = self._find_cycle(chain, adjacency)
         
-        # Check for cycles
-        cycle_detected = self._detect_cycles(chain)
+        cycle_detected = cycle_path is not None
         if cycle_detected:
-            errors.append("Circular dependencies detected in chain")
+            add_error(
+                ValidationErrorCode.CIRCULAR_DEPENDENCY,
+                f"Circular dependencies detected in chain: {' -> '.join(cycle_path)}"
+            )
         
         # Find disconnected nodes (except start nodes)
         all_connected = connection_sources | connection_targets
@@ -77,8 +163,8 @@ class ChainValidator:
         
         # Validate data mappings
         for conn in chain.connections:
-            source_node = next((n for n in chain.nodes if n.id == conn.source_node_id), None)
-            target_node = next((n for n in chain.nodes if n.id == conn.target_node_id), None)
+            source_node = nodes_by_id.get(conn.source_node_id)
+            target_node = nodes_by_id.get(conn.target_node_id)
             
             if source_node and target_node and source_node.type == ChainNodeType.PLUGIN and target_node.type == ChainNodeType.PLUGIN:
                 # Check if plugin schemas are compatible
@@ -89,43 +175,47 @@ class ChainValidator:
         return ChainValidationResult(
             is_valid=is_valid,
             errors=errors,
+            error_codes=error_codes,
             warnings=warnings,
             missing_plugins=missing_plugins,
             cycle_detected=cycle_detected,
-            disconnected_nodes=disconnected_nodes
+            cycle_path=cycle_path or [],
+            disconnected_nodes=disconnected_nodes,
+            adjacency=adjacency,
+            in_degree=in_degree
         )
     
-    def _detect_cycles(self, chain: ChainDefinition) -> bool:
-        """Detect circular dependencies using DFS"""
-        # Build adjacency list
-        graph = defaultdict(list)
-        for conn in chain.connections:
-            graph[conn.source_node_id].append(conn.target_node_id)
-        
-        # DFS cycle detection
-        visited = set()
-        rec_stack = set()
-        
-        def dfs(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            for neighbor in graph[node_id]:
-                if neighbor not in visited:
-                    if dfs(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-            
-            rec_stack.remove(node_id)
-            return False
-        
+    def _find_cycle(self, chain: ChainDefinition, adjacency: Dict[str, List[str]]) -> Optional[List[str]]:
+        """
+        Return the node ids along the first circular dependency found, with
+        the starting node repeated at the end, or None for an acyclic chain.
+        
+        Iterative three-colour DFS: a successor still on the current path
+        (grey) closes a cycle, so the search stops at the first back edge.
+        """
+        finished = set()  # Black: fully explored
         for node in chain.nodes:
-            if node.id not in visited:
-                if dfs(node.id):
-                    return True
-        
-        return False
+            start = node.id
+            if start in finished:
+                continue
+            path = [start]
+            on_path = {start: 0}  # Grey: node id -> index in path
+            stack = [iter(adjacency.get(start, ()))]
+            while stack:
+                for neighbor in stack[-1]:
+                    if neighbor in on_path:
+                        return path[on_path[neighbor]:] + [neighbor]
+                    if neighbor not in finished:
+                        on_path[neighbor] = len(path)
+                        path.append(neighbor)
+                        stack.append(iter(adjacency.get(neighbor, ())))
+                        break
+                else:
+                    stack.pop()
+                    done_id = path.pop()
+                    del on_path[done_id]
+                    finished.add(done_id)
+        return None
     
     def _validate_data_mappings(self, connection: ChainConnection, 
                                source_node: ChainNode, target_node: ChainNode, 
@@ -164,19 +254,30 @@ class ChainValidator:
             pass
 
 
+@dataclass
+class ExecutionGraph:
+    """Dependency counts and successors used to schedule a chain's nodes"""
+    nodes_by_id: Dict[str, ChainNode]
+    in_degree: Dict[str, int]
+    successors: Dict[str, List[str]]
+    ready: List[str]  # Nodes without dependencies, in chain order
+
+
 class ChainExecutor:
     """Executes plugin chains with dependency resolution and error handling"""
     
-    def __init__(self, plugin_manager: PluginManager):
+    def __init__(self, plugin_manager: PluginManager, validator: Optional[ChainValidator] = None):
         self.plugin_manager = plugin_manager
-        self.validator = ChainValidator(plugin_manager)
+        # One validator per executor, so its result and plugin caches are
+        # reused across executions; pass one in to share it between executors
+        self.validator = validator or ChainValidator(plugin_manager)
     
     async def execute_chain(self, chain: ChainDefinition, input_data: Dict[str, Any]) -> ChainExecutionResult:
         """Execute a complete plugin chain"""
         execution_id = str(uuid.uuid4())
         start_time = datetime.now()
         node_results: Dict[str, Dict[str, Any]] = {}
-        node_execution_stats: Dict[str, Dict[str, Any]] = {}
+        node_execution_stats: Dict[str, NodeExecutionStats] = {}
         
         try:
             # Validate chain first
@@ -184,8 +285,9 @@ class ChainExecutor:
             if not validation.is_valid:
                 raise ValueError(f"Chain validation failed: {'; '.join(validation.errors)}")
             
-            # Build execution graph (topological sort)
-            execution_graph = self._build_execution_graph(chain)
+            # Build execution graph (dependency counts for Kahn's algorithm),
+            # reusing the connection index built during validation
+            execution_graph = self._build_execution_graph(chain, validation)
             
             # Execute nodes in dependency order
             execution_context = {
@@ -194,22 +296,11 @@ class ChainExecutor:
                 "chain": chain
             }
             
-            # Execute in batches (parallel where possible)
-            for node_batch in execution_graph:
-                # Execute nodes in parallel within batch
-                batch_tasks = []
-                for node in node_batch:
-                    task = self._execute_node_with_timing(node, execution_context)
-                    batch_tasks.append(task)
-                
-                batch_results = await asyncio.gather(*batch_tasks)
-                
-                # Process batch results and handle errors
-                for node, result in zip(node_batch, batch_results):
-                    node_execution_stats[node.id] = result["telemetry"]
-                    if not result["success"]:
-                        raise Exception(result["error"] or f"Node {node.id} failed")
-                    node_results[node.id] = result["data"]
+            # Run every node as soon as its last dependency finishes, rather
+            # than waiting for a whole level of the graph
+            dispatch_groups = await self._run_ready_queue(
+                execution_graph, execution_context, node_execution_stats
+            )
             
             # Extract final output from last nodes
             final_output = self._extract_final_output(node_results, chain)
@@ -225,7 +316,7 @@ class ChainExecutor:
                 node_results=node_results,
                 execution_time=execution_time,
                 node_execution_stats=node_execution_stats,
-                execution_graph=[[node.id for node in batch] for batch in execution_graph],
+                execution_graph=dispatch_groups,
                 started_at=start_time.isoformat(),
                 completed_at=end_time.isoformat()
             )
@@ -249,7 +340,7 @@ class ChainExecutor:
 
     async def _execute_node_with_timing(self, node: ChainNode, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute node and capture telemetry regardless of success/failure."""
-        node_start = datetime.now()
+        node_start = time.perf_counter_ns()
         try:
             node_data = await self._execute_node(node, context)
             success = True
@@ -258,15 +349,15 @@ class ChainExecutor:
             node_data = {}
             success = False
             error = str(exc)
-        node_end = datetime.now()
+        duration_ns = time.perf_counter_ns() - node_start
 
-        telemetry = {
-            "duration_seconds": (node_end - node_start).total_seconds(),
-            "success": success,
-            "error": error,
-            "plugin_id": node.plugin_id,
-            "node_type": node.type.value if hasattr(node.type, "value") else str(node.type),
-        }
+        telemetry = NodeExecutionStats(
+            success=success,
+            duration_ns=duration_ns,
+            plugin_id=node.plugin_id,
+            node_type=node.type.value if hasattr(node.type, "value") else str(node.type),
+            error=error,
+        )
 
         return {
             "success": success,
@@ -275,51 +366,83 @@ class ChainExecutor:
             "telemetry": telemetry,
         }
     
-    def _build_execution_graph(self, chain: ChainDefinition) -> List[List[ChainNode]]:
-        """Build execution graph using topological sort for parallel execution"""
-        
-        # Build adjacency list and in-degree count
-        graph = defaultdict(list)
-        in_degree = defaultdict(int)
+    def _build_execution_graph(self, chain: ChainDefinition,
+                               validation: Optional[ChainValidationResult] = None) -> ExecutionGraph:
+        """
+        Build in-degree counts and successor lists for ready-queue execution.
+        
+        A successful validation result already carries them, so the
+        connections are only scanned here when none is given.
+        """
         nodes_by_id = {node.id: node for node in chain.nodes}
-        
-        # Initialize in-degree for all nodes
-        for node in chain.nodes:
-            in_degree[node.id] = 0
-        
-        # Build graph from connections
-        for conn in chain.connections:
-            graph[conn.source_node_id].append(conn.target_node_id)
-            in_degree[conn.target_node_id] += 1
-        
-        # Topological sort with level detection for parallel execution
-        execution_batches = []
-        queue = deque()
-        
-        # Find nodes with no dependencies (in-degree = 0)
-        for node_id, degree in in_degree.items():
-            if degree == 0:
-                queue.append(node_id)
-        
-        while queue:
-            # All nodes in current queue can execute in parallel
-            current_batch = []
-            batch_size = len(queue)
+        if validation is not None and validation.is_valid:
+            in_degree = validation.in_degree
+            successors = validation.adjacency
+        else:
+            in_degree = {node.id: 0 for node in chain.nodes}
+            successors = defaultdict(list)
+            for conn in chain.connections:
+                successors[conn.source_node_id].append(conn.target_node_id)
+                in_degree[conn.target_node_id] += 1
+        
+        return ExecutionGraph(
+            nodes_by_id=nodes_by_id,
+            in_degree=in_degree,
+            successors=successors,
+            ready=[node_id for node_id, degree in in_degree.items() if degree == 0]
+        )
+    
+    async def _run_ready_queue(self, graph: ExecutionGraph, context: Dict[str, Any],
+                               node_execution_stats: Dict[str, NodeExecutionStats]) -> List[List[str]]:
+        """
+        Execute the graph with a ready queue, dispatching each node once all
+        of its dependencies have completed.
+        
+        After a failure no new nodes are started, but nodes already running
+        finish and report telemetry before the first error is raised.
+        Returns the node ids grouped by the moment they were dispatched.
+        """
+        node_results = context["results"]
+        in_degree = dict(graph.in_degree)
+        ready = deque(graph.ready)
+        running: Dict[asyncio.Task, ChainNode] = {}
+        dispatch_groups: List[List[str]] = []
+        completed = 0
+        failure = None
+        
+        while running or (ready and failure is None):
+            if ready and failure is None:
+                dispatch_groups.append(list(ready))
+                while ready:
+                    node = graph.nodes_by_id[ready.popleft()]
+                    task = asyncio.ensure_future(self._execute_node_with_timing(node, context))
+                    running[task] = node
             
-            for _ in range(batch_size):
-                node_id = queue.popleft()
-                current_batch.append(nodes_by_id[node_id])
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                node = running.pop(task)
+                result = task.result()
+                node_execution_stats[node.id] = result["telemetry"]
+                completed += 1
+                if not result["success"]:
+                    if failure is None:
+                        failure = result["error"] or f"Node {node.id} failed"
+                    continue
+                node_results[node.id] = result["data"]
                 
-                # Reduce in-degree for neighbors
-                for neighbor_id in graph[node_id]:
-                    in_degree[neighbor_id] -= 1
-                    if in_degree[neighbor_id] == 0:
-                        queue.append(neighbor_id)
-            
-            if current_batch:
-                execution_batches.append(current_batch)
-        
-        return execution_batches
+                # Release successors whose last dependency just finished
+                for successor_id in graph.successors.get(node.id, ()):
+                    in_degree[successor_id] -= 1
+                    if in_degree[successor_id] == 0:
+                        ready.append(successor_id)
+        
+        if failure is not None:
+            raise Exception(failure)
+        if completed != len(graph.nodes_by_id):
+            # Nodes on a cycle never reach in-degree zero
+            raise ValueError("Circular dependencies detected in chain")
+        
+        return dispatch_groups
     
     async def _execute_node(self, node: ChainNode, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute individual chain node"""
@@ -344,10 +467,11 @@ class ChainExecutor:
         # Execute plugin
         plugin_input = PluginInput(plugin_id=node.plugin_id, data=input_data)
         
-        # Run plugin execution in a thread to avoid blocking
-        loop = asyncio.get_event_loop()
+        # Run plugin execution in a thread to avoid blocking; sibling nodes
+        # dispatched by the ready queue run concurrently on the pool
+        loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
-            None, 
+            _PLUGIN_NODE_POOL, 
             self.plugin_manager.execute_plugin, 
             plugin_input
         )
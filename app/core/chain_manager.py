@@ -1,3 +1,7 @@
+import asyncio
+import logging
+import queue
+import threading
 import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -12,6 +16,11 @@ from .plugin_manager import PluginManager
 from ..ai.execution_history import ExecutionHistoryManager, ExecutionRecord
 from ..models.plugin import model_json_schema
 
+logger = logging.getLogger(__name__)
+
+# Most execution records written to the history store in one batch
+HISTORY_BATCH_SIZE = 64
+
 
 class ChainManager:
     """Central manager for all chain operations"""
@@ -21,6 +30,14 @@ class ChainManager:
         self.storage = ChainStorageManager(base_dir)
         self.executor = ChainExecutor(plugin_manager)
         self.history_manager = ExecutionHistoryManager(data_dir=f"{base_dir}/execution_history")
+        # Execution records are written by a background task so chain
+        # execution never waits on history file I/O. The queue is thread-safe
+        # because chains may run on event loops in different threads; the
+        # lock keeps "queue a record" and "writer stops on an empty queue"
+        # from interleaving, so no record is left without a writer.
+        self._history_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._history_lock = threading.Lock()
+        self._history_writer: Optional[asyncio.Task] = None
 
         # Initialize with sample templates
         self._ensure_sample_templates()
@@ -146,15 +163,10 @@ class ChainManager:
             node_plugins = {}
 
             for node_id, telemetry in node_execution_stats.items():
-                duration = telemetry.get("duration_seconds")
-                if isinstance(duration, (int, float)):
-                    node_durations[node_id] = float(duration)
-
-                node_results[node_id] = "success" if telemetry.get("success", False) else "failed"
-
-                plugin_id = telemetry.get("plugin_id")
-                if plugin_id:
-                    node_plugins[node_id] = plugin_id
+                node_durations[node_id] = telemetry.duration_seconds
+                node_results[node_id] = "success" if telemetry.success else "failed"
+                if telemetry.plugin_id:
+                    node_plugins[node_id] = telemetry.plugin_id
 
             record = ExecutionRecord(
                 id=result.execution_id,
@@ -171,11 +183,60 @@ class ChainManager:
                 metadata={"execution_graph": result.execution_graph}
             )
 
-            # Record in history
-            self.history_manager.record_execution(record)
-        except Exception as e:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No event loop to run the background writer on
+                self.history_manager.record_executions([record])
+            else:
+                self._queue_history_record(record, loop)
+        except Exception:
             # Don't fail the execution if history recording fails
-            print(f"Failed to record execution for AI: {e}")
+            logger.exception("Failed to record execution for AI")
+    
+    def _queue_history_record(self, record: ExecutionRecord, loop: asyncio.AbstractEventLoop):
+        """Queue a record for the background writer, starting one on the given loop if none runs"""
+        with self._history_lock:
+            self._history_queue.put(record)
+            writer = self._history_writer
+            if writer is None or writer.done():
+                self._history_writer = loop.create_task(self._write_history())
+
+    def _take_queued_records(self, limit: Optional[int] = None) -> List[ExecutionRecord]:
+        """Remove and return up to limit records from the history queue"""
+        records = []
+        while limit is None or len(records) < limit:
+            try:
+                records.append(self._history_queue.get_nowait())
+            except queue.Empty:
+                break
+        return records
+
+    async def _write_history(self):
+        """Drain queued execution records into the history store in batches, stopping once it is empty"""
+        while True:
+            with self._history_lock:
+                batch = self._take_queued_records(HISTORY_BATCH_SIZE)
+                if not batch:
+                    self._history_writer = None
+                    return
+            try:
+                await asyncio.to_thread(self.history_manager.record_executions, batch)
+            except Exception:
+                # Don't fail the execution if history recording fails
+                logger.exception("Failed to record execution for AI")
+
+    async def flush_history(self):
+        """Wait until every queued execution record has been written"""
+        writer = self._history_writer
+        if writer is not None and not writer.done() and writer.get_loop() is asyncio.get_running_loop():
+            # The writer returns once the queue is empty
+            await asyncio.shield(writer)
+            return
+        # The writer stopped or runs on another loop; write what is queued here
+        records = self._take_queued_records()
+        if records:
+            await asyncio.to_thread(self.history_manager.record_executions, records)
     
     # ========== Chain Analytics ==========
     
@@ -30,6 +30,7 @@ class Settings(BaseSettings):
     # File Upload Settings
     max_upload_size_mb: int = Field(default=100, env="MAX_UPLOAD_SIZE_MB")
     max_upload_size_bytes: int = 100 * 1024 * 1024  # Computed from max_upload_size_mb
+    max_batch_files: int = Field(default=20, env="MAX_BATCH_FILES")
 
     # Rate Limiting Settings
     rate_limit_enabled: bool = Field(default=True, env="RATE_LIMIT_ENABLED")
@@ -1,13 +1,15 @@
 import time
 import shutil
-from typing import Dict, Any, Optional, List, Set, Type
+from typing import AbstractSet, Dict, Any, Optional, List, Set, Tuple, Type
 from pydantic import ValidationError
 from ..models.plugin import (
     PluginManifest,
     PluginInput,
     BasePlugin,
+    BatchItemError,
     is_pydantic_model_class,
-    model_json_schema,
+    rebuild_model,
+    schema_field_names,
 )
 from ..models.response import PluginExecutionResponse
 from .plugin_loader import PluginLoader
@@ -17,11 +19,15 @@ class PluginManager:
     def __init__(self):
         self.loader = PluginLoader()
         self.plugins: Dict[str, PluginManifest] = {}
+        # Bumped on every refresh so caches derived from the plugin set
+        # (e.g. chain validation results) know when to drop their entries
+        self.generation = 0
         self.refresh_plugins()
     
     def refresh_plugins(self):
         """Refresh the list of available plugins"""
         self.plugins = self.loader.discover_plugins()
+        self.generation += 1
         for plugin in self.plugins.values():
             self._check_dependencies(plugin)
             self._validate_plugin_compliance(plugin)
@@ -74,6 +80,13 @@ class PluginManager:
                     }
                     return
 
+                # Finish any deferred model builds at registration so the
+                # first run of the plugin doesn't pay for them
+                rebuild_model(response_model)
+                input_model = plugin_class.get_input_model()
+                if is_pydantic_model_class(input_model):
+                    rebuild_model(input_model)
+
                 contract_warnings = self._check_manifest_contract_parity(
                     manifest=plugin,
                     plugin_class=plugin_class,
@@ -165,45 +178,41 @@ class PluginManager:
                 })
         return non_compliant
     
+    def _load_executable_plugin(self, plugin_id: str) -> Tuple[Optional[PluginManifest], Optional[Type[BasePlugin]], Optional[str]]:
+        """Return (manifest, plugin class, None) for a runnable plugin, or an error message in place of the class"""
+        # Check if plugin exists
+        if plugin_id not in self.plugins:
+            return None, None, f"Plugin '{plugin_id}' not found"
+        
+        # Get plugin manifest
+        manifest = self.plugins[plugin_id]
+        
+        # Check plugin compliance
+        if hasattr(manifest, 'compliance_status') and not manifest.compliance_status.get("compliant", False):
+            return manifest, None, f"Plugin '{plugin_id}' is not compliant: {manifest.compliance_status.get('error', 'Unknown error')}"
+        
+        # Load plugin class
+        plugin_class = self.loader.get_plugin_class(plugin_id)
+        if not plugin_class:
+            return manifest, None, f"Could not load plugin class for '{plugin_id}'"
+
+        # Check if dependencies are met before execution
+        if hasattr(manifest, 'dependency_status') and not manifest.dependency_status["all_met"]:
+            return manifest, None, "Cannot execute plugin due to unmet dependencies."
+        
+        return manifest, plugin_class, None
+    
     def execute_plugin(self, plugin_input: PluginInput) -> PluginExecutionResponse:
         """Execute a plugin with the given input"""
         start_time = time.time()
         
         try:
-            # Check if plugin exists
-            if plugin_input.plugin_id not in self.plugins:
-                return PluginExecutionResponse(
-                    success=False,
-                    plugin_id=plugin_input.plugin_id,
-                    error=f"Plugin '{plugin_input.plugin_id}' not found"
-                )
-            
-            # Get plugin manifest
-            manifest = self.plugins[plugin_input.plugin_id]
-            
-            # Check plugin compliance
-            if hasattr(manifest, 'compliance_status') and not manifest.compliance_status.get("compliant", False):
-                return PluginExecutionResponse(
-                    success=False,
-                    plugin_id=plugin_input.plugin_id,
-                    error=f"Plugin '{plugin_input.plugin_id}' is not compliant: {manifest.compliance_status.get('error', 'Unknown error')}"
-                )
-            
-            # Load plugin class
-            plugin_class = self.loader.get_plugin_class(plugin_input.plugin_id)
-            if not plugin_class:
+            manifest, plugin_class, load_error = self._load_executable_plugin(plugin_input.plugin_id)
+            if load_error:
                 return PluginExecutionResponse(
                     success=False,
                     plugin_id=plugin_input.plugin_id,
-                    error=f"Could not load plugin class for '{plugin_input.plugin_id}'"
-                )
-
-            # Check if dependencies are met before execution
-            if hasattr(manifest, 'dependency_status') and not manifest.dependency_status["all_met"]:
-                return PluginExecutionResponse(
-                    success=False,
-                    plugin_id=plugin_input.plugin_id,
-                    error="Cannot execute plugin due to unmet dependencies."
+                    error=load_error
                 )
 
             validation_error = self._validate_input(plugin_input.data, manifest)
@@ -232,31 +241,101 @@ class PluginManager:
                 )
             
             execution_time = time.time() - start_time
+            return self._success_response(plugin_input.plugin_id, result, execution_time)
             
-            # Check if the result contains file data
-            if "file_path" in result and "file_name" in result:
-                return PluginExecutionResponse(
-                    success=True,
-                    plugin_id=plugin_input.plugin_id,
-                    file_data=result,
-                    execution_time=execution_time
-                )
-
+        except Exception as e:
+            execution_time = time.time() - start_time
             return PluginExecutionResponse(
-                success=True,
+                success=False,
                 plugin_id=plugin_input.plugin_id,
-                data=result,
+                error=str(e),
                 execution_time=execution_time
             )
+    
+    def execute_plugin_batch(self, plugin_input: PluginInput) -> List[PluginExecutionResponse]:
+        """
+        Execute a file plugin on every file in plugin_input.data["input_files"].
+        
+        The other fields of data are shared by all files. The plugin's
+        execute_batch() receives the files that pass manifest validation in one
+        call, so plugins that batch their work pay their setup once. Returns one
+        response per file, in input order; execution_time is the whole batch's.
+        """
+        start_time = time.time()
+        plugin_id = plugin_input.plugin_id
+        input_files = plugin_input.data.get("input_files") or []
+        options = {key: value for key, value in plugin_input.data.items() if key != "input_files"}
+        responses: List[Optional[PluginExecutionResponse]] = [None] * len(input_files)
+        
+        def fail_all(error: str) -> List[PluginExecutionResponse]:
+            execution_time = time.time() - start_time
+            return [
+                response or PluginExecutionResponse(
+                    success=False, plugin_id=plugin_id, error=error, execution_time=execution_time
+                )
+                for response in responses
+            ]
+        
+        try:
+            manifest, plugin_class, load_error = self._load_executable_plugin(plugin_id)
+            if load_error:
+                return fail_all(load_error)
+            
+            # Manifest checks (e.g. allowed extensions) reject single files only
+            accepted = []
+            for index, input_file in enumerate(input_files):
+                file_data = {**options, "input_file": input_file}
+                validation_error = self._validate_input(file_data, manifest)
+                if validation_error:
+                    responses[index] = PluginExecutionResponse(
+                        success=False, plugin_id=plugin_id, error=validation_error
+                    )
+                else:
+                    accepted.append((index, file_data))
+            if not accepted:
+                return fail_all("No input files to execute")
+            
+            batch_data = {key: value for key, value in accepted[0][1].items() if key != "input_file"}
+            batch_data["input_files"] = [file_data["input_file"] for _, file_data in accepted]
+            try:
+                results = plugin_class().run_batch(batch_data)
+            except ValidationError as e:
+                return fail_all(f"Plugin validation failed: {str(e)}")
+            except Exception as e:
+                return fail_all(f"Plugin execution error: {str(e)}")
             
-        except Exception as e:
             execution_time = time.time() - start_time
+            for (index, _), result in zip(accepted, results):
+                if isinstance(result, BatchItemError):
+                    responses[index] = PluginExecutionResponse(
+                        success=False, plugin_id=plugin_id,
+                        error=f"Plugin execution error: {result['error']}", execution_time=execution_time
+                    )
+                else:
+                    responses[index] = self._success_response(plugin_id, result, execution_time)
+            return fail_all("Plugin returned no result for this file")
+            
+        except Exception as e:
+            return fail_all(str(e))
+    
+    @staticmethod
+    def _success_response(plugin_id: str, result: Dict[str, Any], execution_time: float) -> PluginExecutionResponse:
+        """Wrap a validated plugin result, as file data when it names an output file"""
+        # Check if the result contains file data
+        if "file_path" in result and "file_name" in result:
             return PluginExecutionResponse(
-                success=False,
-                plugin_id=plugin_input.plugin_id,
-                error=str(e),
+                success=True,
+                plugin_id=plugin_id,
+                file_data=result,
                 execution_time=execution_time
             )
+
+        return PluginExecutionResponse(
+            success=True,
+            plugin_id=plugin_id,
+            data=result,
+            execution_time=execution_time
+        )
     
     def _validate_input(self, data: Dict[str, Any], manifest: PluginManifest) -> Optional[str]:
         """Validate input data against plugin manifest"""
@@ -313,13 +392,14 @@ class PluginManager:
         """
         warnings: List[str] = []
 
+        # Runtime name sets come from each model's schema, generated once per class
         manifest_output_schema = manifest.output.schema_definition or {}
-        runtime_output_schema = model_json_schema(response_model)
+        runtime_output_fields, runtime_output_required = schema_field_names(response_model)
         warnings.extend(
             PluginManager._diff_schema_fields(
                 label="output",
                 manifest_fields=PluginManager._extract_schema_fields(manifest_output_schema),
-                runtime_fields=PluginManager._extract_schema_fields(runtime_output_schema),
+                runtime_fields=runtime_output_fields,
             )
         )
         if isinstance(manifest_output_schema.get("required"), list):
@@ -327,7 +407,7 @@ class PluginManager:
                 PluginManager._diff_required_fields(
                     label="output",
                     manifest_required=PluginManager._extract_required_fields(manifest_output_schema),
-                    runtime_required=PluginManager._extract_required_fields(runtime_output_schema),
+                    runtime_required=runtime_output_required,
                 )
             )
 
@@ -338,9 +418,8 @@ class PluginManager:
         if not input_model:
             return warnings
 
-        runtime_input_schema = model_json_schema(input_model)
+        runtime_input_names, runtime_required_inputs = schema_field_names(input_model)
         manifest_input_names = {field.name for field in manifest.inputs}
-        runtime_input_names = PluginManager._extract_schema_fields(runtime_input_schema)
         warnings.extend(
             PluginManager._diff_schema_fields(
                 label="input",
@@ -350,7 +429,6 @@ class PluginManager:
         )
 
         manifest_required_inputs = {field.name for field in manifest.inputs if field.required}
-        runtime_required_inputs = PluginManager._extract_required_fields(runtime_input_schema)
         warnings.extend(
             PluginManager._diff_required_fields(
                 label="input",
@@ -376,7 +454,7 @@ class PluginManager:
         return {str(item) for item in required}
 
     @staticmethod
-    def _diff_schema_fields(label: str, manifest_fields: Set[str], runtime_fields: Set[str]) -> List[str]:
+    def _diff_schema_fields(label: str, manifest_fields: AbstractSet[str], runtime_fields: AbstractSet[str]) -> List[str]:
         warnings: List[str] = []
         missing_in_manifest = sorted(runtime_fields - manifest_fields)
         extra_in_manifest = sorted(manifest_fields - runtime_fields)
@@ -394,8 +472,8 @@ class PluginManager:
     @staticmethod
     def _diff_required_fields(
         label: str,
-        manifest_required: Set[str],
-        runtime_required: Set[str],
+        manifest_required: AbstractSet[str],
+        runtime_required: AbstractSet[str],
     ) -> List[str]:
         warnings: List[str] = []
         missing_required_in_manifest = sorted(runtime_required - manifest_required)
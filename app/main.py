@@ -7,7 +7,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from contextlib import asynccontextmanager
 from datetime import timedelta
 import os
 import json
@@ -34,11 +35,19 @@ from .ai.execution_history import ExecutionHistoryManager, ExecutionRecord
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address, enabled=settings.rate_limit_enabled)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Write out execution history still queued for the background writer
+    await chain_manager.flush_history()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Neural Plugin System with Chain Builder",
     description="A FastAPI + Pydantic web application with dynamic plugin system and visual chain builder",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Add rate limiter to app state
@@ -142,12 +151,17 @@ def cleanup_downloads_directory(max_age_hours: int = 24):
         max_age_seconds = max_age_hours * 3600
         cleaned_count = 0
         
-        for file_path in downloads_dir.iterdir():
-            if file_path.is_file():
-                file_age = current_time - file_path.stat().st_mtime
-                if file_age > max_age_seconds:
-                    file_path.unlink()
-                    cleaned_count += 1
+        # Plugins may keep caches of finished outputs in hidden subdirectories
+        # (e.g. pdf2html's .cache). A cache hit refreshes the entry's mtime, so
+        # this sweep drops entries by last use rather than by creation
+        cache_dirs = [path for path in downloads_dir.iterdir() if path.is_dir() and path.name.startswith('.')]
+        for directory in [downloads_dir, *cache_dirs]:
+            for file_path in directory.iterdir():
+                if file_path.is_file():
+                    file_age = current_time - file_path.stat().st_mtime
+                    if file_age > max_age_seconds:
+                        file_path.unlink(missing_ok=True)
+                        cleaned_count += 1
         
         return {"cleaned": cleaned_count, "max_age_hours": max_age_hours}
     except Exception as e:
@@ -297,6 +311,68 @@ async def execute_plugin_api(
         )
 
 
+@app.post("/api/plugin/{plugin_id}/execute-batch")
+@limiter.limit(f"{settings.rate_limit_per_minute}/minute")
+async def execute_plugin_batch_api(
+    plugin_id: str,
+    request: Request,
+    input_files: List[UploadFile] = File(...),
+    current_user: Optional[User] = Depends(optional_auth)
+):
+    """
+    API endpoint to execute a file plugin on several uploads with one set of options
+
+    Plugins that batch their work (e.g. pandoc_converter, pdf2html) convert
+    the files together. Returns one execution response per file, in upload
+    order; the output files are listed under each response's file_data.
+    At most MAX_BATCH_FILES uploads, each limited to MAX_UPLOAD_SIZE_MB.
+    """
+    if len(input_files) > settings.max_batch_files:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many files: at most {settings.max_batch_files} files per batch"
+        )
+
+    temp_file_paths = []
+    try:
+        logger.info(f"Executing plugin batch: {plugin_id} ({len(input_files)} files)",
+                    extra={"user": getattr(current_user, 'username', 'anonymous')})
+        form_data = await request.form()
+        data = {key: value for key, value in form_data.items() if key != "input_files"}
+        
+        # Stream each upload to its own temporary file
+        data["input_files"] = []
+        for input_file in input_files:
+            temp_file_path = await _stream_upload_to_temp(input_file)
+            temp_file_paths.append(temp_file_path)
+            data["input_files"].append({
+                "filename": input_file.filename,
+                "temp_path": temp_file_path,
+                "size": os.path.getsize(temp_file_path)
+            })
+
+        results = plugin_manager.execute_plugin_batch(PluginInput(plugin_id=plugin_id, data=data))
+        return {
+            "success": all(result.success for result in results),
+            "plugin_id": plugin_id,
+            "results": [result.dict() for result in results]
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        return PluginExecutionResponse(
+            success=False,
+            plugin_id=plugin_id,
+            error=str(e)
+        )
+    finally:
+        # Plugins move away the uploads they convert; remove the ones never
+        # handed to a plugin (rejected files, unknown plugin, a failed upload)
+        for temp_file_path in temp_file_paths:
+            Path(temp_file_path).unlink(missing_ok=True)
+
+
 @app.post("/plugin/{plugin_id}/execute", response_class=HTMLResponse)
 async def execute_plugin_web(request: Request, plugin_id: str, input_file: UploadFile = File(None)):
     """Web interface for plugin execution"""
@@ -1,5 +1,5 @@
-from typing import Dict, Any, List, Optional, Union, Literal
-from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional, Set, Union, Literal
+from pydantic import BaseModel, Field, computed_field, model_validator
 from enum import Enum
 from datetime import datetime
 
@@ -12,11 +12,24 @@ class ChainNodeType(str, Enum):
     SPLIT = "split"
 
 
+class ValidationErrorCode(str, Enum):
+    """Machine-readable reason for a chain validation error"""
+    EMPTY_CHAIN = "empty_chain"
+    MISSING_PLUGIN_ID = "missing_plugin_id"
+    PLUGIN_NOT_FOUND = "plugin_not_found"
+    UNKNOWN_SOURCE_NODE = "unknown_source_node"
+    UNKNOWN_TARGET_NODE = "unknown_target_node"
+    CIRCULAR_DEPENDENCY = "circular_dependency"
+
+
 class DataMapping(BaseModel):
     """Maps output fields from source to input fields of target"""
     source_field: str = Field(..., description="Field name from source plugin output")
     target_field: str = Field(..., description="Field name for target plugin input")
     transform: Optional[str] = Field(None, description="Optional transformation function")
+    
+    class Config:
+        frozen = True
 
 
 class ChainNode(BaseModel):
@@ -30,6 +43,11 @@ class ChainNode(BaseModel):
     
     class Config:
         extra = "allow"
+        frozen = True
+    
+    def __hash__(self) -> int:
+        # position and config are dicts, so only the identifying fields are hashed
+        return hash((self.id, self.type, self.plugin_id))
 
 
 class ChainConnection(BaseModel):
@@ -39,6 +57,12 @@ class ChainConnection(BaseModel):
     target_node_id: str = Field(..., description="Target node ID")
     data_mappings: List[DataMapping] = Field(default_factory=list, description="Field mappings")
     condition: Optional[str] = Field(None, description="Conditional execution logic")
+    
+    class Config:
+        frozen = True
+    
+    def __hash__(self) -> int:
+        return hash((self.id, self.source_node_id, self.target_node_id))
 
 
 class ChainDefinition(BaseModel):
@@ -61,6 +85,29 @@ class ChainDefinition(BaseModel):
         extra = "allow"
 
 
+class NodeExecutionStats(BaseModel):
+    """Execution telemetry for a single node"""
+    success: bool = Field(..., description="Whether the node completed")
+    duration_ns: int = Field(..., description="Node duration in nanoseconds, from a monotonic clock")
+    plugin_id: Optional[str] = Field(None, description="Plugin run by the node")
+    node_type: str = Field(..., description="Node type")
+    error: Optional[str] = Field(None, description="Error message if the node failed")
+
+    @model_validator(mode="before")
+    @classmethod
+    def _duration_from_seconds(cls, data: Any) -> Any:
+        # Executions stored before durations were kept in nanoseconds only
+        # carry duration_seconds
+        if isinstance(data, dict) and "duration_ns" not in data and "duration_seconds" in data:
+            data = {**data, "duration_ns": round(float(data["duration_seconds"]) * 1e9)}
+        return data
+
+    @computed_field
+    @property
+    def duration_seconds(self) -> float:
+        return self.duration_ns / 1e9
+
+
 class ChainExecutionResult(BaseModel):
     """Result of chain execution"""
     success: bool = Field(..., description="Overall execution success")
@@ -70,14 +117,17 @@ class ChainExecutionResult(BaseModel):
     node_results: Dict[str, Dict[str, Any]] = Field(..., description="Individual node results")
     execution_time: float = Field(..., description="Total execution time")
     error: Optional[str] = Field(None, description="Error message if failed")
-    node_execution_stats: Dict[str, Dict[str, Any]] = Field(
+    node_execution_stats: Dict[str, NodeExecutionStats] = Field(
         default_factory=dict,
-        description="Per-node execution telemetry (duration, status, error, plugin_id)"
+        description="Per-node execution telemetry keyed by node id"
     )
-    execution_graph: List[List[str]] = Field(default_factory=list, description="Execution order by batches")
+    execution_graph: List[List[str]] = Field(default_factory=list, description="Node ids grouped in the order they were dispatched")
     started_at: str = Field(default_factory=lambda: datetime.now().isoformat(), description="Execution start time")
     completed_at: str = Field(default_factory=lambda: datetime.now().isoformat(), description="Execution completion time")
 
+    def __bool__(self) -> bool:
+        return self.success
+
 
 class ChainTemplate(BaseModel):
     """Reusable chain template"""
@@ -109,7 +159,16 @@ class ChainValidationResult(BaseModel):
     """Result of chain validation"""
     is_valid: bool = Field(..., description="Whether the chain is valid")
     errors: List[str] = Field(default_factory=list, description="Validation errors")
+    error_codes: List[ValidationErrorCode] = Field(default_factory=list, description="Code for each entry in errors, in the same order")
     warnings: List[str] = Field(default_factory=list, description="Validation warnings")
-    missing_plugins: List[str] = Field(default_factory=list, description="Missing required plugins")
+    missing_plugins: Set[str] = Field(default_factory=set, description="Missing required plugins")
     cycle_detected: bool = Field(False, description="Whether circular dependencies were detected")
-    disconnected_nodes: List[str] = Field(default_factory=list, description="Nodes not connected to the main flow") 
+    cycle_path: List[str] = Field(default_factory=list, description="Node ids along the first detected cycle, first node repeated at the end")
+    disconnected_nodes: List[str] = Field(default_factory=list, description="Nodes not connected to the main flow")
+    # Connection index built during validation and reused by the executor;
+    # excluded from serialized output
+    adjacency: Dict[str, List[str]] = Field(default_factory=dict, exclude=True, description="Successor node ids per node")
+    in_degree: Dict[str, int] = Field(default_factory=dict, exclude=True, description="Incoming connection count per node")
+
+    def __bool__(self) -> bool:
+        return self.is_valid
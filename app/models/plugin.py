@@ -1,7 +1,8 @@
-from typing import Dict, Any, List, Optional, Union, Type, Set
+from typing import Dict, Any, FrozenSet, List, Optional, Union, Type, Set, Tuple
 from pydantic import BaseModel, Field
 from enum import Enum
 from abc import ABC, abstractmethod
+from functools import lru_cache
 
 
 class InputFieldType(str, Enum):
@@ -73,20 +74,40 @@ class BasePluginResponse(BaseModel):
     pass
 
 
-def _model_validate(model_cls: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+class BatchItemError(dict):
+    """
+    execute_batch() entry for an input that failed.
+
+    A plain dict (so it serializes like any response) holding the "error"
+    message plus any plugin-specific details. run_batch() passes it through
+    unvalidated and the plugin manager reports it as a failed execution.
+    """
+
+    def __init__(self, error: str, **details: Any):
+        super().__init__(details, error=error)
+
+
+def model_validate(model_cls: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
     """Validate a payload against a Pydantic model across v1/v2 APIs."""
     if hasattr(model_cls, "model_validate"):
         return model_cls.model_validate(data)
     return model_cls(**data)
 
 
-def _model_dump(model_instance: BaseModel) -> Dict[str, Any]:
+def model_dump(model_instance: BaseModel) -> Dict[str, Any]:
     """Dump a Pydantic model instance across v1/v2 APIs."""
     if hasattr(model_instance, "model_dump"):
         return model_instance.model_dump()
     return model_instance.dict()
 
 
+def _model_copy(model_instance: BaseModel) -> BaseModel:
+    """Deep-copy a Pydantic model instance across v1/v2 APIs."""
+    if hasattr(model_instance, "model_copy"):
+        return model_instance.model_copy(deep=True)
+    return model_instance.copy(deep=True)
+
+
 def model_json_schema(model_cls: Type[BaseModel]) -> Dict[str, Any]:
     """Return JSON schema for a Pydantic model across v1/v2 APIs."""
     if hasattr(model_cls, "model_json_schema"):
@@ -94,6 +115,26 @@ def model_json_schema(model_cls: Type[BaseModel]) -> Dict[str, Any]:
     return model_cls.schema()
 
 
+def rebuild_model(model_cls: Type[BaseModel]) -> None:
+    """Complete a model's deferred validator build now instead of on first use, across v1/v2 APIs."""
+    if hasattr(model_cls, "model_rebuild"):
+        model_cls.model_rebuild()
+    else:
+        model_cls.update_forward_refs()
+
+
+@lru_cache(maxsize=256)
+def schema_field_names(model_cls: Type[BaseModel]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Return (property names, required names) of a model's JSON schema, computed once per class."""
+    schema = model_json_schema(model_cls)
+    properties = schema.get("properties")
+    required = schema.get("required")
+    return (
+        frozenset(properties) if isinstance(properties, dict) else frozenset(),
+        frozenset(str(item) for item in required) if isinstance(required, list) else frozenset(),
+    )
+
+
 def get_model_fields(model_cls: Type[BaseModel]) -> Dict[str, Any]:
     """Return model fields map across v1/v2 APIs."""
     if hasattr(model_cls, "model_fields"):
@@ -147,7 +188,8 @@ class BasePlugin(ABC):
                   handle both cases gracefully.
             
         Returns:
-            Dictionary that MUST validate against the model returned by get_response_model()
+            Dictionary that MUST validate against the model returned by get_response_model(),
+            or an instance of that model, which is used without validating it again
         """
         pass
     
@@ -165,7 +207,7 @@ class BasePlugin(ABC):
         """
         pass
     
-    def validate_response(self, response_data: Dict[str, Any]) -> BasePluginResponse:
+    def validate_response(self, response_data: Union[Dict[str, Any], BasePluginResponse]) -> BasePluginResponse:
         """
         Validate the response data against the plugin's response model.
         
@@ -179,7 +221,9 @@ class BasePlugin(ABC):
             ValidationError: If the response doesn't match the model
         """
         response_model = self.get_response_model()
-        return _model_validate(response_model, response_data)
+        if isinstance(response_data, response_model):
+            return response_data
+        return model_validate(response_model, response_data)
 
     def validate_input(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -192,8 +236,8 @@ class BasePlugin(ABC):
         if not input_model:
             return dict(raw_data)
 
-        validated = _model_validate(input_model, raw_data)
-        return _model_dump(validated)
+        validated = model_validate(input_model, raw_data)
+        return model_dump(validated)
 
     def run(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -202,7 +246,47 @@ class BasePlugin(ABC):
         normalized_input = self.validate_input(raw_data)
         result = self.execute(normalized_input)
         validated_output = self.validate_response(result)
-        return _model_dump(validated_output)
+        return model_dump(validated_output)
+
+    def execute_batch(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Execute the plugin on each file in data["input_files"] with the other options shared.
+
+        Plugins that can share setup across files (e.g. one process start for
+        several conversions) override this. Returns one response dict per file,
+        in input order; a file that fails gets a BatchItemError entry instead
+        of failing the batch.
+        """
+        options = {key: value for key, value in data.items() if key != "input_files"}
+        results = []
+        for input_file in data["input_files"]:
+            try:
+                results.append(self.execute({**options, "input_file": input_file}))
+            except Exception as e:
+                results.append(BatchItemError(str(e)))
+        return results
+
+    def run_batch(self, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Batch counterpart of run(): validate input, execute_batch, validate each output.
+
+        raw_data holds the shared options plus an "input_files" list; each file
+        is validated as the "input_file" of an otherwise identical input.
+        """
+        input_files = raw_data.get("input_files")
+        if not input_files:
+            raise ValueError("Missing input files")
+        options = {key: value for key, value in raw_data.items() if key != "input_files"}
+        normalized_inputs = [self.validate_input({**options, "input_file": input_file})
+                             for input_file in input_files]
+
+        batch_input = {key: value for key, value in normalized_inputs[0].items() if key != "input_file"}
+        batch_input["input_files"] = [normalized["input_file"] for normalized in normalized_inputs]
+        return [
+            result if isinstance(result, BatchItemError)
+            else model_dump(self.validate_response(result))
+            for result in self.execute_batch(batch_input)
+        ]
 
     @classmethod
     def get_contract_schema(cls) -> Dict[str, Any]:
@@ -227,7 +311,19 @@ class BasePlugin(ABC):
     def derive_input_fields(cls) -> List[InputField]:
         """
         Derive InputField metadata from the canonical class contract.
+
+        The schema walk runs once per plugin class; each call returns copies.
         """
+        # Looked up in the class's own namespace so subclasses derive their own
+        cached = cls.__dict__.get("_derived_input_fields")
+        if cached is None:
+            cached = cls._derive_input_fields()
+            cls._derived_input_fields = cached
+        return [_model_copy(field) for field in cached]
+
+    @classmethod
+    def _derive_input_fields(cls) -> List[InputField]:
+        """Build InputField metadata from get_ui_fields() or the input model schema."""
         explicit_fields = cls.get_ui_fields()
         if explicit_fields is not None:
             return explicit_fields
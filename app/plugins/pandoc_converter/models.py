@@ -59,6 +59,8 @@ class InputFileInfo:
     size: int
     path: Path
     extension: str
+    supports_mmap: bool = False
+    content: Optional[bytes] = None  # In-memory input piped to pandoc via stdin
     
     @property
     def size_mb(self) -> float:
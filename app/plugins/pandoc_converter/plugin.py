@@ -2,10 +2,13 @@ import subprocess
 import shutil
 import logging
 import re
+import shlex
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, Type, List, Union, Literal
+from typing import Dict, Any, Type, List, Tuple, Union, Literal
 from pydantic import BaseModel, Field
-from ...models.plugin import BasePlugin
+from ...models.plugin import BasePlugin, BatchItemError, model_dump, model_validate
 
 # Import all components from refactored modules
 from .models import (
@@ -23,6 +26,41 @@ from .strategies import (
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of temp directory entries logged when a conversion fails
+TEMP_DIR_LOG_LIMIT = 50
+
+# Advanced options matching any of these are rejected, compiled once as one alternation
+_DANGEROUS_OPTION_PATTERN = re.compile(
+    r'[;&|`$]'      # Shell metacharacters
+    r'|\.\./'       # Directory traversal
+    r'|--?[io]$'    # Input/output flags that could override our files
+    r'|--input'
+    r'|--output'
+)
+
+# Characters that make shlex tokenization differ from a plain whitespace split
+_SHLEX_SPECIAL_CHARS = frozenset('"\'\\')
+
+
+@lru_cache(maxsize=256)
+def _join_output_format(base_format: str, features: Tuple[str, ...]) -> str:
+    """Glue validated features onto the base format, e.g. 'markdown+smart-raw_html'"""
+    return "".join((base_format, *features))
+
+
+PandocOutputFormat = Literal[
+    "plain",
+    "asciidoc",
+    "pdf",
+    "html5",
+    "docbook5",
+    "epub",
+    "markdown",
+    "markdown_mmd",
+    "markdown_strict",
+    "json",
+]
+
 
 class PandocConverterInput(BaseModel):
     input_file: Dict[str, Any] = Field(
@@ -33,18 +71,7 @@ class PandocConverterInput(BaseModel):
             "validation": {"allowed_extensions": ["epub", "html", "md", "docx", "odt", "rtf", "latex"]},
         },
     )
-    output_format: Literal[
-        "plain",
-        "asciidoc",
-        "pdf",
-        "html5",
-        "docbook5",
-        "epub",
-        "markdown",
-        "markdown_mmd",
-        "markdown_strict",
-        "json",
-    ] = Field(
+    output_format: PandocOutputFormat = Field(
         ...,
         json_schema_extra={
             "label": "Output Format",
@@ -91,23 +118,44 @@ class PandocConverterInput(BaseModel):
     )
 
 
+# Services and strategies keep no per-request state (everything request
+# specific travels in ProcessingContext), so one set is shared by all
+# Plugin instances instead of being rebuilt for every request.
+_MEMORY_MONITOR = MemoryMonitor()
+_FILE_HANDLER = FileHandler()
+_PANDOC_EXECUTOR = PandocExecutor(_MEMORY_MONITOR)
+_TEXT_EXTRACTOR = TextExtractor()
+_CHUNKING_SERVICE = ChunkingService()
+
+_SINGLE_FILE_STRATEGY = SingleFileStrategy(_PANDOC_EXECUTOR, _MEMORY_MONITOR)
+_CHUNKED_STRATEGY = ChunkedStrategy(_PANDOC_EXECUTOR, _MEMORY_MONITOR, _CHUNKING_SERVICE, _TEXT_EXTRACTOR)
+_TEXT_EXTRACTION_STRATEGY = TextExtractionStrategy(_TEXT_EXTRACTOR, _MEMORY_MONITOR)
+
+
+class PandocConverterBatchInput(BaseModel):
+    """Batch input for execute_batch(): one option set applied to several files."""
+    input_files: List[Dict[str, Any]] = Field(..., min_length=1)
+    output_format: PandocOutputFormat
+    self_contained: bool = False
+    advanced_options: Union[str, List[str], None] = None
+    features: Union[str, List[str], None] = None
+
+
 class Plugin(BasePlugin):
     """Pandoc File Converter Plugin - Converts files between markup formats using Pandoc"""
     
     def __init__(self):
-        # Initialize service components
-        self.memory_monitor = MemoryMonitor()
-        self.file_handler = FileHandler()
-        self.pandoc_executor = PandocExecutor(self.memory_monitor)
-        self.text_extractor = TextExtractor()
-        self.chunking_service = ChunkingService()
+        # Bind the shared, stateless service components
+        self.memory_monitor = _MEMORY_MONITOR
+        self.file_handler = _FILE_HANDLER
+        self.pandoc_executor = _PANDOC_EXECUTOR
+        self.text_extractor = _TEXT_EXTRACTOR
+        self.chunking_service = _CHUNKING_SERVICE
         
-        # Initialize processing strategies
-        self.single_file_strategy = SingleFileStrategy(self.pandoc_executor, self.memory_monitor)
-        self.chunked_strategy = ChunkedStrategy(
-            self.pandoc_executor, self.memory_monitor, self.chunking_service, self.text_extractor
-        )
-        self.text_extraction_strategy = TextExtractionStrategy(self.text_extractor, self.memory_monitor)
+        # Bind the shared processing strategies
+        self.single_file_strategy = _SINGLE_FILE_STRATEGY
+        self.chunked_strategy = _CHUNKED_STRATEGY
+        self.text_extraction_strategy = _TEXT_EXTRACTION_STRATEGY
 
     @classmethod
     def get_input_model(cls) -> Type[BaseModel]:
@@ -132,9 +180,12 @@ class Plugin(BasePlugin):
             
         return input_file_info, output_format, self_contained, advanced_options, features
     
-    def _setup_input_file(self, input_file_info: Dict[str, Any], temp_dir: Path) -> InputFileInfo:
+    def _setup_input_file(self, input_file_info: Dict[str, Any], temp_dir: Path,
+                          config: ProcessingConfig) -> InputFileInfo:
         """Setup input file and return file info"""
         input_filename = input_file_info["filename"]
+        input_path = temp_dir / input_filename
+        input_content = None
         
         if "temp_path" in input_file_info:
             # New streaming format - file already on disk
@@ -142,23 +193,29 @@ class Plugin(BasePlugin):
             file_size = input_file_info["size"]
             
             # Move to our temp directory for processing
-            input_path = temp_dir / input_filename
             shutil.move(str(temp_input_path), str(input_path))
-            logger.info(f"Moved streamed file to processing directory: {input_path}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Moved streamed file to processing directory: {input_path}")
         else:
             # Legacy format - content in memory
-            input_file_content = input_file_info["content"]
-            file_size = len(input_file_content)
+            input_content = input_file_info["content"]
+            file_size = len(input_content)
             
-            # Write input file to temp directory
-            input_path = temp_dir / input_filename
-            with open(input_path, "wb") as f:
-                f.write(input_file_content)
-            logger.info(f"Wrote legacy content to processing directory: {input_path}")
+            # Files that will take the single-file path and that pandoc can read
+            # from stdin are piped to it directly instead of written to disk first
+            if (file_size > config.chunking_threshold
+                    or not self.pandoc_executor.can_read_stdin(Path(input_filename).suffix)):
+                with open(input_path, "wb") as f:
+                    f.write(input_content)
+                input_content = None
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Wrote legacy content to processing directory: {input_path}")
         
         # Validate input file
         file_info = self.file_handler.validate_input(input_filename, file_size)
         file_info.path = input_path  # Set the actual path
+        file_info.content = input_content
+        file_info.supports_mmap = input_content is None and input_path.is_file()  # Local regular file in our temp dir
         
         return file_info
     
@@ -180,17 +237,20 @@ class Plugin(BasePlugin):
         
         # For very large HTML files, use direct text extraction
         if file_size > config.text_extraction_threshold and file_ext.lower() == '.html':
-            logger.info(f"Large HTML file detected ({file_info.size_mb}MB), using text extraction strategy")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Large HTML file detected ({file_info.size_mb}MB), using text extraction strategy")
             return self.text_extraction_strategy
         
         # For medium-large HTML files, use chunking
         elif self.chunking_service.should_chunk(file_size, file_ext, config.chunking_threshold):
-            logger.info(f"Medium-large file detected ({file_info.size_mb}MB), using chunked strategy")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Medium-large file detected ({file_info.size_mb}MB), using chunked strategy")
             return self.chunked_strategy
         
         # For normal files, use single file processing
         else:
-            logger.info(f"Standard file size ({file_info.size_mb}MB), using single file strategy")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Standard file size ({file_info.size_mb}MB), using single file strategy")
             return self.single_file_strategy
     
     def _create_processing_context(self, file_info: InputFileInfo, config: ProcessingConfig, 
@@ -206,12 +266,9 @@ class Plugin(BasePlugin):
             self_contained=self_contained
         )
     
-    def _format_response(self, result, permanent_file_path: Path,
+    def _format_response(self, result, permanent_file_path: Path, output_size: int,
                         pandoc_version: str, context: ProcessingContext) -> Dict[str, Any]:
         """Format the final response"""
-        # Get output size from permanent file location (since temp file was moved)
-        output_size = permanent_file_path.stat().st_size if permanent_file_path and permanent_file_path.exists() else 0
-        
         conversion_details = {
             "pandoc_version": pandoc_version,
             "input_file": {
@@ -244,16 +301,94 @@ class Plugin(BasePlugin):
         }
     
     def execute(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Main execute method - clean and focused"""
+        """Main execute method - converts a single file as a one-element batch"""
+        return self._convert_files(data, self._parse_input_data)[0]
+    
+    def execute_batch(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Convert several files with one set of options.
+        
+        Options are validated and the output format is built once, all files
+        share one temporary directory, and pandoc is probed for its version
+        once. Returns one response dict per input file, in input order; a file
+        that fails to convert gets a BatchItemError entry instead of failing the batch.
+        """
+        return self._convert_files(data, self._parse_batch_input_data, isolate_errors=True)
+    
+    def _parse_batch_input_data(self, data: Dict[str, Any]) -> tuple:
+        """Parse and validate batch input data"""
+        batch_input = model_dump(model_validate(PandocConverterBatchInput, data))
+        return (
+            batch_input["input_files"], batch_input["output_format"], batch_input["self_contained"],
+            batch_input["advanced_options"], batch_input["features"]
+        )
+    
+    def _conversion_error(self, error: Exception) -> RuntimeError:
+        """Map a failed conversion to the RuntimeError reported to the caller"""
+        if isinstance(error, subprocess.TimeoutExpired):
+            error_msg = "Processing timed out. The file may be too large or complex."
+            logger.error(error_msg)
+            return RuntimeError(error_msg)
+        logger.error(f"Unexpected error in conversion: {error}")
+        return RuntimeError(f"An unexpected error occurred during conversion: {error}")
+    
+    def _format_error_response(self, input_file_info: Dict[str, Any], error: Exception) -> BatchItemError:
+        """Batch entry for a file that could not be converted"""
+        return BatchItemError(
+            str(error),
+            file_path="",
+            file_name="",
+            conversion_details={
+                "input_file": {"filename": input_file_info.get("filename", "")},
+                "conversion_successful": False
+            }
+        )
+    
+    def _convert_file(self, input_file_info: Dict[str, Any], file_dir: Path, config: ProcessingConfig,
+                      output_format: str, complete_output_format: str, self_contained: bool) -> tuple:
+        """Convert one file in file_dir; returns the result, its context and the moved output"""
+        # 5. Setup input file and processing context
+        file_info = self._setup_input_file(input_file_info, file_dir, config)
+        context = self._create_processing_context(
+            file_info, config, file_dir, output_format, complete_output_format, self_contained
+        )
+        
+        # 6. Select and execute processing strategy
+        strategy = self._select_strategy(file_info, config)
+        result = strategy.process(context)
+        
+        # 7. Handle processing result
+        if not result.success:
+            raise RuntimeError(result.error or "Processing failed")
+        
+        # 8. Move output to permanent location; a missing output surfaces here
+        if not result.output_path:
+            raise RuntimeError(f"Output file was not created or does not exist: {result.output_path}")
+        try:
+            permanent_file_path, output_size = self.file_handler.move_to_downloads(
+                result.output_path, result.output_path.name
+            )
+        except FileNotFoundError as e:
+            raise RuntimeError(f"Output file was not created or could not be moved: {e}")
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"File successfully moved to permanent location: {permanent_file_path} ({output_size} bytes)")
+        
+        return result, context, permanent_file_path, output_size
+    
+    def _convert_files(self, data: Dict[str, Any], parse_input,
+                       isolate_errors: bool = False) -> List[Dict[str, Any]]:
+        """Shared conversion loop behind execute() and execute_batch()"""
         temp_dir = None
         
         try:
             # 1. Parse and validate input
-            input_file_info, output_format, self_contained, advanced_options, features = self._parse_input_data(data)
+            input_files, output_format, self_contained, advanced_options, features = parse_input(data)
+            if isinstance(input_files, dict):
+                input_files = [input_files]
             
-            # 2. Setup temporary directory and input file
+            # 2. Setup temporary directory (shared by the whole batch)
             temp_dir = self.file_handler.setup_temp_directory()
-            file_info = self._setup_input_file(input_file_info, temp_dir)
             
             # 3. Create processing configuration
             config = self._create_processing_config(advanced_options, features)
@@ -261,50 +396,44 @@ class Plugin(BasePlugin):
             # 4. Build complete output format
             complete_output_format = self._build_output_format_with_features(output_format, config.features)
             
-            # 5. Create processing context
-            context = self._create_processing_context(
-                file_info, config, temp_dir, output_format, complete_output_format, self_contained
-            )
-            
-            # 6. Select and execute processing strategy
-            strategy = self._select_strategy(file_info, config)
-            result = strategy.process(context)
+            pandoc_version = None
+            responses = []
+            for index, input_file_info in enumerate(input_files):
+                # Keep each file's intermediates apart so equal names cannot collide
+                file_dir = temp_dir / f"{index:04d}" if len(input_files) > 1 else temp_dir
+                file_dir.mkdir(exist_ok=True)
+                
+                try:
+                    result, context, permanent_file_path, output_size = self._convert_file(
+                        input_file_info, file_dir, config, output_format, complete_output_format, self_contained
+                    )
+                except Exception as e:
+                    if not isolate_errors:
+                        raise
+                    # One bad file does not fail the rest of the batch
+                    responses.append(self._format_error_response(input_file_info, self._conversion_error(e)))
+                    continue
+                
+                # 9. Get pandoc version for diagnostics (once per batch)
+                if pandoc_version is None:
+                    pandoc_version = self.pandoc_executor.get_version()
+                
+                # 10. Format response
+                responses.append(
+                    self._format_response(result, permanent_file_path, output_size, pandoc_version, context)
+                )
             
-            # 7. Handle processing result
-            if not result.success:
-                raise RuntimeError(result.error or "Processing failed")
-            
-            # 8. Verify output file exists before moving
-            if not result.output_path or not result.output_path.exists():
-                raise RuntimeError(f"Output file was not created or does not exist: {result.output_path}")
-            
-            logger.info(f"Successfully created output file: {result.output_path} ({result.output_path.stat().st_size} bytes)")
-            
-            # 9. Move output to permanent location
-            permanent_file_path = self.file_handler.move_to_downloads(result.output_path, result.output_path.name)
-            
-            # 10. Verify permanent file exists
-            if not permanent_file_path.exists():
-                raise RuntimeError(f"Failed to move file to permanent location: {permanent_file_path}")
-            
-            logger.info(f"File successfully moved to permanent location: {permanent_file_path}")
-            
-            # 11. Get pandoc version for diagnostics
-            pandoc_version = self.pandoc_executor.get_version()
-            
-            # 12. Format and return response
-            return self._format_response(result, permanent_file_path, pandoc_version, context)
-            
-        except subprocess.TimeoutExpired:
-            error_msg = "Processing timed out. The file may be too large or complex."
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
+            return responses
             
         except Exception as e:
-            logger.error(f"Unexpected error in conversion: {e}")
-            if temp_dir and temp_dir.exists():
-                logger.error(f"Temp directory contents: {list(temp_dir.iterdir()) if temp_dir.exists() else 'Directory does not exist'}")
-            raise RuntimeError(f"An unexpected error occurred during conversion: {e}")
+            error = self._conversion_error(e)
+            if (not isinstance(e, subprocess.TimeoutExpired) and temp_dir
+                    and logger.isEnabledFor(logging.DEBUG) and temp_dir.exists()):
+                entries = temp_dir.iterdir()
+                listed = list(islice(entries, TEMP_DIR_LOG_LIMIT))
+                truncated = " (truncated)" if next(entries, None) is not None else ""
+                logger.debug(f"Temp directory contents: {listed}{truncated}")
+            raise error
             
         finally:
             # Clean up temporary directory
@@ -318,33 +447,27 @@ class Plugin(BasePlugin):
         
         # Convert to list if string
         if isinstance(advanced_options, str):
-            # Split by spaces, but preserve quoted arguments
-            import shlex
-            try:
-                options_list = shlex.split(advanced_options)
-            except ValueError as e:
-                raise ValueError(f"Invalid advanced_options format: {e}")
+            # Split by spaces, but preserve quoted arguments. Without quotes or
+            # escapes shlex.split() yields exactly the whitespace-separated
+            # tokens, so the C-level str.split() is used for that common case.
+            if not _SHLEX_SPECIAL_CHARS.intersection(advanced_options):
+                options_list = advanced_options.split()
+            else:
+                try:
+                    options_list = shlex.split(advanced_options)
+                except ValueError as e:
+                    raise ValueError(f"Invalid advanced_options format: {e}")
         else:
-            options_list = advanced_options.copy()
-        
-        # Security validation: check for dangerous patterns
-        dangerous_patterns = [
-            r'[;&|`$]',  # Shell metacharacters
-            r'\.\./',     # Directory traversal
-            r'--?[io]$',  # Input/output flags that could override our files
-            r'--input',
-            r'--output',
-        ]
+            options_list = advanced_options
         
         validated_options = []
         for option in options_list:
             if not isinstance(option, str):
                 raise ValueError(f"All advanced options must be strings, got: {type(option)}")
             
-            # Check for dangerous patterns
-            for pattern in dangerous_patterns:
-                if re.search(pattern, option):
-                    raise ValueError(f"Advanced option contains potentially dangerous content: '{option}'")
+            # Security validation: check for dangerous patterns
+            if _DANGEROUS_OPTION_PATTERN.search(option):
+                raise ValueError(f"Advanced option contains potentially dangerous content: '{option}'")
             
             # Don't allow overriding critical options
             if option.startswith(('-o', '--output')):
@@ -362,9 +485,9 @@ class Plugin(BasePlugin):
         # Convert to list if string
         if isinstance(features, str):
             # Split by commas or spaces
-            features_list = [f.strip() for f in re.split(r'[,\s]+', features) if f.strip()]
+            features_list = features.replace(',', ' ').split()
         else:
-            features_list = features.copy()
+            features_list = features
         
         validated_features = []
         for feature in features_list:
@@ -375,8 +498,10 @@ class Plugin(BasePlugin):
             if not feature:
                 continue
             
-            # Validate feature format
-            if not re.match(r'^[+-]?[a-zA-Z_][a-zA-Z0-9_]*$', feature):
+            # Validate feature format: optional +/- sign, then an ASCII identifier
+            # (equivalent to ^[+-]?[a-zA-Z_][a-zA-Z0-9_]*$)
+            name = feature[1:] if feature[0] in '+-' else feature
+            if not (name.isascii() and name.isidentifier()):
                 raise ValueError(f"Invalid feature format: '{feature}'. Features should be alphanumeric with optional +/- prefix")
             
             # Ensure feature has +/- prefix
@@ -393,7 +518,6 @@ class Plugin(BasePlugin):
         if not features:
             return base_format
         
-        # Combine base format with features
-        format_with_features = base_format + ''.join(features)
-        return format_with_features
+        # Combine base format with features (memoized per format/feature set)
+        return _join_output_format(base_format, tuple(features))
     
@@ -1,4 +1,5 @@
 import logging
+import shutil
 from pathlib import Path
 from typing import List
 from bs4 import BeautifulSoup
@@ -6,6 +7,9 @@ from bs4 import BeautifulSoup
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Buffer size used when streaming chunk outputs into the merged file
+COPY_BUFFER_SIZE = 1 << 20  # 1MB
+
 
 class ChunkingService:
     """Handles HTML file chunking operations"""
@@ -260,31 +264,48 @@ class ChunkingService:
             return [chunk_path]
     
     def merge_chunks(self, chunk_results: List[Path], output_format: str, temp_dir: Path, original_stem: str) -> Path:
-        """Merge converted chunks back into single output file"""
+        """Merge converted chunks back into single output file.
+
+        Each chunk is streamed into the merged file, so peak memory stays at
+        one copy buffer instead of the full output. Chunk files are only
+        removed once the whole merge has succeeded, so they remain available
+        to the fallback below.
+        """
         merged_filename = f"{original_stem}_merged.{output_format}"
         merged_path = temp_dir / merged_filename
         
+        # Separator between chunks (written before every chunk but the first)
+        if output_format in ['md', 'markdown']:
+            separator = b"\n\n---\n\n"  # Markdown separator
+        elif output_format in ['txt', 'plain']:
+            separator = b"\n\n" + b"=" * 50 + b"\n\n"  # Text separator
+        else:
+            separator = b"\n\n"  # Simple separator
+        
+        merged_count = 0
+        merged_chunks = []
         try:
-            with open(merged_path, 'w', encoding='utf-8') as merged_file:
-                for i, chunk_path in enumerate(chunk_results):
-                    if chunk_path.exists():
-                        with open(chunk_path, 'r', encoding='utf-8') as chunk_file:
-                            content = chunk_file.read()
-                            
-                            # Add separator between chunks (except for first chunk)
-                            if i > 0:
-                                if output_format in ['md', 'markdown']:
-                                    merged_file.write("\n\n---\n\n")  # Markdown separator
-                                elif output_format in ['txt', 'plain']:
-                                    merged_file.write("\n\n" + "="*50 + "\n\n")  # Text separator
-                                else:
-                                    merged_file.write("\n\n")  # Simple separator
-                            
-                            merged_file.write(content)
-                    else:
+            with open(merged_path, 'wb', buffering=COPY_BUFFER_SIZE) as merged_file:
+                for chunk_path in chunk_results:
+                    try:
+                        chunk_file = open(chunk_path, 'rb')
+                    except FileNotFoundError:
                         logger.warning(f"Chunk file not found: {chunk_path}")
+                        continue
+                    
+                    with chunk_file:
+                        if merged_count:
+                            merged_file.write(separator)
+                        shutil.copyfileobj(chunk_file, merged_file, COPY_BUFFER_SIZE)
+                    
+                    merged_chunks.append(chunk_path)
+                    merged_count += 1
+            
+            # Release the chunks now that the merged file is complete
+            for chunk_path in merged_chunks:
+                chunk_path.unlink(missing_ok=True)
             
-            logger.info(f"Merged {len(chunk_results)} chunks into: {merged_filename}")
+            logger.info(f"Merged {merged_count} chunks into: {merged_filename}")
             return merged_path
             
         except Exception as e:
@@ -293,4 +314,4 @@ class ChunkingService:
             for chunk_path in chunk_results:
                 if chunk_path.exists():
                     return chunk_path
-            raise RuntimeError(f"No successful chunks to merge: {e}") 
\ No newline at end of file
+            raise RuntimeError(f"No successful chunks to merge: {e}")
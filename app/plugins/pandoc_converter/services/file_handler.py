@@ -3,6 +3,8 @@ import shutil
 import uuid
 import logging
 from pathlib import Path
+from typing import Tuple
+from ....utils.files import move_file
 from ..models import InputFileInfo
 
 # Set up logging
@@ -39,8 +41,13 @@ class FileHandler:
         logger.info(f"Created temporary directory: {temp_dir}")
         return temp_dir
     
-    def move_to_downloads(self, temp_file_path: Path, filename: str) -> Path:
-        """Move file from temp directory to permanent downloads directory"""
+    def move_to_downloads(self, temp_file_path: Path, filename: str) -> Tuple[Path, int]:
+        """
+        Move file from temp directory to permanent downloads directory.
+        
+        Returns the permanent path and the file size from a single stat of the
+        moved file. Raises FileNotFoundError if the source does not exist.
+        """
         self.downloads_dir.mkdir(parents=True, exist_ok=True)
         
         # Create unique filename to avoid conflicts
@@ -52,10 +59,10 @@ class FileHandler:
         permanent_path = self.downloads_dir / safe_filename
         
         # Move the file
-        shutil.move(str(temp_file_path), str(permanent_path))
+        file_size = move_file(temp_file_path, permanent_path)
         logger.info(f"Moved output file to permanent location: {permanent_path}")
         
-        return permanent_path
+        return permanent_path, file_size
     
     def cleanup(self, temp_dir: Path):
         """Clean up temporary directory"""
@@ -9,6 +9,31 @@ from .memory import MemoryMonitor
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Pandoc readers for text input formats that can be piped through stdin
+STDIN_READERS = {
+    '.html': 'html',
+    '.md': 'markdown',
+    '.latex': 'latex',
+    '.rtf': 'rtf',
+}
+
+# Pandoc options naming the input format; the last one given wins
+INPUT_FORMAT_OPTIONS = ('-f', '-r', '--from', '--read')
+
+# Pipe buffer size and the largest slice written to pandoc's stdin at once
+STDIN_BUFFER_SIZE = 1 << 20  # 1MB
+STDIN_WRITE_SIZE = 64 * 1024 * 1024  # 64MB
+
+
+def _sets_input_format(options: List[str]) -> bool:
+    """Whether options already choose pandoc's reader (-f html, -fhtml, --from=html, ...)"""
+    for option in options:
+        if option in INPUT_FORMAT_OPTIONS or option.startswith(('--from=', '--read=')):
+            return True
+        if option[:2] in ('-f', '-r') and not option.startswith('--'):
+            return True
+    return False
+
 
 class PandocExecutor:
     """Handles pandoc command execution with memory monitoring"""
@@ -16,17 +41,26 @@ class PandocExecutor:
     def __init__(self, memory_monitor: MemoryMonitor):
         self.memory_monitor = memory_monitor
     
-    def build_command(self, input_path: Path, output_path: Path, output_format: str, 
-                     advanced_options: List[str], self_contained: bool) -> List[str]:
-        """Build pandoc command for execution"""
+    def can_read_stdin(self, extension: str) -> bool:
+        """Whether files with this extension can be piped to pandoc via stdin"""
+        return extension.lower() in STDIN_READERS
+    
+    def build_command(self, input_path: Optional[Path], output_path: Path, output_format: str, 
+                     advanced_options: List[str], self_contained: bool,
+                     input_format: Optional[str] = None) -> List[str]:
+        """Build pandoc command for execution (input_path None reads stdin)"""
         command = ["pandoc"]
         
         # Add advanced options first
         if advanced_options:
             command.extend(advanced_options)
         
-        # Add input file
-        command.append(str(input_path))
+        # Add input file, or the reader to use for stdin unless the
+        # advanced options already pick one (with its extensions)
+        if input_path is not None:
+            command.append(str(input_path))
+        if input_format and not _sets_input_format(advanced_options or []):
+            command.extend(["-f", input_format])
         
         # Add output format
         command.extend(["-t", output_format])
@@ -40,9 +74,22 @@ class PandocExecutor:
         
         return command
     
+    def convert_stream(self, input_bytes: bytes, input_extension: str, output_path: Path,
+                       output_format: str, advanced_options: List[str], self_contained: bool,
+                       temp_dir: Path, memory_limit_mb: int, timeout: int) -> bool:
+        """Convert in-memory input by piping it to pandoc's stdin"""
+        command = self.build_command(
+            None, output_path, output_format, advanced_options, self_contained,
+            input_format=STDIN_READERS[input_extension.lower()]
+        )
+        return self.execute_with_monitoring(
+            command, temp_dir, memory_limit_mb, timeout, input_bytes=input_bytes
+        )
+    
     def execute_with_monitoring(self, command: List[str], temp_dir: Path, 
                               memory_limit_mb: int, timeout: int, 
-                              chunk_num: Optional[int] = None) -> bool:
+                              chunk_num: Optional[int] = None,
+                              input_bytes: Optional[bytes] = None) -> bool:
         """Execute pandoc command with memory monitoring and limits"""
         try:
             chunk_suffix = f"_chunk_{chunk_num}" if chunk_num else ""
@@ -55,8 +102,10 @@ class PandocExecutor:
                 # Start process
                 process = subprocess.Popen(
                     command,
+                    stdin=subprocess.PIPE if input_bytes is not None else None,
                     stdout=stdout_f,
-                    stderr=stderr_f
+                    stderr=stderr_f,
+                    bufsize=STDIN_BUFFER_SIZE
                 )
                 
                 # Start memory monitoring in background
@@ -67,6 +116,17 @@ class PandocExecutor:
                 )
                 monitor_thread.start()
                 
+                # Feed in-memory input through stdin without copying it, from
+                # its own thread so a stalled pandoc can't block the timeout
+                writer_thread = None
+                if input_bytes is not None:
+                    writer_thread = threading.Thread(
+                        target=self._write_stdin,
+                        args=(process, input_bytes),
+                        daemon=True
+                    )
+                    writer_thread.start()
+                
                 # Wait for process completion with timeout
                 try:
                     result = process.wait(timeout=timeout)
@@ -77,6 +137,10 @@ class PandocExecutor:
                     if process.poll() is None:
                         process.kill()
                     return False
+                finally:
+                    # A write blocked on a killed process fails with a broken pipe
+                    if writer_thread is not None:
+                        writer_thread.join(timeout=5)
             
             if result == 0:
                 logger.info(f"Pandoc command successful{' for chunk ' + str(chunk_num) if chunk_num else ''}")
@@ -102,6 +166,21 @@ class PandocExecutor:
             logger.error(f"Pandoc execution error{' for chunk ' + str(chunk_num) if chunk_num else ''}: {e}")
             return False
     
+    def _write_stdin(self, process: subprocess.Popen, input_bytes: bytes):
+        """Write input to the process's stdin in bounded slices, then close it"""
+        view = memoryview(input_bytes)
+        try:
+            for offset in range(0, len(view), STDIN_WRITE_SIZE):
+                process.stdin.write(view[offset:offset + STDIN_WRITE_SIZE])
+        except (OSError, ValueError):
+            # Pandoc exited early; its exit code and stderr carry the reason
+            logger.warning("Pandoc closed stdin before all input was written")
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+    
     def get_version(self) -> str:
         """Get pandoc version for diagnostics"""
         try:
@@ -1,10 +1,21 @@
+import html
 import logging
+import mmap
+import re
 from pathlib import Path
+from typing import Iterator
 from bs4 import BeautifulSoup
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Markup tokens skipped while scanning a memory-mapped HTML file. Script and
+# style blocks are dropped together with their content, like decompose() does.
+_MARKUP_PATTERN = re.compile(
+    rb'<(script|style)\b[^>]*>.*?</\1\s*>|<!--.*?-->|<[^>]*>',
+    re.IGNORECASE | re.DOTALL
+)
+
 
 class TextExtractor:
     """Handles text extraction from HTML without pandoc"""
@@ -47,6 +58,66 @@ class TextExtractor:
                 f.write(f"Text extraction failed for {input_path.name}: {e}")
             return output_path
     
+    def extract_from_path(self, input_path: Path, output_format: str, temp_dir: Path) -> Path:
+        """Extract text from an HTML file through a read-only memory map.
+
+        The file is scanned in place, so resident memory tracks the pages
+        being scanned rather than the file size. Only empty files, which
+        cannot be mapped, go through extract_from_html; other errors propagate.
+        """
+        logger.info("Extracting text from memory-mapped HTML without pandoc")
+        
+        output_filename = f"{input_path.stem}_extracted.{output_format}"
+        output_path = temp_dir / output_filename
+        
+        with open(input_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped; there is nothing to hold in RAM
+                logger.info(f"Cannot memory-map empty file {input_path.name}, using the buffered parser")
+                return self.extract_from_html(input_path, output_format, temp_dir)
+            
+            with mm:
+                if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                
+                self._write_output_lines(
+                    output_path, self._iter_clean_lines(mm), output_format, input_path.stem
+                )
+        
+        logger.info(f"Text extraction successful: {output_filename} ({output_path.stat().st_size / (1024*1024):.1f}MB)")
+        return output_path
+    
+    def _iter_text_segments(self, buffer) -> Iterator[str]:
+        """Yield decoded text between markup tokens of an HTML buffer"""
+        position = 0
+        for match in _MARKUP_PATTERN.finditer(buffer):
+            if match.start() > position:
+                yield html.unescape(buffer[position:match.start()].decode('utf-8', errors='ignore'))
+            position = match.end()
+        if position < len(buffer):
+            yield html.unescape(buffer[position:].decode('utf-8', errors='ignore'))
+    
+    def _iter_clean_lines(self, buffer) -> Iterator[str]:
+        """Yield cleaned text lines, matching _clean_text without building the full text"""
+        pending = ""
+        for segment in self._iter_text_segments(buffer):
+            lines = (pending + segment).splitlines(keepends=True)
+            # The last line may continue in the next segment
+            pending = lines.pop() if lines and not lines[-1].endswith(('\n', '\r')) else ""
+            for line in lines:
+                yield from self._clean_line(line)
+        if pending:
+            yield from self._clean_line(pending)
+    
+    def _clean_line(self, line: str) -> Iterator[str]:
+        """Yield the non-empty phrases of a single line"""
+        for phrase in line.strip().split("  "):
+            phrase = phrase.strip()
+            if phrase:
+                yield phrase
+    
     def _clean_text(self, text_content: str) -> str:
         """Clean up extracted text"""
         lines = (line.strip() for line in text_content.splitlines())
@@ -66,4 +137,22 @@ class TextExtractor:
                 # Fallback: wrap in basic HTML
                 f.write(f"<!DOCTYPE html>\n<html>\n<head>\n<title>{stem}</title>\n</head>\n<body>\n")
                 f.write(f"<pre>{clean_text}</pre>\n")
-                f.write("</body>\n</html>") 
\ No newline at end of file
+                f.write("</body>\n</html>")
+    
+    def _write_output_lines(self, output_path: Path, lines: Iterator[str], output_format: str, stem: str):
+        """Write cleaned lines incrementally, mirroring _write_output"""
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if output_format in ['txt', 'plain']:
+                prefix, suffix = "", ""
+            elif output_format in ['md', 'markdown']:
+                prefix, suffix = f"# {stem}\n\n", ""
+            else:
+                prefix = f"<!DOCTYPE html>\n<html>\n<head>\n<title>{stem}</title>\n</head>\n<body>\n<pre>"
+                suffix = "</pre>\n</body>\n</html>"
+            
+            f.write(prefix)
+            for i, line in enumerate(lines):
+                if i:
+                    f.write('\n')
+                f.write(line)
+            f.write(suffix)
@@ -28,17 +28,26 @@ class SingleFileStrategy(ProcessingStrategy):
             output_filename = f"{context.input_info.path.stem}.{output_extension}"
             output_path = context.temp_dir / output_filename
             
-            # Build pandoc command
-            command = self.pandoc_executor.build_command(
-                context.input_info.path, output_path, context.complete_output_format,
-                context.config.advanced_options, context.self_contained
-            )
-            
-            # Execute pandoc command
-            success = self.pandoc_executor.execute_with_monitoring(
-                command, context.temp_dir, context.config.memory_limit, 
-                context.config.timeout * 3  # Longer timeout for full files
-            )
+            if context.input_info.content is not None:
+                # In-memory input: pipe it to pandoc instead of going through disk
+                success = self.pandoc_executor.convert_stream(
+                    context.input_info.content, context.input_info.extension, output_path,
+                    context.complete_output_format, context.config.advanced_options,
+                    context.self_contained, context.temp_dir, context.config.memory_limit,
+                    context.config.timeout * 3  # Longer timeout for full files
+                )
+            else:
+                # Build pandoc command
+                command = self.pandoc_executor.build_command(
+                    context.input_info.path, output_path, context.complete_output_format,
+                    context.config.advanced_options, context.self_contained
+                )
+                
+                # Execute pandoc command
+                success = self.pandoc_executor.execute_with_monitoring(
+                    command, context.temp_dir, context.config.memory_limit, 
+                    context.config.timeout * 3  # Longer timeout for full files
+                )
             
             if not success:
                 return ProcessingResult(
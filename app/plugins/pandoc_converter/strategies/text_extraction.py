@@ -26,10 +26,15 @@ class TextExtractionStrategy(ProcessingStrategy):
             # Get proper output extension
             output_extension = get_output_extension(context.output_format)
             
-            # Extract text directly
-            output_path = self.text_extractor.extract_from_html(
-                context.input_info.path, output_extension, context.temp_dir
-            )
+            # Extract text directly, scanning the file in place when possible
+            if context.input_info.supports_mmap:
+                output_path = self.text_extractor.extract_from_path(
+                    context.input_info.path, output_extension, context.temp_dir
+                )
+            else:
+                output_path = self.text_extractor.extract_from_html(
+                    context.input_info.path, output_extension, context.temp_dir
+                )
             
             # Final memory check
             final_memory = self.memory_monitor.check_usage()
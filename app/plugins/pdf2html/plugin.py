@@ -1,18 +1,129 @@
 from pathlib import Path
 import subprocess
 import tempfile
-from typing import Dict, Any, Type, List, Literal
+from typing import Dict, Any, Type, List, Literal, Optional, Tuple
 import os
+import errno
+import hashlib
+import http.client
+import json
+import shlex
+import signal
+import socket
 import shutil
 import logging
-import uuid
+from secrets import token_hex
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
+from urllib.parse import urlencode
+import requests
 from pydantic import BaseModel, Field
-from ...models.plugin import BasePlugin, BasePluginResponse
+from ...models.plugin import BasePlugin, BasePluginResponse, BatchItemError, model_dump
+from ...utils.files import move_file
+
+try:
+    import docker
+    DOCKER_SDK_AVAILABLE = True
+except ImportError:
+    DOCKER_SDK_AVAILABLE = False
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# How long a resolved pdf2htmlEX container name is reused before re-probing
+SERVICE_CACHE_TTL = float(os.environ.get("PDF2HTMLEX_SERVICE_CACHE_TTL", "60"))
+DOCKER_SOCKET_PATH = "/var/run/docker.sock"
+SOCKET_PROBE_TIMEOUT = 1.0  # seconds
+CONVERSION_TIMEOUT = 600  # 10 minutes
+COPY_BUFFER_SIZE = 1 << 20  # 1MB
+STDERR_TAIL_BYTES = 64 * 1024  # Only the end of pdf2htmlEX's log is kept
+BATCH_LOG_NAME = "pdf2htmlEX.log"  # Per-file log written by batch conversions
+
+# Web form values that count as a checked checkbox
+_TRUTHY_STRINGS = frozenset(('true', '1', 'yes', 'on', 'checked'))
+
+# The shared volume as mounted here and inside the pdf2htmlEX service
+SHARED_DIR = Path("/app/shared")
+DOWNLOADS_DIR = Path("/app/data/downloads")
+CONTAINER_SHARED_DIR = "/shared"
+
+# Content-addressed cache of finished conversions, under the downloads dir
+CACHE_DIR_NAME = ".cache"
+CACHE_MAX_ENTRIES = int(os.environ.get("PDF2HTMLEX_CACHE_MAX_ENTRIES", "256"))
+HASH_BLOCK_SIZE = 4 * 1024 * 1024  # 4MB
+
+
+def _move_and_hash(src: Path, dst: Path) -> Tuple[int, str]:
+    """
+    Move src to dst and return its size and blake2b digest.
+
+    On one filesystem the file is renamed and read once for the digest;
+    across devices the digest is computed while copying, so either way
+    the content is read a single time in bounded blocks.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    size = 0
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            for block in iter(lambda: src_file.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+                dst_file.write(block)
+                size += len(block)
+        os.unlink(src)
+        return size, digest.hexdigest()
+
+    with open(dst, "rb") as dst_file:
+        for block in iter(lambda: dst_file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+            size += len(block)
+    return size, digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _ensure_directory(path: Path) -> Path:
+    """Create a long-lived directory once per process and return it"""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+# Font formats pdf2htmlEX can embed; the select options and the Literal share them
+FONT_FORMATS = ("woff", "ttf", "otf", "svg")
+Pdf2HtmlFontFormat = Literal[FONT_FORMATS]
+
+
+def _read_tail(path: Path, limit: int) -> str:
+    """Return up to the last limit bytes of a text file, or "" if it does not exist"""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - limit, 0))
+            return f.read().decode("utf-8", errors="replace")
+    except FileNotFoundError:
+        return ""
+
+
+@contextmanager
+def _conversion_errors():
+    """Report any failure inside the block as the plugin's RuntimeError"""
+    try:
+        yield
+    except subprocess.TimeoutExpired:
+        error_msg = "pdf2htmlEX conversion timed out (10 minutes). The PDF file may be too large or complex."
+        logger.error(error_msg)
+        raise RuntimeError(error_msg)
+    except Exception as e:
+        logger.error(f"Unexpected error in pdf2htmlEX conversion: {e}")
+        raise RuntimeError(f"An unexpected error occurred during conversion: {e}")
+
+
 class Pdf2HtmlResponse(BasePluginResponse):
     """Pydantic model for PDF to HTML converter plugin response"""
     file_path: str = Field(..., description="Path to the converted HTML file")
@@ -82,12 +193,12 @@ class Pdf2HtmlInput(BaseModel):
             "help": "Specify custom output filename. If empty, uses original PDF name with .html extension",
         },
     )
-    font_format: Literal["woff", "ttf", "otf", "svg"] = Field(
+    font_format: Pdf2HtmlFontFormat = Field(
         default="woff",
         json_schema_extra={
             "label": "Font Format",
             "field_type": "select",
-            "options": ["woff", "ttf", "otf", "svg"],
+            "options": list(FONT_FORMATS),
             "help": "Font format used in the generated HTML.",
         },
     )
@@ -112,9 +223,100 @@ class Pdf2HtmlInput(BaseModel):
     )
 
 
+# Finish building both models at import so the first request does not pay for it;
+# on pydantic v2 the input is then validated through its compiled validator directly
+for _model in (Pdf2HtmlInput, Pdf2HtmlResponse):
+    if hasattr(_model, "model_rebuild"):
+        _model.model_rebuild()
+_INPUT_VALIDATOR = getattr(Pdf2HtmlInput, "__pydantic_validator__", None)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection to the Docker Engine API over its unix socket"""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ContainerPool:
+    """
+    Hands out pdf2htmlEX service containers to concurrent conversions.
+
+    The pool holds PDF2HTMLEX_POOL_SIZE slots, and each conversion holds one
+    for its duration, so the number of conversions in flight is bounded. The
+    slots outlive changes to the set of running containers; each conversion
+    is sent to the container with the fewest conversions in flight.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def update(self, container_names: List[str]):
+        """Switch to the given running containers, keeping in-flight counts"""
+        with self._lock:
+            if list(self._in_flight) == list(container_names):
+                return
+            self._in_flight = {name: self._in_flight.get(name, 0) for name in container_names}
+
+    @contextmanager
+    def acquire(self, timeout: float):
+        """Borrow a container name for the duration of one conversion"""
+        if not self._slots.acquire(timeout=timeout):
+            raise RuntimeError("All pdf2htmlEX conversion slots are busy, please retry later")
+        try:
+            with self._lock:
+                container_name = min(self._in_flight, key=self._in_flight.__getitem__)
+                self._in_flight[container_name] += 1
+        except ValueError:
+            self._slots.release()
+            raise RuntimeError("No pdf2htmlEX service containers are known")
+        try:
+            yield container_name
+        finally:
+            with self._lock:
+                # The container may have been dropped by an update meanwhile
+                if self._in_flight.get(container_name, 0) > 0:
+                    self._in_flight[container_name] -= 1
+            self._slots.release()
+
+
+_CONTAINER_POOL = ContainerPool(int(os.environ.get("PDF2HTMLEX_POOL_SIZE", os.cpu_count() or 1)))
+
+# Background workers that delete finished requests' shared subdirectories
+_CLEANUP_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf2html-cleanup")
+
+
+def _remove_shared_directory(shared_dir: Path):
+    """Delete a request's shared subdirectory (runs on _CLEANUP_POOL)"""
+    try:
+        shutil.rmtree(shared_dir)
+        logger.info(f"Cleaned up shared directory: {shared_dir.name}")
+    except FileNotFoundError:
+        pass
+    except Exception as cleanup_error:
+        logger.warning(f"Failed to clean up shared directory files: {cleanup_error}")
+
+
 class Plugin(BasePlugin):
     """PDF to HTML Converter Plugin - Converts PDF files to HTML using pdf2htmlEX in Docker"""
 
+    # Last successful service lookup, shared by all instances
+    _service_cache: Dict[str, Any] = {"info": None, "expires": 0.0}
+    _service_cache_lock = threading.Lock()
+
+    # Docker SDK client (HTTP over the docker socket), created on first use
+    _docker_client = None
+    _docker_client_lock = threading.Lock()
+
     @classmethod
     def get_input_model(cls) -> Type[BaseModel]:
         """Return the canonical input model for this plugin."""
@@ -125,16 +327,20 @@ class Plugin(BasePlugin):
         """Return the Pydantic model for this plugin's response"""
         return Pdf2HtmlResponse
     
+    def validate_input(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate raw input with the prebuilt validator, falling back to the generic path"""
+        if _INPUT_VALIDATOR is None:
+            return super().validate_input(raw_data)
+        return model_dump(_INPUT_VALIDATOR.validate_python(raw_data))
+
     def _ensure_downloads_directory(self) -> Path:
         """Ensure downloads directory exists and return its path"""
-        downloads_dir = Path("/app/data/downloads")
-        downloads_dir.mkdir(parents=True, exist_ok=True)
-        return downloads_dir
+        return _ensure_directory(DOWNLOADS_DIR)
     
     def _ensure_shared_directory(self) -> Path:
-        """Ensure shared directory exists and return its path"""
-        shared_dir = Path("/app/shared")
-        shared_dir.mkdir(parents=True, exist_ok=True)
+        """Create this request's own subdirectory of the shared volume and return its path"""
+        shared_dir = _ensure_directory(SHARED_DIR) / token_hex(16)
+        shared_dir.mkdir()
         return shared_dir
     
     def _move_to_downloads(self, temp_file_path: Path, original_filename: str) -> Path:
@@ -142,7 +348,7 @@ class Plugin(BasePlugin):
         downloads_dir = self._ensure_downloads_directory()
         
         # Create unique filename to avoid conflicts
-        unique_id = str(uuid.uuid4())[:8]
+        unique_id = token_hex(4)
         file_stem = temp_file_path.stem
         file_suffix = temp_file_path.suffix
         safe_filename = f"{file_stem}_{unique_id}{file_suffix}"
@@ -150,14 +356,68 @@ class Plugin(BasePlugin):
         permanent_path = downloads_dir / safe_filename
         
         # Move the file
-        shutil.move(str(temp_file_path), str(permanent_path))
+        move_file(temp_file_path, permanent_path)
         logger.info(f"Moved output file to permanent location: {permanent_path}")
         
         return permanent_path
     
-    def _validate_input_file(self, filename: str, content: bytes) -> Dict[str, Any]:
+    def _conversion_cache_path(self, input_digest: str, conversion_settings: Dict[str, Any]) -> Path:
+        """Cache location for a PDF digest converted with the given settings"""
+        key_source = f"{input_digest}:{json.dumps(conversion_settings, sort_keys=True)}"
+        cache_key = hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).hexdigest()
+        return self._ensure_downloads_directory() / CACHE_DIR_NAME / f"{cache_key}.html"
+
+    def _restore_from_cache(self, cache_path: Path, html_filename: str) -> Optional[Path]:
+        """Hard-link a cached conversion into downloads; None on a cache miss"""
+        permanent_path = self._ensure_downloads_directory() / (
+            f"{Path(html_filename).stem}_{token_hex(4)}.html"
+        )
+        try:
+            os.link(cache_path, permanent_path)
+            # The link shares the entry's inode, and with it the mtime
+            touched_path = permanent_path
+        except FileNotFoundError:
+            return None
+        except OSError:
+            try:
+                shutil.copyfile(cache_path, permanent_path)
+            except OSError:
+                return None
+            touched_path = cache_path
+        # The mtime is both the download's age for the downloads cleanup and
+        # the entry's last use for eviction, so a hit refreshes it
+        try:
+            os.utime(touched_path)
+        except FileNotFoundError:
+            pass
+        return permanent_path
+
+    def _store_in_cache(self, permanent_path: Path, cache_path: Path):
+        """Keep a hard link to a fresh conversion and evict the least recently used entries"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            os.link(permanent_path, cache_path)
+        except FileExistsError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not cache pdf2htmlEX output: {e}")
+            return
+
+        try:
+            entries = []
+            for path in cache_path.parent.glob("*.html"):
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    pass  # Removed by a concurrent eviction or cleanup
+            entries.sort()
+            for _, stale_path in entries[:max(0, len(entries) - CACHE_MAX_ENTRIES)]:
+                stale_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to evict pdf2htmlEX cache entries: {e}")
+
+    def _validate_input_file(self, filename: str, file_size: int) -> Dict[str, Any]:
         """Validate input PDF file and return diagnostics"""
-        file_size = len(content)
         file_ext = Path(filename).suffix.lower()
         
         diagnostics = {
@@ -177,17 +437,120 @@ class Plugin(BasePlugin):
             
         return diagnostics
     
-    def _check_pdf2htmlex_service(self) -> Dict[str, Any]:
-        """Check if pdf2htmlEX service container is available and get its actual name"""
+    @classmethod
+    def _invalidate_service_cache(cls):
+        """Forget the cached container lookup so the next call re-probes docker"""
+        with cls._service_cache_lock:
+            cls._service_cache["info"] = None
+            cls._service_cache["expires"] = 0.0
+
+    def _check_pdf2htmlex_service(self, discover: bool = False) -> Dict[str, Any]:
+        """Check if pdf2htmlEX service container is available and get its actual name.
+
+        Unless discover is set, an empty cache yields the compose service name
+        itself (docker-compose pins it as container_name), so the happy path
+        execs without listing containers first.
+        """
+        cache = self._service_cache
+        with self._service_cache_lock:
+            if (not discover and cache["info"] is not None and time.monotonic() < cache["expires"]
+                    and (os.environ.get("DOCKER_HOST") or os.path.exists(DOCKER_SOCKET_PATH))):
+                return {**cache["info"], "container_names": list(cache["info"]["container_names"])}
+
+        if not discover:
+            service_host = os.environ.get("PDF2HTMLEX_SERVICE_HOST", "pdf2htmlex-service")
+            return {
+                "service_available": True,
+                "container_name": service_host,
+                "container_names": [service_host],
+                "error_message": None,
+                "direct": True
+            }
+
+        service_info = self._probe_pdf2htmlex_service()
+
+        # Only successful lookups are cached; failures are re-probed next time
+        if service_info["service_available"]:
+            with self._service_cache_lock:
+                cache["info"] = {**service_info, "container_names": list(service_info["container_names"])}
+                cache["expires"] = time.monotonic() + SERVICE_CACHE_TTL
+
+        return service_info
+
+    @classmethod
+    def _get_docker_client(cls):
+        """Return the shared Docker SDK client, or None to fall back to the docker CLI"""
+        if not DOCKER_SDK_AVAILABLE:
+            return None
+        with cls._docker_client_lock:
+            if cls._docker_client is None:
+                try:
+                    cls._docker_client = docker.from_env(timeout=CONVERSION_TIMEOUT)
+                except Exception as e:
+                    logger.warning(f"Docker SDK unavailable, falling back to docker CLI: {e}")
+                    return None
+            return cls._docker_client
+
+    def _list_containers_via_socket(self, service_host: str) -> Optional[List[str]]:
+        """List running container names matching service_host via GET /containers/json.
+
+        Returns None when the docker socket cannot be reached, so the caller
+        can fall back to the docker CLI.
+        """
+        if not os.path.exists(DOCKER_SOCKET_PATH):
+            return None
+        query = urlencode({"filters": json.dumps({"name": [service_host]})})
+        connection = _UnixHTTPConnection(DOCKER_SOCKET_PATH, timeout=SOCKET_PROBE_TIMEOUT)
+        try:
+            connection.request("GET", f"/containers/json?{query}")
+            response = connection.getresponse()
+            if response.status != 200:
+                return None
+            containers = json.loads(response.read())
+        except (OSError, http.client.HTTPException, ValueError):
+            return None
+        finally:
+            connection.close()
+        return [container["Names"][0].lstrip("/") for container in containers if container.get("Names")]
+
+    def _probe_pdf2htmlex_service(self) -> Dict[str, Any]:
+        """Find the running pdf2htmlEX service container using docker ps"""
         service_info = {
             "service_available": False,
             "container_name": None,
+            "container_names": [],
             "error_message": None
         }
         
         try:
             # Get the service host from environment or use default
             service_host = os.environ.get("PDF2HTMLEX_SERVICE_HOST", "pdf2htmlex-service")
+
+            docker_client = self._get_docker_client()
+            if docker_client is not None:
+                # Ask the daemon directly instead of spawning docker ps
+                container_names = [container.name for container in
+                                   docker_client.containers.list(filters={"name": service_host})]
+                if container_names:
+                    service_info["service_available"] = True
+                    service_info["container_name"] = container_names[0]
+                    service_info["container_names"] = container_names
+                    logger.info(f"pdf2htmlEX service found: {', '.join(container_names)}")
+                else:
+                    service_info["error_message"] = "pdf2htmlEX service container not found or not running"
+                return service_info
+
+            # Without the SDK, query the Engine API over the socket directly
+            container_names = self._list_containers_via_socket(service_host)
+            if container_names is not None:
+                if container_names:
+                    service_info["service_available"] = True
+                    service_info["container_name"] = container_names[0]
+                    service_info["container_names"] = container_names
+                    logger.info(f"pdf2htmlEX service found: {', '.join(container_names)}")
+                else:
+                    service_info["error_message"] = "pdf2htmlEX service container not found or not running"
+                return service_info
             
             # Find the actual container name using docker ps
             result = subprocess.run(
@@ -197,11 +560,12 @@ class Plugin(BasePlugin):
                 timeout=10
             )
             
-            if result.returncode == 0 and result.stdout.strip():
-                actual_container_name = result.stdout.strip()
+            container_names = result.stdout.split() if result.returncode == 0 else []
+            if container_names:
                 service_info["service_available"] = True
-                service_info["container_name"] = actual_container_name
-                logger.info(f"pdf2htmlEX service found: {actual_container_name}")
+                service_info["container_name"] = container_names[0]
+                service_info["container_names"] = container_names
+                logger.info(f"pdf2htmlEX service found: {', '.join(container_names)}")
             else:
                 service_info["error_message"] = f"pdf2htmlEX service container not found or not running"
                 
@@ -214,74 +578,429 @@ class Plugin(BasePlugin):
         
         return service_info
     
+    def _require_service(self, service_info: Dict[str, Any]):
+        """Raise a RuntimeError with remediation hints when the service is unavailable"""
+        if service_info["service_available"]:
+            return
+        error_msg = "pdf2htmlEX conversion service is not available."
+        if service_info["error_message"]:
+            error_msg += f"\n\nError: {service_info['error_message']}"
+        error_msg += "\n\n🔧 Solutions:"
+        error_msg += "\n  • Ensure docker-compose services are running"
+        error_msg += "\n  • Check: docker-compose ps"
+        error_msg += "\n  • Restart services: docker-compose up -d"
+        raise RuntimeError(error_msg)
+
     def _check_pdf2htmlex_service_dependency(self) -> Dict[str, Any]:
         """Custom dependency checker method for plugin manager"""
-        return self._check_pdf2htmlex_service()
+        return self._check_pdf2htmlex_service(discover=True)
     
     def _to_bool(self, value) -> bool:
         """Convert various value types to boolean (handles web form inputs)"""
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            return value.lower() in ('true', '1', 'yes', 'on', 'checked')
-        if isinstance(value, (int, float)):
-            return bool(value)
-        return bool(value)  # fallback
+        return value.lower() in _TRUTHY_STRINGS if isinstance(value, str) else bool(value)
     
+    def _pdf2htmlex_options(self, zoom: float, embed_css: bool, embed_javascript: bool,
+                            embed_images: bool, optimize_text: bool, font_format: str,
+                            printing: int, font_size_multiplier: float) -> List[str]:
+        """Build the pdf2htmlEX options shared by single and batch conversions"""
+        return [
+            *(("--zoom", str(zoom)) if zoom and zoom > 0 else ()),
+            f"--embed-css={int(embed_css)}",
+            f"--embed-javascript={int(embed_javascript)}",
+            f"--embed-image={int(embed_images)}",
+            f"--optimize-text={int(optimize_text)}",
+            f"--font-format={font_format}",
+            f"--printing={printing}",
+            f"--font-size-multiplier={font_size_multiplier}",
+        ]
+
     def _execute_pdf2htmlex_in_service(self, container_name: str, input_filename: str, 
                                       zoom: float, embed_css: bool, embed_javascript: bool, 
                                       embed_images: bool, optimize_text: bool, font_format: str,
-                                      printing: int, font_size_multiplier: float) -> Dict[str, Any]:
+                                      printing: int, font_size_multiplier: float,
+                                      work_dir: str = CONTAINER_SHARED_DIR) -> Dict[str, Any]:
         """Execute pdf2htmlEX in the service container via docker exec"""
         
-        # Build pdf2htmlEX command
-        pdf2htmlex_cmd = ["pdf2htmlEX"]
-        
-        # Add options
-        if zoom and zoom > 0:
-            pdf2htmlex_cmd.extend(["--zoom", str(zoom)])
+        # Build pdf2htmlEX command: options, destination directory, input file
+        pdf2htmlex_cmd = [
+            "pdf2htmlEX",
+            *self._pdf2htmlex_options(zoom, embed_css, embed_javascript, embed_images,
+                                      optimize_text, font_format, printing, font_size_multiplier),
+            "--dest-dir", work_dir,
+            f"{work_dir}/{input_filename}",
+        ]
+        command_str = ' '.join(pdf2htmlex_cmd)
         
-        pdf2htmlex_cmd.append(f"--embed-css={int(embed_css)}")
-        pdf2htmlex_cmd.append(f"--embed-javascript={int(embed_javascript)}")
-        pdf2htmlex_cmd.append(f"--embed-image={int(embed_images)}")
-        pdf2htmlex_cmd.append(f"--optimize-text={int(optimize_text)}")
-        pdf2htmlex_cmd.append(f"--font-format={font_format}")
-        pdf2htmlex_cmd.append(f"--printing={printing}")
-        pdf2htmlex_cmd.append(f"--font-size-multiplier={font_size_multiplier}")
-
-        # Set destination directory and add input file
-        pdf2htmlex_cmd.extend(["--dest-dir", "/shared"])
-        pdf2htmlex_cmd.append(input_filename)
+        logger.info(f"Executing pdf2htmlEX: {command_str}")
         
-        # Build docker exec command
-        docker_cmd = ["docker", "exec", container_name] + pdf2htmlex_cmd
-        
-        logger.info(f"Executing pdf2htmlEX: {' '.join(pdf2htmlex_cmd)}")
-        
-        # Execute the command
-        start_time = time.time()
-        result = subprocess.run(
-            docker_cmd,
-            capture_output=True,
-            text=True,
-            timeout=600,  # 10 minute timeout
-            check=False
+        # Capped inside the container too, so a stuck conversion cannot hold the slot
+        exec_cmd = ["timeout", "-s", "KILL", str(CONVERSION_TIMEOUT), *pdf2htmlex_cmd]
+        result = self._exec_in_container(container_name, exec_cmd, [work_dir])
+        result["command"] = command_str
+        return result
+
+    def _execute_batch_in_service(self, container_name: str, jobs: List[Dict[str, Any]],
+                                  conversion_settings: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert several PDFs with one docker exec.
+
+        A shell loop inside the service runs pdf2htmlEX once per job's work dir,
+        each capped at CONVERSION_TIMEOUT, sends its log to a file in that dir
+        and reports "<exit code> <work dir>" on stderr, which also keeps the
+        Docker API read timeout per file. Returns the exec's result with each
+        job's own conversion result, in order, under "job_results".
+        """
+        options = ' '.join(shlex.quote(option) for option in self._pdf2htmlex_options(**conversion_settings))
+        script = (
+            'while [ $# -gt 0 ]; do '
+            f'timeout -s KILL {CONVERSION_TIMEOUT} pdf2htmlEX {options} '
+            f'--dest-dir "$1" "$1/$2" 2> "$1/{BATCH_LOG_NAME}"; '
+            'echo "$? $1" >&2; shift 2; done'
         )
+        work_dirs = [f"{CONTAINER_SHARED_DIR}/{job['shared_dir'].name}" for job in jobs]
+        batch_cmd = ["sh", "-c", script, "sh"]
+        for work_dir, job in zip(work_dirs, jobs):
+            batch_cmd += [work_dir, job["input_filename"]]
+
+        logger.info(f"Executing pdf2htmlEX batch of {len(jobs)} in {container_name}: {script}")
+
+        result = self._exec_in_container(container_name, batch_cmd, work_dirs,
+                                         timeout=CONVERSION_TIMEOUT * len(jobs))
+        statuses = {}
+        for line in result["stderr"].splitlines():
+            returncode, _, work_dir = line.partition(" ")
+            if returncode.isdigit():
+                statuses[work_dir] = int(returncode)
+
+        job_results = []
+        for work_dir, job in zip(work_dirs, jobs):
+            returncode = statuses.get(work_dir, result["returncode"] or 1)
+            stderr = ""
+            if returncode != 0:
+                stderr = _read_tail(job["shared_dir"] / BATCH_LOG_NAME, STDERR_TAIL_BYTES) or result["stderr"]
+            job_results.append({
+                "returncode": returncode,
+                "stdout": "",
+                "stderr": stderr,
+                "execution_time": result["execution_time"],
+                "batch_size": len(jobs),
+                "command": f"pdf2htmlEX {options} --dest-dir {work_dir} {work_dir}/{job['input_filename']}"
+            })
+        result["job_results"] = job_results
+        return result
+
+    def _exec_in_container(self, container_name: str, command: List[str], work_dirs: List[str],
+                           timeout: float = CONVERSION_TIMEOUT) -> Dict[str, Any]:
+        """Run command in the service container, killing its work_dirs' processes on timeout"""
+        start_time = time.time()
+        docker_client = self._get_docker_client()
+        try:
+            if docker_client is not None:
+                returncode, stdout, stderr = self._exec_with_sdk(docker_client, container_name, command, timeout)
+            else:
+                # Build docker exec command
+                docker_cmd = ["docker", "exec", container_name] + command
+                try:
+                    returncode, stdout, stderr = self._exec_with_cli(docker_cmd, timeout)
+                except FileNotFoundError:
+                    # Neither the Docker SDK nor the docker CLI is installed
+                    self._require_service({
+                        "service_available": False,
+                        "error_message": "Docker command not available"
+                    })
+        except subprocess.TimeoutExpired:
+            # Stopping our side of the exec leaves pdf2htmlEX running in the
+            # container; kill it before the pool slot is handed out again
+            for work_dir in work_dirs:
+                self._kill_in_container(docker_client, container_name, work_dir)
+            raise
         execution_time = time.time() - start_time
+
+        # The cached container is gone (or docker cannot run it); re-probe next time
+        container_missing = returncode in (125, 126, 127) or "No such container" in stderr
+        if container_missing:
+            self._invalidate_service_cache()
         
         return {
-            "returncode": result.returncode,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "execution_time": execution_time,
-            "command": ' '.join(pdf2htmlex_cmd)
+            "container_missing": container_missing,
+            "returncode": returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "execution_time": execution_time
         }
+
+    def _exec_with_cli(self, docker_cmd: List[str], timeout: float = CONVERSION_TIMEOUT) -> tuple:
+        """Run docker exec, discarding stdout and keeping only the tail of stderr"""
+        process = subprocess.Popen(
+            docker_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, start_new_session=True
+        )
+        stderr_tail = bytearray()
+
+        def drain_stderr():
+            for block in iter(lambda: process.stderr.read(8192), b""):
+                stderr_tail.extend(block)
+                if len(stderr_tail) > STDERR_TAIL_BYTES:
+                    del stderr_tail[:-STDERR_TAIL_BYTES]
+
+        reader = threading.Thread(target=drain_stderr, daemon=True)
+        reader.start()
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Kill the whole process group the docker CLI runs in
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.wait()
+            raise
+        finally:
+            reader.join()
+            process.stderr.close()
+        return returncode, "", stderr_tail.decode("utf-8", errors="replace")
+
+    def _kill_in_container(self, docker_client, container_name: str, work_dir: str):
+        """SIGKILL the pdf2htmlEX process working in work_dir inside the service container.
+
+        Matching on the request's own work_dir leaves concurrent conversions alone.
+        """
+        kill_cmd = ["pkill", "-9", "-f", f"{work_dir}/"]
+        try:
+            if docker_client is not None:
+                docker_client.containers.get(container_name).exec_run(kill_cmd)
+            else:
+                subprocess.run(["docker", "exec", container_name] + kill_cmd,
+                               capture_output=True, timeout=30, check=False)
+            logger.warning(f"Killed timed out pdf2htmlEX conversion in {container_name}:{work_dir}")
+        except Exception as e:
+            logger.error(f"Failed to kill timed out pdf2htmlEX conversion in {container_name}: {e}")
+
+    def _exec_with_sdk(self, docker_client, container_name: str, command: List[str],
+                       timeout: float = CONVERSION_TIMEOUT) -> tuple:
+        """Run a command in the service container through the Docker API, keeping only stderr's tail.
+
+        The output is drained on a reader thread while this one waits out the
+        deadline, so a command that stalls without output still times out, as
+        does a read that outlives the client's socket timeout.
+        """
+        # POST /containers/{name}/exec straight away; no container inspect first
+        api = docker_client.api
+        try:
+            exec_id = api.exec_create(container_name, command, stdout=False, stderr=True)["Id"]
+            # Stream the output so only the tail of stderr is ever held
+            frames = api.exec_start(exec_id, stream=True, demux=True)
+        except docker.errors.NotFound:
+            return 125, "", f"No such container: {container_name}"
+        except (requests.exceptions.ReadTimeout, socket.timeout):
+            raise subprocess.TimeoutExpired(command, timeout)
+
+        stderr_tail = bytearray()
+        read_errors = []
+
+        def drain_stderr():
+            try:
+                for _, stderr_block in frames:
+                    if stderr_block:
+                        stderr_tail.extend(stderr_block)
+                        if len(stderr_tail) > STDERR_TAIL_BYTES:
+                            del stderr_tail[:-STDERR_TAIL_BYTES]
+            except Exception as e:
+                read_errors.append(e)
+
+        reader = threading.Thread(target=drain_stderr, daemon=True)
+        reader.start()
+        reader.join(timeout)
+        if reader.is_alive():
+            # The reader finishes on its own once the caller kills the command
+            raise subprocess.TimeoutExpired(command, timeout)
+        if read_errors:
+            if isinstance(read_errors[0], (requests.exceptions.ReadTimeout, socket.timeout)):
+                raise subprocess.TimeoutExpired(command, timeout)
+            raise read_errors[0]
+
+        try:
+            exit_code = api.exec_inspect(exec_id)["ExitCode"]
+        except docker.errors.NotFound:
+            return 125, "", f"No such container: {container_name}"
+        return exit_code, "", stderr_tail.decode("utf-8", errors="replace")
     
 
     
     def execute(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        input_file_info = data.get("input_file")
+        return self._execute_one(data)
+
+    def execute_batch(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Convert every PDF in data["input_files"] with the settings in the rest of data.
+
+        The service lookup runs once for the whole batch. PDFs not served
+        from the cache are split across the container pool, and each slot
+        converts its share with a single docker exec, so the exec and process
+        startup cost is paid once per slot rather than once per file. Results
+        keep the input order; a PDF that fails gets a BatchItemError entry
+        instead of failing the batch.
+        """
+        options = {key: value for key, value in data.items() if key != "input_files"}
+        items = [{**options, "input_file": input_file} for input_file in data["input_files"]]
+        if not items:
+            return []
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+
+        try:
+            with _conversion_errors():
+                service_info = self._check_pdf2htmlex_service()
+                self._require_service(service_info)
+        except RuntimeError as e:
+            return [self._error_response(data, e) for data in items]
+
+        if len(items) == 1:
+            try:
+                return [self._execute_one(items[0], service_info)]
+            except (RuntimeError, ValueError) as e:
+                return [self._error_response(items[0], e)]
+
+        jobs: Dict[int, Dict[str, Any]] = {}
+        shared_dirs = []
+        try:
+            for index, item in enumerate(items):
+                try:
+                    with _conversion_errors():
+                        if not item.get("input_file"):
+                            raise ValueError("Missing input PDF file")
+                        shared_dir = self._ensure_shared_directory()
+                        # Registered before staging so a failure still cleans it up
+                        shared_dirs.append(shared_dir)
+                        jobs[index] = self._prepare_conversion(item, shared_dir)
+                except RuntimeError as e:
+                    results[index] = self._error_response(item, e)
+
+            # Group the PDFs still to convert by settings, one exec per pool slot
+            groups: Dict[tuple, List[int]] = {}
+            for index, job in jobs.items():
+                if not job["cache_hit"]:
+                    groups.setdefault(tuple(job["conversion_settings"].items()), []).append(index)
+            chunks = []
+            for group in groups.values():
+                slots = min(len(group), _CONTAINER_POOL.size)
+                chunks.extend(group[slot::slots] for slot in range(slots))
+
+            if chunks:
+                with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                    futures = [
+                        executor.submit(self._run_batch, [jobs[index] for index in chunk], service_info)
+                        for chunk in chunks
+                    ]
+                    for chunk, future in zip(chunks, futures):
+                        try:
+                            with _conversion_errors():
+                                future.result()
+                        except RuntimeError as e:
+                            for index in chunk:
+                                results[index] = self._error_response(items[index], e)
+                                del jobs[index]
+
+            for index, job in jobs.items():
+                try:
+                    with _conversion_errors():
+                        results[index] = self._finish_conversion(job)
+                except RuntimeError as e:
+                    results[index] = self._error_response(items[index], e)
+            return results
+        finally:
+            for shared_dir in shared_dirs:
+                _CLEANUP_POOL.submit(_remove_shared_directory, shared_dir)
+
+    def _error_response(self, data: Dict[str, Any], error: Exception) -> BatchItemError:
+        """Batch entry for a PDF that could not be converted"""
+        input_file_info = data.get("input_file") or {}
+        return BatchItemError(
+            str(error),
+            file_path="",
+            file_name="",
+            conversion_details={
+                "input_file": {"filename": input_file_info.get("filename", "")},
+                "conversion_successful": False
+            }
+        )
+
+    def _execute_one(self, data: Dict[str, Any], service_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Convert a single PDF, reusing service_info from a batch lookup when given"""
+        if not data.get("input_file"):
+            raise ValueError("Missing input PDF file")
+
+        shared_dir = None
         
+        try:
+            with _conversion_errors():
+                # Check pdf2htmlEX service availability
+                if service_info is None:
+                    service_info = self._check_pdf2htmlex_service()
+                self._require_service(service_info)
+
+                # Get shared directory
+                shared_dir = self._ensure_shared_directory()
+                job = self._prepare_conversion(data, shared_dir)
+
+                if not job["cache_hit"]:
+                    # Execute pdf2htmlEX in a pooled service container, inside this
+                    # request's own subdirectory of the shared volume
+                    work_dir = f"{CONTAINER_SHARED_DIR}/{shared_dir.name}"
+                    container_name, job["conversion_result"], job["service_info"] = self._run_in_service(
+                        service_info,
+                        lambda container_name: self._execute_pdf2htmlex_in_service(
+                            container_name, job["input_filename"], work_dir=work_dir, **job["conversion_settings"]
+                        )
+                    )
+                    job["service_info"]["container_name"] = container_name
+
+                return self._finish_conversion(job)
+            
+        finally:
+            # Clean up this request's shared subdirectory off the request path;
+            # the output is already in downloads and sibling conversions are untouched
+            if shared_dir is not None:
+                _CLEANUP_POOL.submit(_remove_shared_directory, shared_dir)
+
+    def _run_in_service(self, service_info: Dict[str, Any], run) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """
+        Call run(container_name) in a pooled service container.
+
+        When the compose service name turns out not to be a container, the
+        real ones are discovered and run is retried once. Returns the container
+        used, run's result and the (possibly rediscovered) service_info.
+        """
+        service_info = dict(service_info)
+        while True:
+            _CONTAINER_POOL.update(service_info["container_names"])
+            with _CONTAINER_POOL.acquire(timeout=CONVERSION_TIMEOUT) as container_name:
+                result = run(container_name)
+            if not (service_info.get("direct") and result["container_missing"]):
+                return container_name, result, service_info
+            # The service name is not a container here; discover the real one(s)
+            logger.info(f"Container {container_name} not found, discovering pdf2htmlEX service")
+            service_info = self._check_pdf2htmlex_service(discover=True)
+            self._require_service(service_info)
+
+    def _run_batch(self, jobs: List[Dict[str, Any]], service_info: Dict[str, Any]):
+        """Convert jobs with identical settings in one exec, storing each job's result on it"""
+        container_name, batch_result, service_info = self._run_in_service(
+            service_info,
+            lambda container_name: self._execute_batch_in_service(
+                container_name, jobs, jobs[0]["conversion_settings"]
+            )
+        )
+        for job, conversion_result in zip(jobs, batch_result["job_results"]):
+            job["conversion_result"] = conversion_result
+            job["service_info"] = {**service_info, "container_name": container_name}
+
+    def _prepare_conversion(self, data: Dict[str, Any], shared_dir: Path) -> Dict[str, Any]:
+        """
+        Stage one request's PDF in shared_dir and look its conversion up in the cache.
+
+        Returns the job dict the conversion and _finish_conversion work from.
+        """
+        input_file_info = data["input_file"]
+
         # Convert zoom to float if it's a string (from web form)
         zoom_raw = data.get("zoom", 1.3)
         try:
@@ -289,197 +1008,181 @@ class Plugin(BasePlugin):
         except (ValueError, TypeError):
             zoom = 1.3  # fallback to default
             
-        # Convert boolean parameters (web forms may send strings)
-        embed_css = self._to_bool(data.get("embed_css", True))
-        embed_javascript = self._to_bool(data.get("embed_javascript", True))
-        embed_images = self._to_bool(data.get("embed_images", True))
-        optimize_text = self._to_bool(data.get("optimize_text", True))
         output_filename = data.get("output_filename", "").strip()
 
-        # Get other optimization parameters with defaults
-        font_format = data.get("font_format", "woff")
-        printing = data.get("printing", 0)
-        font_size_multiplier = data.get("font_size_multiplier", 4.0)
-
-        if not input_file_info:
-            raise ValueError("Missing input PDF file")
+        # Boolean parameters may arrive as strings from web forms
+        conversion_settings = {
+            "zoom": zoom,
+            "embed_css": self._to_bool(data.get("embed_css", True)),
+            "embed_javascript": self._to_bool(data.get("embed_javascript", True)),
+            "embed_images": self._to_bool(data.get("embed_images", True)),
+            "optimize_text": self._to_bool(data.get("optimize_text", True)),
+            "font_format": data.get("font_format", "woff"),
+            "printing": data.get("printing", 0),
+            "font_size_multiplier": data.get("font_size_multiplier", 4.0)
+        }
 
-        shared_dir = None
+        logger.info(f"Using shared directory: {shared_dir}")
         
-        try:
-            # Check pdf2htmlEX service availability
-            service_info = self._check_pdf2htmlex_service()
-            if not service_info["service_available"]:
-                error_msg = "pdf2htmlEX conversion service is not available."
-                if service_info["error_message"]:
-                    error_msg += f"\n\nError: {service_info['error_message']}"
-                error_msg += "\n\n🔧 Solutions:"
-                error_msg += "\n  • Ensure docker-compose services are running"
-                error_msg += "\n  • Check: docker-compose ps"
-                error_msg += "\n  • Restart services: docker-compose up -d"
-                raise RuntimeError(error_msg)
+        # Handle both streaming (temp_path) and legacy (content) input formats
+        input_filename = input_file_info["filename"]
+        
+        if "temp_path" in input_file_info:
+            # New streaming format - file already on disk
+            temp_input_path = Path(input_file_info["temp_path"])
             
-            # Get shared directory
-            shared_dir = self._ensure_shared_directory()
-            logger.info(f"Using shared directory: {shared_dir}")
+            # Move to our shared directory for processing by service
+            input_path = shared_dir / input_filename
+            # Size and digest come from the same pass that moves the file
+            input_file_size, input_digest = _move_and_hash(temp_input_path, input_path)
+            logger.info(f"Moved streamed file to shared directory: {input_path}")
+
+        elif "content" in input_file_info:
+            # Legacy format - content in memory
+            input_file_content = input_file_info["content"]
+            input_file_size = len(input_file_content)
+            input_digest = hashlib.blake2b(input_file_content, digest_size=16).hexdigest()
             
-            # Handle both streaming (temp_path) and legacy (content) input formats
-            input_filename = input_file_info["filename"]
+            # Write input file to shared directory in 1MB blocks
+            input_path = shared_dir / input_filename
+            with open(input_path, "wb") as f:
+                shutil.copyfileobj(BytesIO(input_file_content), f, COPY_BUFFER_SIZE)
+            logger.info(f"Wrote legacy content to shared directory: {input_path}")
+        else:
+            raise ValueError("Input file data is missing. 'input_file' must contain either 'temp_path' or 'content'.")
+        
+        file_diagnostics = self._validate_input_file(input_filename, input_file_size)
+        logger.info(f"Input PDF file diagnostics: {file_diagnostics}")
+        
+        # Determine output filename
+        if not output_filename:
+            output_filename = f"{Path(input_filename).stem}.html"
+        elif not output_filename.endswith('.html'):
+            output_filename += '.html'
+        
+        # Reuse an earlier conversion of the same PDF with the same settings
+        cache_path = self._conversion_cache_path(input_digest, conversion_settings)
+        permanent_file_path = self._restore_from_cache(cache_path, f"{Path(input_filename).stem}.html")
+        cache_hit = permanent_file_path is not None
+        
+        job = {
+            "shared_dir": shared_dir,
+            "input_filename": input_filename,
+            "output_filename": output_filename,
+            "file_diagnostics": file_diagnostics,
+            "conversion_settings": conversion_settings,
+            "cache_path": cache_path,
+            "permanent_file_path": permanent_file_path,
+            "cache_hit": cache_hit,
+            "service_info": {"service_available": True, "container_name": None}
+        }
+        if cache_hit:
+            logger.info(f"Serving cached pdf2htmlEX conversion: {cache_path.name}")
+            job["conversion_result"] = {
+                "returncode": 0,
+                "stdout": "",
+                "stderr": "",
+                "execution_time": 0.0,
+                "command": ""
+            }
+        return job
+
+    def _finish_conversion(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Check a job's pdf2htmlEX result, move its HTML into downloads and build the response"""
+        conversion_result = job["conversion_result"]
+        service_info = job["service_info"]
+        shared_dir = job["shared_dir"]
+        output_filename = job["output_filename"]
+        permanent_file_path = job["permanent_file_path"]
+
+        # Check if conversion was successful
+        if conversion_result["returncode"] != 0:
+            # Prepare detailed error information
+            error_details = {
+                "command": conversion_result["command"],
+                "exit_code": conversion_result["returncode"],
+                "stdout": conversion_result["stdout"],
+                "stderr": conversion_result["stderr"],
+                "execution_time": conversion_result["execution_time"],
+                "service_info": service_info,
+                "input_file": job["file_diagnostics"]
+            }
             
-            if "temp_path" in input_file_info:
-                # New streaming format - file already on disk
-                temp_input_path = Path(input_file_info["temp_path"])
-                
-                # Move to our shared directory for processing by service
-                input_path = shared_dir / input_filename
-                shutil.move(str(temp_input_path), str(input_path))
-                logger.info(f"Moved streamed file to shared directory: {input_path}")
-
-                # For validation, we need to read the content temporarily
-                with open(input_path, "rb") as f:
-                    input_file_content = f.read()
-
-            elif "content" in input_file_info:
-                # Legacy format - content in memory
-                input_file_content = input_file_info["content"]
-                
-                # Write input file to shared directory
-                input_path = shared_dir / input_filename
-                with open(input_path, "wb") as f:
-                    f.write(input_file_content)
-                logger.info(f"Wrote legacy content to shared directory: {input_path}")
-            else:
-                raise ValueError("Input file data is missing. 'input_file' must contain either 'temp_path' or 'content'.")
+            # Create user-friendly error message
+            error_msg = f"pdf2htmlEX conversion failed with exit code {conversion_result['returncode']}"
             
-            file_diagnostics = self._validate_input_file(input_filename, input_file_content)
-            logger.info(f"Input PDF file diagnostics: {file_diagnostics}")
+            if conversion_result["stderr"]:
+                error_msg += f"\n\nError Details:\n{conversion_result['stderr']}"
             
-            # Determine output filename
-            if not output_filename:
-                output_filename = f"{Path(input_filename).stem}.html"
-            elif not output_filename.endswith('.html'):
-                output_filename += '.html'
+            if conversion_result["stdout"]:
+                error_msg += f"\n\nOutput:\n{conversion_result['stdout']}"
             
-            # Execute pdf2htmlEX in the service container
-            container_name = service_info["container_name"]
-            conversion_result = self._execute_pdf2htmlex_in_service(
-                container_name, input_filename, zoom, embed_css, embed_javascript, embed_images,
-                optimize_text, font_format, printing, font_size_multiplier
-            )
+            # Add specific guidance based on common issues
+            if "Permission denied" in conversion_result["stderr"]:
+                error_msg += "\n\n💡 Permission issues detected:"
+                error_msg += "\n  • Check shared volume permissions"
+                error_msg += "\n  • Restart docker-compose services"
             
-            # Check if conversion was successful
-            if conversion_result["returncode"] != 0:
-                # Prepare detailed error information
-                error_details = {
-                    "command": conversion_result["command"],
-                    "exit_code": conversion_result["returncode"],
-                    "stdout": conversion_result["stdout"],
-                    "stderr": conversion_result["stderr"],
-                    "execution_time": conversion_result["execution_time"],
-                    "service_info": service_info,
-                    "input_file": file_diagnostics
-                }
-                
-                # Create user-friendly error message
-                error_msg = f"pdf2htmlEX conversion failed with exit code {conversion_result['returncode']}"
-                
-                if conversion_result["stderr"]:
-                    error_msg += f"\n\nError Details:\n{conversion_result['stderr']}"
-                
-                if conversion_result["stdout"]:
-                    error_msg += f"\n\nOutput:\n{conversion_result['stdout']}"
-                
-                # Add specific guidance based on common issues
-                if "Permission denied" in conversion_result["stderr"]:
-                    error_msg += "\n\n💡 Permission issues detected:"
-                    error_msg += "\n  • Check shared volume permissions"
-                    error_msg += "\n  • Restart docker-compose services"
-                
-                if "No such file or directory" in conversion_result["stderr"]:
-                    error_msg += "\n\n💡 File not found issues:"
-                    error_msg += "\n  • PDF file may be corrupted"
-                    error_msg += "\n  • Check if the PDF can be opened normally"
-                    error_msg += "\n  • Verify shared volume is properly mounted"
-                
-                # Log detailed error for debugging
-                logger.error(f"pdf2htmlEX conversion failed: {error_details}")
-                
-                raise RuntimeError(error_msg)
+            if "No such file or directory" in conversion_result["stderr"]:
+                error_msg += "\n\n💡 File not found issues:"
+                error_msg += "\n  • PDF file may be corrupted"
+                error_msg += "\n  • Check if the PDF can be opened normally"
+                error_msg += "\n  • Verify shared volume is properly mounted"
             
-            # Find the generated HTML file in shared directory
-            html_files = list(shared_dir.glob("*.html"))
-            if not html_files:
-                raise RuntimeError("pdf2htmlEX completed successfully but no HTML file was created")
+            # Log detailed error for debugging
+            logger.error(f"pdf2htmlEX conversion failed: {error_details}")
             
-            # Use the first HTML file found (should be only one)
-            generated_html_path = html_files[0]
+            raise RuntimeError(error_msg)
+        
+        if job["cache_hit"]:
+            final_output_filename = output_filename
+            output_size = permanent_file_path.stat().st_size
+        else:
+            # pdf2htmlEX writes <input stem>.html into --dest-dir
+            generated_html_path = shared_dir / f"{Path(job['input_filename']).stem}.html"
             final_output_filename = output_filename if output_filename else generated_html_path.name
             
             # Get output file size for diagnostics
-            output_size = generated_html_path.stat().st_size
+            try:
+                output_size = generated_html_path.stat().st_size
+            except FileNotFoundError:
+                raise RuntimeError("pdf2htmlEX completed successfully but no HTML file was created")
             
             # Move file to permanent downloads directory BEFORE cleanup
             permanent_file_path = self._move_to_downloads(generated_html_path, final_output_filename)
-            
-            # Prepare conversion details
-            conversion_details = {
-                "input_file": file_diagnostics,
-                "output_file": {
-                    "filename": final_output_filename,
-                    "size_bytes": output_size,
-                    "size_mb": round(output_size / (1024 * 1024), 2)
-                },
-                "conversion_settings": {
-                    "zoom": zoom,
-                    "embed_css": embed_css,
-                    "embed_javascript": embed_javascript,
-                    "embed_images": embed_images,
-                    "optimize_text": optimize_text,
-                    "font_format": font_format,
-                    "printing": printing,
-                    "font_size_multiplier": font_size_multiplier
-                },
-                "execution_time_seconds": round(conversion_result["execution_time"], 2),
-                "conversion_successful": True,
-                "shared_directory": str(shared_dir),
-                "permanent_location": str(permanent_file_path),
-                "pdf2htmlex_command": conversion_result["command"]
-            }
-            
-            # Add service info to response
-            docker_response_info = {
-                "service_container": service_info.get("container_name"),
-                "execution_time": conversion_result["execution_time"],
-                "exit_code": conversion_result["returncode"],
-                "service_available": service_info["service_available"]
-            }
-            
-            logger.info(f"PDF to HTML conversion successful: {conversion_details}")
-            
-            return {
-                "file_path": str(permanent_file_path),
-                "file_name": final_output_filename,
-                "conversion_details": conversion_details,
-                "docker_info": docker_response_info
-            }
-            
-        except subprocess.TimeoutExpired:
-            error_msg = "pdf2htmlEX conversion timed out (10 minutes). The PDF file may be too large or complex."
-            logger.error(error_msg)
-            raise RuntimeError(error_msg)
-            
-        except Exception as e:
-            logger.error(f"Unexpected error in pdf2htmlEX conversion: {e}")
-            raise RuntimeError(f"An unexpected error occurred during conversion: {e}")
-            
-        finally:
-            # Clean up shared directory files (keep directory)
-            if shared_dir and shared_dir.exists():
-                try:
-                    # Remove PDF and any leftover HTML files from shared directory
-                    for file_path in shared_dir.glob("*"):
-                        if file_path.is_file():
-                            file_path.unlink()
-                            logger.info(f"Cleaned up shared file: {file_path.name}")
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to clean up shared directory files: {cleanup_error}") 
+            self._store_in_cache(permanent_file_path, job["cache_path"])
+        
+        # Prepare conversion details
+        conversion_details = {
+            "input_file": job["file_diagnostics"],
+            "output_file": {
+                "filename": final_output_filename,
+                "size_bytes": output_size,
+                "size_mb": round(output_size / (1024 * 1024), 2)
+            },
+            "conversion_settings": job["conversion_settings"],
+            "execution_time_seconds": round(conversion_result["execution_time"], 2),
+            "conversion_successful": True,
+            "cache_hit": job["cache_hit"],
+            "batch_size": conversion_result.get("batch_size", 1),
+            "shared_directory": str(shared_dir),
+            "permanent_location": str(permanent_file_path),
+            "pdf2htmlex_command": conversion_result["command"]
+        }
+        
+        # Add service info to response
+        docker_response_info = {
+            "service_container": service_info.get("container_name"),
+            "execution_time": conversion_result["execution_time"],
+            "exit_code": conversion_result["returncode"],
+            "service_available": service_info["service_available"]
+        }
+        
+        logger.info(f"PDF to HTML conversion successful: {conversion_details}")
+        
+        return {
+            "file_path": str(permanent_file_path),
+            "file_name": final_output_filename,
+            "conversion_details": conversion_details,
+            "docker_info": docker_response_info
+        }
@@ -1,18 +1,174 @@
 import re
+import os
 import json
 import time
-from typing import Dict, Any, Type, List, Optional, Union
-from collections import defaultdict, Counter
+import hashlib
+import threading
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Type, List, Literal, Optional, Union
+from collections import defaultdict, Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from sklearn.cluster import AgglomerativeClustering
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 import spacy
+from spacy.tokens import Doc
 from pydantic import BaseModel, Field
 
 from ...models.plugin import BasePlugin, BasePluginResponse
 from .models import SentenceMergerResponse, SentenceCluster
 
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+
+# Text cleanup and sentence splitting patterns
+_RE_WS = re.compile(r'\s+')
+# Sentence-ending punctuation with its surrounding whitespace, or any other whitespace run
+_RE_CLEAN = re.compile(r'\s*([.!?])\s*|\s+')
+# Citation markers may span the line breaks kept in the raw sentences
+_RE_CITE = re.compile(r'\[cite:.*?\]', re.DOTALL)
+_RE_LINES = re.compile(r'[\r\n]+')
+_RE_DOUBLE_COMMA = re.compile(r',\s*,')
+_RE_WORD = re.compile(r'\b\w+\b')
+
+# Sentence boundary: '.', '!' or '?' followed by whitespace and a capital letter.
+# A '.' ending one of the common abbreviations below is not a boundary.
+_ABBREVIATIONS = ('Dr', 'Mr', 'Mrs', 'Ms', 'Prof', 'vs', 'etc', r'i\.e', r'e\.g')
+_SPLIT_SENTENCES = re.compile(
+    r'(?:' + ''.join(rf'(?<!\b{abbrev})' for abbrev in _ABBREVIATIONS) + r'\.|[!?])\s+(?=[A-Z])'
+)
+
+
+def _clean_replacement(match) -> str:
+    """_RE_CLEAN callback: punctuation followed by one space, or a single space"""
+    punctuation = match.group(1)
+    return punctuation + ' ' if punctuation else ' '
+
+
+# Models are loaded once per process and shared by every SentenceMerger
+SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
+SPACY_MODEL_NAME = 'en_core_web_sm'
+_MODEL_LOCK = threading.Lock()
+SPACY_BATCH_SIZE = 64  # Docs per nlp.pipe batch
+CONTENT_POS = frozenset(('NOUN', 'PROPN', 'VERB'))  # Parts of speech scored as informative
+MAX_KEY_PHRASES = 8  # Most relevant phrases reported per cluster
+KEY_ENTITY_LABELS = frozenset(('PERSON', 'ORG', 'PRODUCT', 'TECH'))
+# Per-cluster merging runs on a shared thread pool once there are this many clusters
+PARALLEL_MIN_CLUSTERS = 4
+_CLUSTER_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="sentence-merger")
+# Clusters smaller than this are merged by keeping their longest sentence, without spaCy
+SPACY_MERGE_MIN_SENTENCES = 3
+# Embeddings are only compared by cosine, so they are held at half precision;
+# products are formed in float32, DISTANCE_TILE_ROWS rows at a time
+EMBEDDING_DTYPE = np.float16
+DISTANCE_TILE_ROWS = 1024
+# Above this many sentences sklearn computes cosine distances itself instead of
+# being handed a dense NxN matrix
+PRECOMPUTED_DISTANCE_MAX = 2000
+# Approximate (HNSW nearest-neighbour graph) clustering, used automatically
+# above HNSW_MIN_SENTENCES when hnswlib is installed
+HNSW_MIN_SENTENCES = 3000
+HNSW_NEIGHBORS = 20
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+# Sentence embeddings are cached in memory (LRU) and, when
+# SENTENCE_MERGER_CACHE_DIR is set and diskcache is installed, on disk
+EMBEDDING_CACHE_SIZE = int(os.environ.get("SENTENCE_MERGER_CACHE_SIZE", "50000"))
+EMBEDDING_CACHE_DIR = os.environ.get("SENTENCE_MERGER_CACHE_DIR")
+ENCODE_BATCH_SIZE = 128  # encode() already length-sorts sentences within a call
+
+
+class EmbeddingCache:
+    """Process-wide LRU of sentence embeddings keyed by model name and text, with optional disk backing"""
+
+    def __init__(self, max_entries: int, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = diskcache.Cache(directory) if directory and DISKCACHE_AVAILABLE else None
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return hashlib.sha1(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return the cached embeddings among keys"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                embedding = self._entries.get(key)
+                if embedding is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = embedding
+        if self._disk is not None:
+            for key in keys:
+                if key not in found:
+                    embedding = self._disk.get(key)
+                    if embedding is not None:
+                        found[key] = embedding
+            self._remember(found)
+        return found
+
+    def set_many(self, embeddings: Dict[str, np.ndarray]):
+        self._remember(embeddings)
+        if self._disk is not None:
+            for key, embedding in embeddings.items():
+                self._disk.set(key, embedding)
+
+    def _remember(self, embeddings: Dict[str, np.ndarray]):
+        with self._lock:
+            for key, embedding in embeddings.items():
+                self._entries[key] = embedding
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_EMBEDDING_CACHE = EmbeddingCache(EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_DIR)
+
+
+@lru_cache(maxsize=None)
+def _load_sentence_model(model_name: str) -> SentenceTransformer:
+    model = SentenceTransformer(model_name)
+    # Half precision halves the forward pass's memory traffic on GPU
+    if model.device.type == 'cuda':
+        model.half()
+    return model
+
+
+@lru_cache(maxsize=None)
+def _load_nlp(model_name: str):
+    try:
+        return spacy.load(model_name)
+    except OSError:
+        # Fallback if model not available
+        return None
+
+
+def _get_st_model(model_name: str = SENTENCE_MODEL_NAME) -> SentenceTransformer:
+    """Return the shared sentence transformer, loading it on first use"""
+    # The lock keeps concurrent first requests from loading the weights twice
+    with _MODEL_LOCK:
+        return _load_sentence_model(model_name)
+
+
+def _get_nlp(model_name: str = SPACY_MODEL_NAME):
+    """Return the shared spaCy pipeline, or None if the model is not installed"""
+    with _MODEL_LOCK:
+        return _load_nlp(model_name)
+
 
 class SentenceMergerInput(BaseModel):
     text: str = Field(
@@ -46,93 +202,178 @@ class SentenceMergerInput(BaseModel):
             "help": "Similarity threshold for clustering (0.1-0.99). Lower values (0.6-0.7) merge more aggressively, higher values (0.75-0.9) are more conservative. Default 0.68 balances quality and reduction.",
         },
     )
+    clustering_backend: Literal["auto", "exact", "hnsw"] = Field(
+        default="auto",
+        json_schema_extra={
+            "label": "Clustering Backend",
+            "field_type": "select",
+            "options": ["auto", "exact", "hnsw"],
+            "help": "exact: agglomerative clustering. hnsw: approximate nearest-neighbour clustering for very large inputs (requires hnswlib). auto: hnsw above 3000 sentences when available.",
+        },
+    )
 
 
 class SentenceMerger:
-    def __init__(self, similarity_threshold=0.68):  # Lowered from 0.8
-        # Load pre-trained sentence transformer model
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        # Load spacy model with error handling
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-        except OSError:
-            # Fallback if model not available
-            self.nlp = None
+    def __init__(self, similarity_threshold=0.68, clustering_backend='auto'):  # Lowered from 0.8
+        if clustering_backend == 'hnsw' and not HNSWLIB_AVAILABLE:
+            raise ValueError("The 'hnsw' clustering backend requires hnswlib, which is not installed")
+        # Pre-trained sentence transformer and spacy models, shared process-wide
+        self.model = _get_st_model()
+        self.nlp = _get_nlp()
         self.similarity_threshold = similarity_threshold
+        self.clustering_backend = clustering_backend
     
     def preprocess_text(self, text: str) -> str:
         """Enhanced text preprocessing to clean and normalize text"""
-        # Remove problematic line breaks and normalize whitespace
-        text = re.sub(r'\r\n|\r|\n', ' ', text)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Clean up punctuation spacing
-        text = re.sub(r'\s+([.!?])', r'\1', text)
-        # Ensure single space after sentence endings
-        text = re.sub(r'([.!?])\s*', r'\1 ', text)
-        return text.strip()
+        # One pass: whitespace runs (line breaks included) become single spaces,
+        # and sentence endings lose the space before them and get one after
+        return _RE_CLEAN.sub(_clean_replacement, text).strip()
     
-    def get_embeddings(self, sentences):
-        """Generate embeddings for sentences"""
-        # Preprocess sentences before embedding
-        preprocessed = [self.preprocess_text(sent) for sent in sentences]
-        return self.model.encode(preprocessed)
+    def get_embeddings(self, sentences, preprocessed=None):
+        """Generate unit-norm embeddings for sentences, so dot products are cosine similarities
+
+        preprocessed may hold the sentences already passed through preprocess_text.
+        """
+        # Preprocess sentences before embedding, so cache hits are on normalized text
+        if preprocessed is None:
+            preprocessed = [self.preprocess_text(sent) for sent in sentences]
+        keys = [EmbeddingCache.key(SENTENCE_MODEL_NAME, text) for text in preprocessed]
+        found = _EMBEDDING_CACHE.get_many(keys)
+        
+        # Only encode texts not seen before (each distinct one once)
+        missing = {key: text for key, text in zip(keys, preprocessed) if key not in found}
+        if missing:
+            encoded = self.model.encode(list(missing.values()), batch_size=ENCODE_BATCH_SIZE,
+                                        show_progress_bar=False, normalize_embeddings=True,
+                                        convert_to_numpy=True)
+            new_embeddings = dict(zip(missing, encoded.astype(EMBEDDING_DTYPE)))
+            _EMBEDDING_CACHE.set_many(new_embeddings)
+            found.update(new_embeddings)
+        
+        return np.stack([found[key] for key in keys])
     
     def cluster_similar_sentences(self, sentences, embeddings):
         """Cluster sentences based on semantic similarity with improved algorithm"""
-        if len(sentences) <= 1:
-            return {0: sentences}
-            
-        # Calculate similarity matrix
-        similarity_matrix = cosine_similarity(embeddings)
+        return {
+            cluster_id: [sentences[idx] for idx in indices]
+            for cluster_id, indices in self.cluster_indices(embeddings).items()
+        }
+    
+    def cluster_indices(self, embeddings):
+        """Cluster embeddings, returning each cluster's row indices in input order.
+
+        Clusters are keyed in order of their first sentence, so iterating the
+        result visits them in document order.
+        """
+        if len(embeddings) <= 1:
+            return {0: list(range(len(embeddings)))}
+        
+        if self._use_hnsw(len(embeddings)):
+            clusters = self._hnsw_cluster_labels(embeddings)
+        else:
+            clusters = self._agglomerative_cluster_labels(embeddings)
+        
+        # Group row indices by cluster in one pass
+        indices_by_cluster = defaultdict(list)
+        for idx, cluster_id in enumerate(clusters):
+            indices_by_cluster[cluster_id].append(idx)
         
+        return dict(indices_by_cluster)
+    
+    def _use_hnsw(self, count):
+        """Whether to cluster count sentences with the approximate HNSW backend"""
+        if self.clustering_backend == 'exact':
+            return False
+        if self.clustering_backend == 'hnsw':
+            return True
+        # 'auto' only switches to HNSW when hnswlib is installed
+        return HNSWLIB_AVAILABLE and count > HNSW_MIN_SENTENCES
+    
+    def _hnsw_cluster_labels(self, embeddings):
+        """Label connected components of the graph linking each sentence to its
+        approximate nearest neighbours within the similarity threshold"""
+        matrix = embeddings.astype(np.float32)
+        count, dim = matrix.shape
+        index = hnswlib.Index(space='cosine', dim=dim)
+        index.init_index(max_elements=count, ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        index.add_items(matrix)
+        neighbours = min(HNSW_NEIGHBORS, count)
+        index.set_ef(max(neighbours, HNSW_M))
+        labels, distances = index.knn_query(matrix, k=neighbours)
+        
+        # hnswlib's cosine distance is 1 - similarity
+        keep = (distances <= 1 - self.similarity_threshold).ravel()
+        rows = np.repeat(np.arange(count), neighbours)[keep]
+        columns = labels.ravel()[keep]
+        graph = csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, columns)), shape=(count, count))
+        _, clusters = connected_components(graph, directed=False)
+        return clusters
+    
+    def _agglomerative_cluster_labels(self, embeddings):
+        """Label sentences with exact average-linkage agglomerative clustering"""
         # Use hierarchical clustering with ward linkage for better results
+        large_input = len(embeddings) > PRECOMPUTED_DISTANCE_MAX
         clustering = AgglomerativeClustering(
             n_clusters=None,
             distance_threshold=1-self.similarity_threshold,
-            metric='precomputed',
+            metric='cosine' if large_input else 'precomputed',
             linkage='average'  # Could experiment with 'ward' but needs euclidean distance
         )
         
-        # Convert similarity to distance
-        distance_matrix = 1 - similarity_matrix
-        clusters = clustering.fit_predict(distance_matrix)
-        
-        # Group sentences by cluster
-        clustered_sentences = defaultdict(list)
-        for idx, cluster_id in enumerate(clusters):
-            clustered_sentences[cluster_id].append(sentences[idx])
-        
-        return dict(clustered_sentences)
+        if large_input:
+            return clustering.fit_predict(embeddings.astype(np.float32))
+        return clustering.fit_predict(self._cosine_distance_matrix(embeddings))
     
-    def extract_key_phrases(self, sentences):
-        """Enhanced key phrase extraction with better filtering"""
+    def _cosine_distance_matrix(self, embeddings):
+        """Dense cosine distances between unit-norm embeddings"""
+        # Cosine distance from the unit-norm embeddings, built in a single NxN buffer;
+        # float16 rows are widened a tile at a time so the GEMM runs in float32
+        distance_matrix = np.empty((len(embeddings), len(embeddings)), dtype=np.float32)
+        columns = embeddings.T.astype(np.float32)
+        for start in range(0, len(embeddings), DISTANCE_TILE_ROWS):
+            rows = embeddings[start:start + DISTANCE_TILE_ROWS].astype(np.float32)
+            np.matmul(rows, columns, out=distance_matrix[start:start + DISTANCE_TILE_ROWS])
+        np.subtract(1.0, distance_matrix, out=distance_matrix)
+        np.fill_diagonal(distance_matrix, 0.0)
+        np.clip(distance_matrix, 0.0, 2.0, out=distance_matrix)
+        return distance_matrix
+    
+    def extract_key_phrases(self, sentences, doc=None):
+        """Enhanced key phrase extraction with better filtering
+
+        doc may be the already parsed " ".join(sentences), e.g. from nlp.pipe.
+        """
         if not self.nlp:
             # Improved fallback without spacy
             text = " ".join(sentences)
-            words = re.findall(r'\b\w+\b', text.lower())
+            words = _RE_WORD.findall(text.lower())
             # Filter out common stopwords and short words
             stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those'}
             word_counts = Counter(w for w in words if len(w) > 2 and w not in stopwords)
             return [word for word, count in word_counts.most_common(5) if count > 1]
         
-        text = " ".join(sentences)
-        doc = self.nlp(text)
+        if doc is None:
+            doc = self.nlp(" ".join(sentences))
         
-        key_phrases = []
+        # Insertion-ordered and duplicate-free; at most MAX_KEY_PHRASES are kept
+        key_phrases = {}
         
         # Extract meaningful noun phrases (filter out short/generic ones)
         for chunk in doc.noun_chunks:
             phrase = chunk.text.lower().strip()
             if len(phrase) > 3 and not phrase.startswith(('the ', 'a ', 'an ')):
-                key_phrases.append(phrase)
+                key_phrases[phrase] = None
+                if len(key_phrases) == MAX_KEY_PHRASES:
+                    return list(key_phrases)
         
         # Extract named entities
         for ent in doc.ents:
-            if ent.label_ in ['PERSON', 'ORG', 'PRODUCT', 'TECH']:  # Focus on relevant entities
+            if ent.label_ in KEY_ENTITY_LABELS:  # Focus on relevant entities
                 phrase = ent.text.lower().strip()
-                if phrase not in key_phrases and len(phrase) > 2:
-                    key_phrases.append(phrase)
+                if len(phrase) > 2:
+                    key_phrases[phrase] = None
+                    if len(key_phrases) == MAX_KEY_PHRASES:
+                        return list(key_phrases)
         
         # Extract important keywords based on POS tags
         important_words = []
@@ -146,59 +387,70 @@ class SentenceMerger:
         # Add frequent important words
         word_counts = Counter(important_words)
         for word, count in word_counts.most_common(3):
-            if count > 1 and word not in key_phrases:
-                key_phrases.append(word)
+            if count > 1:
+                key_phrases[word] = None
+                if len(key_phrases) == MAX_KEY_PHRASES:
+                    break
         
-        return list(set(key_phrases[:8]))  # Limit to 8 most relevant phrases
+        return list(key_phrases)
     
     def calculate_cluster_similarity(self, sentences, embeddings):
-        """Calculate average similarity within a cluster"""
+        """Calculate average similarity within a cluster (embeddings are unit-norm)"""
         if len(sentences) <= 1:
             return 1.0
             
-        similarities = []
-        for i in range(len(embeddings)):
-            for j in range(i + 1, len(embeddings)):
-                sim = cosine_similarity([embeddings[i]], [embeddings[j]])[0][0]
-                similarities.append(sim)
-        
-        return np.mean(similarities) if similarities else 1.0
+        # One Gram matrix of the rows; mean of its upper triangle
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        similarities = matrix @ matrix.T
+        return float(similarities[np.triu_indices(len(matrix), k=1)].mean())
     
-    def merge_cluster(self, sentences):
-        """Enhanced merging strategy that intelligently combines sentences"""
-        if len(sentences) == 1:
-            return self.preprocess_text(sentences[0])
-        
+    def merge_cluster(self, sentences, sentence_docs=None, clean_sentences=None):
+        """Enhanced merging strategy that intelligently combines sentences
+
+        sentence_docs may hold the already parsed preprocessed sentences, and
+        clean_sentences the preprocessed sentences themselves.
+        """
         # Preprocess all sentences
-        clean_sentences = [self.preprocess_text(sent) for sent in sentences]
+        if clean_sentences is None:
+            clean_sentences = [self.preprocess_text(sent) for sent in sentences]
         
-        if not self.nlp:
-            # Simple fallback: return the longest, most informative sentence
+        if len(sentences) == 1:
+            return clean_sentences[0]
+        
+        if not self.nlp or len(sentences) < SPACY_MERGE_MIN_SENTENCES:
+            # Simple fallback (and the common small-cluster case): return the
+            # longest, most informative sentence
             return max(clean_sentences, key=lambda x: len(x.split()))
         
         # Analyze sentences for intelligent merging
-        sentence_docs = [self.nlp(sent) for sent in clean_sentences]
+        if sentence_docs is None:
+            sentence_docs = list(self.nlp.pipe(clean_sentences, batch_size=SPACY_BATCH_SIZE))
+        
+        # One pass per doc yields both its informativeness score and its concepts
+        scores = []
+        concepts = []
+        for doc in sentence_docs:
+            content_words = 0
+            doc_concepts = set()
+            for token in doc:
+                if token.pos_ in CONTENT_POS:
+                    content_words += 1
+                if not token.is_stop and not token.is_punct and len(token.text) > 2:
+                    doc_concepts.add(token.lemma_.lower())
+            # Score based on named entities, important keywords, and length
+            scores.append(len(doc.ents) * 2 + content_words + len(doc) * 0.1)
+            concepts.append(doc_concepts)
         
         # Find the most comprehensive sentence as base
         base_idx = 0
         max_info = 0
-        for i, doc in enumerate(sentence_docs):
-            # Score based on named entities, important keywords, and length
-            score = (len([ent for ent in doc.ents]) * 2 + 
-                    len([token for token in doc if token.pos_ in ['NOUN', 'PROPN', 'VERB']]) +
-                    len(doc) * 0.1)
+        for i, score in enumerate(scores):
             if score > max_info:
                 max_info = score
                 base_idx = i
         
         base_sentence = clean_sentences[base_idx]
-        base_doc = sentence_docs[base_idx]
-        
-        # Extract key concepts from base sentence
-        base_concepts = set()
-        for token in base_doc:
-            if not token.is_stop and not token.is_punct and len(token.text) > 2:
-                base_concepts.add(token.lemma_.lower())
+        base_concepts = concepts[base_idx]
         
         # Find additional unique information from other sentences
         additional_info = []
@@ -207,12 +459,7 @@ class SentenceMerger:
                 continue
                 
             # Find unique concepts not in base
-            unique_concepts = set()
-            for token in doc:
-                if (not token.is_stop and not token.is_punct and 
-                    len(token.text) > 2 and 
-                    token.lemma_.lower() not in base_concepts):
-                    unique_concepts.add(token.lemma_.lower())
+            unique_concepts = concepts[i] - base_concepts
             
             # If significant unique content, consider adding key phrases
             if len(unique_concepts) >= 2:
@@ -236,46 +483,84 @@ class SentenceMerger:
             if unique_additions:
                 combined = f"{base_clean}, incorporating {', '.join(unique_additions)}."
                 # Clean up grammar
-                combined = re.sub(r',\s*,', ',', combined)  # Remove double commas
+                combined = _RE_DOUBLE_COMMA.sub(',', combined)  # Remove double commas
                 return combined
         
         return base_sentence
     
+    def _parse_clusters(self, clusters, clean_clusters):
+        """Run spaCy once over all clusters, returning per-cluster sentence docs and joined-text docs"""
+        if not self.nlp:
+            return {}, {}
+        # merge_cluster only uses spaCy for clusters of SPACY_MERGE_MIN_SENTENCES
+        # or more, so only their sentences are parsed individually
+        merge_ids = [cluster_id for cluster_id, sents in clusters.items()
+                     if len(sents) >= SPACY_MERGE_MIN_SENTENCES]
+        texts = [sent for cluster_id in merge_ids for sent in clean_clusters[cluster_id]]
+        texts.extend(" ".join(sents) for sents in clusters.values() if len(sents) < SPACY_MERGE_MIN_SENTENCES)
+        docs = iter(self.nlp.pipe(texts, batch_size=SPACY_BATCH_SIZE))
+
+        sentence_docs = {cluster_id: [next(docs) for _ in clusters[cluster_id]] for cluster_id in merge_ids}
+        # Those clusters' key phrases come from their sentence docs joined with
+        # Doc.from_docs, so no sentence goes through the pipeline twice
+        phrase_docs = {
+            cluster_id: Doc.from_docs(sentence_docs[cluster_id]) if cluster_id in sentence_docs else next(docs)
+            for cluster_id in clusters
+        }
+        return sentence_docs, phrase_docs
+
     def merge_sentences(self, sentences):
         """Main method to merge similar sentences with enhanced processing"""
         if not sentences:
             return [], {}
             
+        # Preprocess once; embedding, parsing and merging all share the result
+        preprocessed = [self.preprocess_text(sent) for sent in sentences]
+        
         # Generate embeddings
-        embeddings = self.get_embeddings(sentences)
+        embeddings = self.get_embeddings(sentences, preprocessed)
         
-        # Cluster similar sentences
-        clusters = self.cluster_similar_sentences(sentences, embeddings)
+        # Cluster similar sentences, keeping each cluster's original indices
+        cluster_indices = self.cluster_indices(embeddings)
+        clusters = {
+            cluster_id: [sentences[idx] for idx in indices]
+            for cluster_id, indices in cluster_indices.items()
+        }
+        clean_clusters = {
+            cluster_id: [preprocessed[idx] for idx in indices]
+            for cluster_id, indices in cluster_indices.items()
+        }
         
-        # Merge each cluster and collect details
-        merged_sentences = []
-        cluster_details = []
+        # Parse every cluster's sentences and joined text in one batched pass
+        sentence_docs, phrase_docs = self._parse_clusters(clusters, clean_clusters)
         
-        for cluster_id, cluster_sentences in clusters.items():
+        def process_cluster(cluster_id):
+            cluster_sentences = clusters[cluster_id]
             # Get embeddings for this cluster
-            cluster_indices = [i for i, sent in enumerate(sentences) if sent in cluster_sentences]
-            cluster_embeddings = [embeddings[i] for i in cluster_indices]
+            cluster_embeddings = embeddings[cluster_indices[cluster_id]]
             
             # Merge the cluster
-            merged = self.merge_cluster(cluster_sentences)
-            merged_sentences.append(merged)
+            merged = self.merge_cluster(cluster_sentences, sentence_docs.get(cluster_id), clean_clusters[cluster_id])
             
             # Calculate cluster statistics
             similarity_score = self.calculate_cluster_similarity(cluster_sentences, cluster_embeddings)
-            key_phrases = self.extract_key_phrases(cluster_sentences)
+            key_phrases = self.extract_key_phrases(cluster_sentences, phrase_docs.get(cluster_id))
             
-            cluster_details.append({
+            return {
                 'cluster_id': cluster_id,
                 'sentences': cluster_sentences,
                 'merged_sentence': merged,
                 'similarity_score': similarity_score,
                 'key_phrases': key_phrases
-            })
+            }
+        
+        # Merge each cluster and collect details; clusters are independent, so
+        # larger sets fan out over the worker pool (map keeps cluster order)
+        if len(clusters) < PARALLEL_MIN_CLUSTERS:
+            cluster_details = [process_cluster(cluster_id) for cluster_id in clusters]
+        else:
+            cluster_details = list(_CLUSTER_POOL.map(process_cluster, clusters))
+        merged_sentences = [details['merged_sentence'] for details in cluster_details]
         
         return merged_sentences, cluster_details
 
@@ -309,11 +594,12 @@ class Plugin(BasePlugin):
         text = data.get('text', '')
         sentences_input = data.get('sentences', [])
         similarity_threshold = float(data.get('similarity_threshold', 0.68))  # Lowered default
+        clustering_backend = data.get('clustering_backend', 'auto')
         
         # Parse sentences from text or use provided sentences list
         if text and not sentences_input:
-            # Split text into sentences using improved regex
-            sentences = self._split_into_sentences(text)
+            # Split text into sentences lazily, as the cleaning loop consumes them
+            sentences = self._iter_sentences(text)
         elif sentences_input:
             sentences = self._normalize_sentences_input(sentences_input)
         else:
@@ -322,13 +608,12 @@ class Plugin(BasePlugin):
         # Enhanced sentence cleaning
         cleaned_sentences = []
         for sent in sentences:
-            # Remove citation markers and clean formatting
-            cleaned = re.sub(r'\[cite:.*?\]', '', sent)
-            cleaned = re.sub(r'\r\n|\r|\n', ' ', cleaned)
-            cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+            # Remove citation markers and clean formatting (line breaks included)
+            cleaned = _RE_WS.sub(' ', _RE_CITE.sub('', sent)).strip()
             
-            # Filter out very short or low-quality sentences
-            if cleaned and len(cleaned) > 15 and len(cleaned.split()) > 3:
+            # Filter out very short or low-quality sentences; cleaned is
+            # single-spaced, so more than 3 words means at least 3 spaces
+            if len(cleaned) > 15 and cleaned.count(' ') >= 3:
                 cleaned_sentences.append(cleaned)
         
         original_count = len(cleaned_sentences)
@@ -350,7 +635,7 @@ class Plugin(BasePlugin):
         
         # Initialize merger with improved parameters
         embedding_start = time.time()
-        merger = SentenceMerger(similarity_threshold=similarity_threshold)
+        merger = SentenceMerger(similarity_threshold=similarity_threshold, clustering_backend=clustering_backend)
         embedding_time = time.time() - embedding_start
         
         # Process sentences
@@ -369,7 +654,7 @@ class Plugin(BasePlugin):
             "reduction_percentage": round(reduction_percentage, 2),
             "similarity_threshold": similarity_threshold,
             "clusters": cluster_details,
-            "merged_sentences": sorted(merged_sentences),  # Sort for consistency
+            "merged_sentences": merged_sentences,  # Deterministic: clusters in order of first sentence
             "processing_stats": {
                 "processing_time_seconds": round(total_time, 3),
                 "embedding_time_seconds": round(embedding_time, 3),
@@ -394,7 +679,7 @@ class Plugin(BasePlugin):
                     parsed_values = None
 
             if parsed_values is None:
-                parsed_values = [segment for segment in re.split(r'[\r\n]+', raw) if segment]
+                parsed_values = [segment for segment in _RE_LINES.split(raw) if segment]
 
             return [str(item).strip() for item in parsed_values if str(item).strip()]
 
@@ -403,51 +688,14 @@ class Plugin(BasePlugin):
 
         return []
     
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """Enhanced sentence splitting with better handling of edge cases"""
-        # Improved sentence splitting that handles abbreviations and edge cases
-        text = re.sub(r'\r\n|\r|\n', ' ', text)  # Normalize line breaks
-        
-        # First, protect common abbreviations by temporarily replacing them
-        abbreviations = {
-            r'\bDr\.': 'Dr___TEMP___',
-            r'\bMr\.': 'Mr___TEMP___',
-            r'\bMrs\.': 'Mrs___TEMP___',
-            r'\bMs\.': 'Ms___TEMP___',
-            r'\bProf\.': 'Prof___TEMP___',
-            r'\bvs\.': 'vs___TEMP___',
-            r'\betc\.': 'etc___TEMP___',
-            r'\bi\.e\.': 'ie___TEMP___',
-            r'\be\.g\.': 'eg___TEMP___'
-        }
-        
-        # Temporarily replace abbreviations
-        for abbrev_pattern, replacement in abbreviations.items():
-            text = re.sub(abbrev_pattern, replacement, text)
-        
-        # Split on sentence-ending punctuation followed by whitespace and capital letter
-        sentences = re.split(r'\.\s+(?=[A-Z])', text)
-        
-        # Also split on other sentence endings
-        all_sentences = []
-        for sent in sentences:
-            # Split on ! and ? as well
-            sub_sentences = re.split(r'[!?]\s+(?=[A-Z])', sent)
-            all_sentences.extend(sub_sentences)
-        
-        # Restore abbreviations
-        final_sentences = []
-        for sent in all_sentences:
-            # Restore each abbreviation
-            sent = sent.replace('Dr___TEMP___', 'Dr.')
-            sent = sent.replace('Mr___TEMP___', 'Mr.')
-            sent = sent.replace('Mrs___TEMP___', 'Mrs.')
-            sent = sent.replace('Ms___TEMP___', 'Ms.')
-            sent = sent.replace('Prof___TEMP___', 'Prof.')
-            sent = sent.replace('vs___TEMP___', 'vs.')
-            sent = sent.replace('etc___TEMP___', 'etc.')
-            sent = sent.replace('ie___TEMP___', 'i.e.')
-            sent = sent.replace('eg___TEMP___', 'e.g.')
-            final_sentences.append(sent.strip())
-        
-        return [s for s in final_sentences if s.strip()] 
+    def _iter_sentences(self, text: str) -> Iterator[str]:
+        """Yield the raw text between sentence boundaries, one at a time.
+
+        Abbreviations are skipped by the boundary pattern's lookbehinds.
+        Sentences keep their line breaks and surrounding whitespace.
+        """
+        start = 0
+        for boundary in _SPLIT_SENTENCES.finditer(text):
+            yield text[start:boundary.start()]
+            start = boundary.end()
+        yield text[start:]
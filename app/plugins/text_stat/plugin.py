@@ -4,6 +4,19 @@ from collections import Counter
 from pydantic import BaseModel, Field
 from ...models.plugin import BasePlugin, BasePluginResponse
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Words (letters, numbers, apostrophes in contractions) and sentence endings
+_WORD_RE = re.compile(r"\b\w+(?:'\w+)?\b")
+_SENT_END_RE = re.compile(r'[.!?]+')
+
+# ASCII texts at least this long have their characters counted with np.bincount
+BINCOUNT_MIN_LENGTH = 4096
+
 
 class TextStatResponse(BasePluginResponse):
     """Pydantic model for text statistics plugin response"""
@@ -73,26 +86,25 @@ class Plugin(BasePlugin):
                 "sentence_count": 0
             }
         
-        # Basic counts
+        # Character analysis: every character statistic comes from one frequency table
+        character_counts = self._count_characters(text)
         character_count = len(text)
-        character_count_no_spaces = len(text.replace(' ', ''))
+        character_count_no_spaces = character_count - character_counts.get(' ', 0)
+        unique_characters = len(character_counts)
         line_count = len(text.splitlines())
         
-        # Word analysis
+        # Word analysis: unique words are the keys of the lowercased frequency table
         words = self._extract_words(text)
         word_count = len(words)
-        unique_words_set = set(word.lower() for word in words)
-        unique_words = len(unique_words_set)
-        
-        # Character analysis
-        unique_characters = len(set(text))
+        word_counts = Counter(map(str.lower, words))
+        unique_words = len(word_counts)
         
         # Frequency analysis
-        word_frequency = dict(Counter(word.lower() for word in words))
-        character_frequency = dict(Counter(text))
+        word_frequency = dict(word_counts)
+        character_frequency = dict(character_counts)
         
         # Advanced statistics
-        average_word_length = sum(len(word) for word in words) / word_count if word_count > 0 else 0.0
+        average_word_length = sum(map(len, words)) / word_count if word_count > 0 else 0.0
         sentence_count = self._count_sentences(text)
         
         return {
@@ -108,14 +120,25 @@ class Plugin(BasePlugin):
             "sentence_count": sentence_count
         }
     
+    def _count_characters(self, text: str) -> Dict[str, int]:
+        """Count each character, using np.bincount over the bytes of long ASCII texts"""
+        if NUMPY_AVAILABLE and len(text) >= BINCOUNT_MIN_LENGTH and text.isascii():
+            codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+            counts = np.bincount(codes, minlength=128)
+            # Keep Counter's first-occurrence key order
+            present, first_index = np.unique(codes, return_index=True)
+            ordered = present[np.argsort(first_index)]
+            return {chr(code): int(counts[code]) for code in ordered}
+        return Counter(text)
+    
     def _extract_words(self, text: str) -> list:
         """Extract words from text using regex"""
         # Match word characters (letters, numbers, apostrophes in contractions)
-        words = re.findall(r"\b\w+(?:'\w+)?\b", text)
+        words = _WORD_RE.findall(text)
         return words
     
     def _count_sentences(self, text: str) -> int:
         """Count sentences based on sentence-ending punctuation"""
         # Count sentences by looking for sentence-ending punctuation
-        sentence_endings = re.findall(r'[.!?]+', text)
+        sentence_endings = _SENT_END_RE.findall(text)
         return len(sentence_endings) if sentence_endings else (1 if text.strip() else 0) 
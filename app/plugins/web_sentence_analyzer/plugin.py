@@ -1,6 +1,12 @@
+import asyncio
+import hashlib
+import math
 import re
-from typing import Dict, Any, List, Optional, Type
+import threading
+from typing import Dict, Any, FrozenSet, List, Mapping, Optional, Tuple, Type
 from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
 import requests
 from bs4 import BeautifulSoup, NavigableString, Tag
 import nltk
@@ -11,26 +17,225 @@ from pydantic import BaseModel, Field
 from dataclasses import dataclass, field
 from ...models.plugin import BasePlugin, BasePluginResponse
 
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# The punkt data lookup walks nltk.data.path, so it is done once per process
+# on first use rather than every time the plugin is instantiated
+_PUNKT_LOCK = threading.Lock()
+_punkt_ready = False
+
+# lxml parses in C and detects the encoding from the raw bytes; html.parser
+# is the pure-Python fallback when it is not installed
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+# Browser-like headers shared by the sync session and the async client
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Pages fetched at once by DOMContentAnalyzer.analyze_many
+ANALYZE_CONCURRENCY = 16
+
+# Bounds that Plugin.execute clamps the sentence limits to
+MAX_SENTENCES_BOUNDS = (10, 500)
+MIN_SENTENCE_LENGTH_BOUNDS = (5, 100)
+
+# Analysis result for a page without sentences; _empty_result copies it
+_EMPTY_RESULT: Mapping[str, Any] = MappingProxyType({
+    "url": "",
+    "page_title": "",
+    "total_sentences": 0,
+    "unique_sentences": 0,
+    "total_text_length": 0,
+    "average_sentence_length": 0.0,
+    "content_nodes_found": 0,
+})
+
+
+def _empty_result(**fields: Any) -> Dict[str, Any]:
+    """Result without sentences, with ``fields`` overriding the defaults"""
+    return dict(_EMPTY_RESULT, most_common_sentences=[], **fields)
+
+
+def _fingerprint(text: str) -> int:
+    """64-bit fingerprint used to count sentences without keeping them as keys"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(text)
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+# Candidate count from which content scores are computed as NumPy arrays
+VECTOR_SCORE_MIN_NODES = 64
+
+# Zero-width and formatting Unicode characters, deleted with str.translate
+_ZERO_WIDTH_CHARS = [
+    *range(0x200b, 0x2010), *range(0x2028, 0x2030), 0xfeff, 0x00ad, 0x061c, 0x180e,
+    *range(0x2060, 0x2065), *range(0x206a, 0x2070),
+]
+_ZERO_WIDTH_TABLE = dict.fromkeys(_ZERO_WIDTH_CHARS)
+
+# Static text-cleanup patterns, compiled once at import
+_WHITESPACE_RE = re.compile(r'\s+')
+# Preprocessing cleanups fused into one alternation; the named group that
+# matched selects the replacement, unnamed alternatives are dropped
+_CLEAN_RE = re.compile(
+    r'⌘\s*[A-Z]'  # Keyboard shortcuts
+    r'|Ctrl\+[A-Z]'
+    r'|(?i:search\.\.\.)\s*'
+    r'|(?P<word>\b\w+\b)(?:\s+(?P=word)){2,}'  # Triple+ repetitions
+    r'|(?P<space>\s{3,})'
+    r'|(?P<dots>\.{3,})'
+    r'|(?P<bang>!{2,})'
+    r'|(?P<query>\?{2,})'
+)
+_CLEAN_REPLACEMENTS = {'space': ' ', 'dots': '...', 'bang': '!', 'query': '?'}
+_CAPS_LINE_RE = re.compile(r'^[A-Z\s]+$')
+_NUMERIC_LINE_RE = re.compile(r'^[\d\s\-]+$')
+
+# Post-tokenization rejections in one search: long all-caps sentences,
+# keyboard shortcuts, three or more ellipses, and sentences under 50
+# characters that start with a call to action
+_REJECT_SENTENCE_RE = re.compile(
+    r'^\s*[A-Z\s]{10,}$'
+    r'|⌘'
+    r'|\.\.\.(?:.*?\.\.\.){2}'
+    r'|^(?=.{0,49}\Z)(?ai:copy|click|view|see) ',
+    re.DOTALL,
+)
+
+# Words that count towards a sentence being navigation rather than prose
+_NAV_KEYWORDS = frozenset({
+    'home', 'menu', 'search', 'login', 'register', 'subscribe',
+    'contact', 'about', 'help', 'support', 'privacy', 'terms',
+    'github', 'sdk', 'api', 'documentation', 'guide', 'tutorial',
+    'quickstart', 'example', 'learn', 'explore', 'check', 'view'
+})
+
+# Substrings that mark a sentence of three words or fewer as a navigation item
+_LIST_ITEM_KEYWORDS = ('sdk', 'api', 'home', 'menu', 'search')
+
+# Whole lines dropped before tokenization as bare UI labels
+_UI_LINE_WORDS = frozenset({'home', 'menu', 'search', 'login', 'help'})
+
+
+def _clean_replacement(match: re.Match) -> str:
+    """Replacement for a _CLEAN_RE match"""
+    if match.lastgroup == 'word':
+        return match.group('word')
+    return _CLEAN_REPLACEMENTS.get(match.lastgroup, '')
+
+# Class/id substrings that mark an element as a navigation container, matched
+# with one alternation instead of a substring test per indicator
+_NAV_INDICATORS = frozenset({
+    'nav', 'menu', 'header', 'footer', 'sidebar', 'aside',
+    'breadcrumb', 'pagination', 'toolbar', 'topbar', 'bottombar',
+    'social', 'share', 'follow', 'subscribe', 'newsletter',
+    'ad', 'ads', 'advertisement', 'promo', 'sponsor',
+    'related', 'recommend', 'similar', 'trending', 'popular'
+})
+_NAV_INDICATOR_RE = re.compile('|'.join(map(re.escape, sorted(_NAV_INDICATORS))))
+
+# Substrings whose presence in a node's text marks it as navigation-heavy
+_SCORE_NAV_KEYWORDS = ('home', 'menu', 'search', 'login', 'sdk', 'github', 'api', 'guide')
+
+
+def _approx_tag_bytes(element: Tag) -> int:
+    """Approximate the markup a tag adds around its children (tags and attributes)"""
+    attr_bytes = 0
+    for key, value in element.attrs.items():
+        if isinstance(value, list):
+            value = ' '.join(value)
+        attr_bytes += len(key) + len(value or '') + 4
+    return len(element.name) * 2 + attr_bytes + 5
+
 
 class NodeAnalysis:
     """Analysis data for a DOM node"""
-    def __init__(self, element: Tag, text_length: int, child_count: int, depth: int):
+    def __init__(self, element: Tag, text_length: int, child_count: int, depth: int,
+                 html_length: Optional[int] = None, text: Optional[str] = None,
+                 score: bool = True):
         self.element = element
         self.text_length = text_length
         self.child_count = child_count
         self.depth = depth
+        # Pre-order entry/exit counters set by the traversal; a node nests
+        # inside another exactly when its interval lies within the other's
+        self.enter_idx: Optional[int] = None
+        self.exit_idx: Optional[int] = None
+        # Serializing the subtree is only a fallback; traversal passes an estimate
+        self.html_length = html_length if html_length is not None else len(str(element))
         self.text_density = self._calculate_text_density()
-        self.content_score = self._calculate_content_score()
+        self.nav_count, self.max_repetitions, self.word_count = self._count_text_features(text)
+        # With score=False the caller scores a batch of nodes at once
+        self.content_score = self._calculate_content_score() if score else 0.0
     
     def _calculate_text_density(self) -> float:
         """Calculate text-to-HTML ratio"""
-        html_length = len(str(self.element))
+        html_length = self.html_length
         return self.text_length / html_length if html_length > 0 else 0
     
+    def _count_text_features(self, text: Optional[str] = None) -> Tuple[int, int, int]:
+        """Count navigation keywords, the most repeated word and the words in the node text
+        
+        ``text`` is the node text already extracted during analysis; the element
+        is only re-read when it is not supplied.
+        """
+        if text is None:
+            text = self.element.get_text()
+        element_text = text.lower()
+        nav_count = sum(1 for keyword in _SCORE_NAV_KEYWORDS if keyword in element_text)
+        
+        words = element_text.split()
+        max_repetitions = 0
+        if len(words) > 10:
+            # Only count substantial words
+            most_common = Counter(word for word in words if len(word) > 3).most_common(1)
+            max_repetitions = most_common[0][1] if most_common else 1
+        return nav_count, max_repetitions, len(words)
+    
     def _calculate_content_score(self) -> float:
         """Calculate overall content score using multiple factors"""
         # Base score from text length (logarithmic scale for diminishing returns)
-        import math
         length_score = min(math.log(self.text_length + 1) / math.log(2000), 1.0)
         
         # Text density bonus (higher is better, but cap it)
@@ -50,24 +255,13 @@ class NodeAnalysis:
             child_score = max(0.2, 1 - (self.child_count * 0.03))  # Penalize too many children
         
         # Navigation penalty - check for navigation-heavy content
-        element_text = self.element.get_text().lower()
-        nav_keywords = ['home', 'menu', 'search', 'login', 'sdk', 'github', 'api', 'guide']
         nav_penalty = 1.0
-        nav_count = sum(1 for keyword in nav_keywords if keyword in element_text)
-        if nav_count > 3:  # High navigation keyword density
-            nav_penalty = max(0.3, 1 - (nav_count * 0.1))
+        if self.nav_count > 3:  # High navigation keyword density
+            nav_penalty = max(0.3, 1 - (self.nav_count * 0.1))
         
         # Repetition penalty - check for repeated text patterns
-        words = element_text.split()
-        if len(words) > 10:
-            word_counts = {}
-            for word in words:
-                if len(word) > 3:  # Only count substantial words
-                    word_counts[word] = word_counts.get(word, 0) + 1
-            
-            # Calculate repetition ratio
-            max_repetitions = max(word_counts.values()) if word_counts else 1
-            repetition_penalty = max(0.5, 1 - (max_repetitions / len(words)))
+        if self.word_count > 10:
+            repetition_penalty = max(0.5, 1 - (self.max_repetitions / self.word_count))
         else:
             repetition_penalty = 1.0
         
@@ -81,6 +275,42 @@ class NodeAnalysis:
         return min(base_score * substantial_bonus, 1.0)
 
 
+def _score_loop(text_len, html_len, depth, child_count, nav_count, max_rep, n_words):
+    """Per-node loop form of NodeAnalysis._calculate_content_score, compiled with Numba"""
+    n = text_len.shape[0]
+    scores = np.empty(n)
+    log_2000 = math.log(2000)
+    for i in range(n):
+        length_score = min(math.log(text_len[i] + 1) / log_2000, 1.0)
+        density = text_len[i] / html_len[i] if html_len[i] > 0 else 0.0
+        density_score = min(density * 3, 1.0)
+        depth_penalty = max(0.1, 1 - depth[i] * 0.15)
+        
+        children = child_count[i]
+        if children == 0:
+            child_score = 0.7
+        elif children <= 5:
+            child_score = 1.0
+        elif children <= 15:
+            child_score = 0.8
+        else:
+            child_score = max(0.2, 1 - children * 0.03)
+        
+        nav_penalty = max(0.3, 1 - nav_count[i] * 0.1) if nav_count[i] > 3 else 1.0
+        repetition_penalty = max(0.5, 1 - max_rep[i] / n_words[i]) if n_words[i] > 10 else 1.0
+        substantial_bonus = 1.2 if text_len[i] > 1000 else 1.0
+        
+        base_score = (length_score * 0.30 + density_score * 0.20 +
+                      depth_penalty * 0.20 + child_score * 0.15 +
+                      nav_penalty * 0.10 + repetition_penalty * 0.05)
+        scores[i] = min(base_score * substantial_bonus, 1.0)
+    return scores
+
+
+# Compiled lazily on first call and cached on disk next to the module
+_score_kernel = njit(cache=True, fastmath=True)(_score_loop) if NUMBA_AVAILABLE else None
+
+
 class SentenceInfo(BaseModel):
     """Model for individual sentence information"""
     rank: int = Field(..., description="Ranking by frequency")
@@ -146,7 +376,7 @@ class AnalyzerConfig:
     max_nodes: int = 5
     min_sentence_length: int = 10
     max_sentences: int = 50
-    chunk_size: int = 8192
+    chunk_size: int = 65536
     
     # Navigation patterns for filtering
     navigation_patterns: List[str] = field(default_factory=lambda: [
@@ -186,10 +416,132 @@ class AnalyzerConfig:
         r'show more'
     ])
     
-    excluded_tags: List[str] = field(default_factory=lambda: [
+    excluded_tags: FrozenSet[str] = field(default_factory=lambda: frozenset({
         'script', 'style', 'noscript', 'nav', 'header', 'footer',
         'aside', 'iframe', 'svg', 'form', 'input', 'button', 'comment'
-    ])
+    }))
+
+    def __post_init__(self):
+        # Tag names are checked once per string during text extraction
+        self.excluded_tags = frozenset(self.excluded_tags)
+
+        # One alternation so a sentence is scanned once instead of once per pattern
+        self._combined_nav_re = re.compile(
+            '|'.join(f'(?:{p})' for p in self.navigation_patterns), re.IGNORECASE
+        )
+
+
+# Page texts kept by the preprocessing and tokenization caches; boilerplate
+# repeats across pages, but each key is a whole page so the bound stays small
+TOKENIZE_CACHE_SIZE = 256
+# Longer texts bypass those caches, which are bounded by entry count rather
+# than size, so a few huge pages can't pin large amounts of memory
+CACHE_MAX_TEXT_CHARS = 64 * 1024
+
+
+def _preprocess_text(text: str) -> str:
+    """Clean and preprocess text before sentence tokenization, memoized for short texts"""
+    if len(text) > CACHE_MAX_TEXT_CHARS:
+        return _clean_text(text)
+    return _cached_clean_text(text)
+
+
+def _clean_text(text: str) -> str:
+    """Clean and preprocess text before sentence tokenization"""
+    if not text:
+        return text
+
+    # Remove zero-width and formatting Unicode characters (comprehensive)
+    text = text.translate(_ZERO_WIDTH_TABLE)
+
+    # Clean up web UI artifacts, repeated words and runs of whitespace or
+    # punctuation in a single scan
+    text = _CLEAN_RE.sub(_clean_replacement, text)
+
+    # Remove standalone navigation fragments
+    text = ' '.join(
+        line for line in map(str.strip, text.split('\n'))
+        # Skip lines that are just navigation or UI elements
+        if not (len(line) < 5 or
+                _CAPS_LINE_RE.match(line) or  # All caps short lines
+                _NUMERIC_LINE_RE.match(line) or  # Just numbers and dashes
+                line.lower() in _UI_LINE_WORDS)
+    )
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+_cached_clean_text = lru_cache(maxsize=TOKENIZE_CACHE_SIZE)(_clean_text)
+
+
+# Texts at least this long are split by a single compiled boundary scan
+# instead of punkt. The pattern has no lookaround, so google-re2 runs it as a
+# linear-time DFA when installed; the stdlib engine handles it the same way
+FAST_SPLIT_MIN_CHARS = 50_000
+_SENTENCE_BOUNDARY_RE = (re2 if RE2_AVAILABLE else re).compile(
+    r'([.!?]+["\')\]]*)\s+(["\'(\[]*[A-Z])'
+)
+# Words whose trailing period does not end a sentence in the fast split
+_ABBREVIATIONS = frozenset({
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'etc', 'inc',
+    'ltd', 'co', 'corp', 'no', 'fig', 'e.g', 'i.e', 'u.s', 'jan', 'feb', 'mar',
+    'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+})
+
+
+def _fast_sent_split(text: str) -> List[str]:
+    """Split where terminal punctuation is followed by whitespace and a capital letter"""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_BOUNDARY_RE.finditer(text):
+        end = match.end(1)
+        if text[end - 1] == '.':
+            # The word before the period; the sentence's first word has no space before it
+            space = text.rfind(' ', start, end)
+            word = text[space + 1 if space >= 0 else start:end - 1].lower()
+            # Initials ("J. Smith") and known abbreviations
+            if len(word) == 1 or word in _ABBREVIATIONS:
+                continue
+        sentences.append(text[start:end])
+        start = match.start(2)
+    sentences.append(text[start:])
+    return [sentence for sentence in map(str.strip, sentences) if sentence]
+
+
+def _cached_sent_tokenize(text: str) -> Tuple[str, ...]:
+    """Sentence split as a tuple, memoized for texts up to CACHE_MAX_TEXT_CHARS"""
+    if len(text) > CACHE_MAX_TEXT_CHARS:
+        return _sent_tokenize(text)
+    return _memoized_sent_tokenize(text)
+
+
+def _sent_tokenize(text: str) -> Tuple[str, ...]:
+    """Sentence split
+
+    Punkt is used up to FAST_SPLIT_MIN_CHARS; longer texts take the regex
+    boundary scan, which does not learn abbreviations from context.
+    """
+    if len(text) >= FAST_SPLIT_MIN_CHARS:
+        return tuple(_fast_sent_split(text))
+    return tuple(sent_tokenize(text))
+
+
+_memoized_sent_tokenize = lru_cache(maxsize=TOKENIZE_CACHE_SIZE)(_sent_tokenize)
+
+
+def _ensure_punkt() -> None:
+    """Make sure the NLTK punkt tokenizer is installed, downloading it if needed"""
+    global _punkt_ready
+    if _punkt_ready:
+        return
+    with _PUNKT_LOCK:
+        if _punkt_ready:
+            return
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            logger.info("Downloading NLTK punkt tokenizer...")
+            nltk.download('punkt', quiet=True)
+        _punkt_ready = True
 
 
 class DOMContentAnalyzer:
@@ -197,9 +549,15 @@ class DOMContentAnalyzer:
     
     def __init__(self, config: Optional[AnalyzerConfig] = None):
         self.config = config or AnalyzerConfig()
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self.session = self._create_session()
     
+    @classmethod
+    def clear_caches(cls) -> None:
+        """Drop memoized preprocessing and sentence tokenization results"""
+        _cached_clean_text.cache_clear()
+        _memoized_sent_tokenize.cache_clear()
+    
     def _create_session(self) -> requests.Session:
         """Create configured requests session"""
         session = requests.Session()
@@ -207,13 +565,7 @@ class DOMContentAnalyzer:
         session.mount('http://', adapter)
         session.mount('https://', adapter)
         
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        session.headers.update(REQUEST_HEADERS)
         
         return session
     
@@ -227,69 +579,47 @@ class DOMContentAnalyzer:
             if content_length and int(content_length) > self.config.max_content_size:
                 raise ValueError(f"Content too large: {content_length} bytes (max: {self.config.max_content_size})")
             
-            # Read content with size limit
-            content = b''
+            # Read content with size limit; bytearray grows in place instead of
+            # copying everything received so far on each chunk
+            max_size = self.config.max_content_size
+            content = bytearray()
             for chunk in response.iter_content(chunk_size=self.config.chunk_size):
-                content += chunk
-                if len(content) > self.config.max_content_size:
-                    raise ValueError(f"Content exceeds {self.config.max_content_size} bytes")
+                if len(content) + len(chunk) > max_size:
+                    raise ValueError(f"Content exceeds {max_size} bytes")
+                content.extend(chunk)
             
             # Create new response with content
-            response._content = content
+            response._content = bytes(content)
             return response
     
-    def _get_text_content(self, element: Tag) -> str:
-        """Extract text without expensive copy operations"""
-        texts = []
-        for el in element.descendants:
-            if isinstance(el, NavigableString) and el.parent.name not in self.config.excluded_tags:
-                text = el.strip()
-                if text:
-                    texts.append(text)
+    def _get_text_content(self, element: Tag, text_cache: Optional[Dict[int, str]] = None) -> str:
+        """Extract text without expensive copy operations
         
-        combined_text = ' '.join(texts)
-        return re.sub(r'\s+', ' ', combined_text).strip()
+        ``text_cache`` maps ``id(element)`` to text already extracted during the
+        current analysis; it is only valid while that parse tree is alive.
+        """
+        if text_cache is not None:
+            cached = text_cache.get(id(element))
+            if cached is not None:
+                return cached
+        
+        excluded_tags = self.config.excluded_tags
+        texts = [
+            text for text in (
+                el.strip() for el in element.descendants
+                if isinstance(el, NavigableString) and el.parent.name not in excluded_tags
+            )
+            if text
+        ]
+        
+        combined_text = _WHITESPACE_RE.sub(' ', ' '.join(texts)).strip()
+        if text_cache is not None:
+            text_cache[id(element)] = combined_text
+        return combined_text
     
     def _preprocess_text_for_tokenization(self, text: str) -> str:
         """Clean and preprocess text before sentence tokenization"""
-        if not text:
-            return text
-        
-        # Remove zero-width and formatting Unicode characters (comprehensive)
-        text = re.sub(r'[\u200b-\u200f\u2028-\u202f\ufeff\u00ad\u061c\u180e\u2060-\u2064\u206a-\u206f]', '', text)
-        
-        # Extra aggressive removal of zero-width space if still present
-        text = text.replace('\u200b', '')
-        
-        # Clean up common web UI artifacts
-        text = re.sub(r'⌘\s*[A-Z]', '', text)  # Keyboard shortcuts
-        text = re.sub(r'Ctrl\+[A-Z]', '', text)
-        text = re.sub(r'search\.\.\.\s*', '', text, flags=re.IGNORECASE)
-        
-        # Remove repeated navigation text patterns
-        text = re.sub(r'(\b\w+\b)(\s+\1){2,}', r'\1', text)  # Remove triple+ repetitions
-        
-        # Clean up excessive whitespace and punctuation
-        text = re.sub(r'\s{3,}', ' ', text)  # Multiple spaces to single
-        text = re.sub(r'\.{3,}', '...', text)  # Multiple dots to ellipsis
-        text = re.sub(r'[!]{2,}', '!', text)  # Multiple exclamations
-        text = re.sub(r'[?]{2,}', '?', text)  # Multiple questions
-        
-        # Remove standalone navigation fragments
-        lines = text.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            line = line.strip()
-            # Skip lines that are just navigation or UI elements
-            if (len(line) < 5 or 
-                re.match(r'^[A-Z\s]+$', line) or  # All caps short lines
-                re.match(r'^[\d\s\-]+$', line) or  # Just numbers and dashes
-                line.lower() in ['home', 'menu', 'search', 'login', 'help']):
-                continue
-            cleaned_lines.append(line)
-        
-        text = ' '.join(cleaned_lines)
-        return re.sub(r'\s+', ' ', text).strip()
+        return _preprocess_text(text)
     
     def _filter_navigation_text(self, text: str) -> str:
         """Filter out navigation and boilerplate text patterns"""
@@ -297,11 +627,9 @@ class DOMContentAnalyzer:
             return text
         
         # Check if entire text matches navigation patterns
-        text_lower = text.lower()
-        for pattern in self.config.navigation_patterns:
-            if re.search(pattern, text_lower):
-                if len(text) < 200:  # Short navigation text
-                    return ""
+        nav_re = self.config._combined_nav_re
+        if len(text) < 200 and nav_re.search(text):  # Short navigation text
+            return ""
         
         # Split into sentences and filter each
         sentences = text.split('.')
@@ -312,21 +640,26 @@ class DOMContentAnalyzer:
             if len(sentence) < 10:  # Too short
                 continue
                 
-            sentence_lower = sentence.lower()
-            is_navigation = False
-            
-            for pattern in self.config.navigation_patterns:
-                if re.search(pattern, sentence_lower):
-                    is_navigation = True
-                    break
-            
-            if not is_navigation:
+            if not nav_re.search(sentence):
                 filtered_sentences.append(sentence)
         
         return '. '.join(filtered_sentences).strip()
     
-    def _analyze_dom_node(self, element: Tag, depth: int = 0) -> Optional[NodeAnalysis]:
-        """Analyze a single DOM node for content richness"""
+    def _analyze_dom_node(
+        self,
+        element: Tag,
+        depth: int = 0,
+        text_content: Optional[str] = None,
+        child_count: Optional[int] = None,
+        html_length: Optional[int] = None,
+        score: bool = True,
+    ) -> Optional[NodeAnalysis]:
+        """Analyze a single DOM node for content richness
+        
+        ``text_content``, ``child_count`` and ``html_length`` may be supplied when
+        the caller has already computed them during traversal; ``score=False``
+        leaves the content score for the caller to compute in bulk.
+        """
         if not isinstance(element, Tag) or element.name in self.config.excluded_tags:
             return None
         
@@ -335,7 +668,8 @@ class DOMContentAnalyzer:
             return None
         
         # Get text content using optimized method
-        text_content = self._get_text_content(element)
+        if text_content is None:
+            text_content = self._get_text_content(element)
         text_content = self._filter_navigation_text(text_content)
         text_length = len(text_content)
         
@@ -348,28 +682,20 @@ class DOMContentAnalyzer:
             return None
         
         # Count direct children that are tags
-        child_count = len([child for child in element.children if isinstance(child, Tag)])
+        if child_count is None:
+            child_count = len([child for child in element.children if isinstance(child, Tag)])
         
-        return NodeAnalysis(element, text_length, child_count, depth)
+        return NodeAnalysis(element, text_length, child_count, depth, html_length, text_content, score)
     
     def _is_likely_navigation_container(self, element: Tag) -> bool:
         """Check if element is likely a navigation container"""
-        if not element.get('class') and not element.get('id'):
+        classes = element.get('class')
+        element_id = element.get('id')
+        if not classes and not element_id:
             return False
         
-        classes = ' '.join(element.get('class', [])).lower()
-        element_id = element.get('id', '').lower()
-        combined = f"{classes} {element_id}"
-        
-        nav_indicators = [
-            'nav', 'menu', 'header', 'footer', 'sidebar', 'aside',
-            'breadcrumb', 'pagination', 'toolbar', 'topbar', 'bottombar',
-            'social', 'share', 'follow', 'subscribe', 'newsletter',
-            'ad', 'ads', 'advertisement', 'promo', 'sponsor',
-            'related', 'recommend', 'similar', 'trending', 'popular'
-        ]
-        
-        return any(indicator in combined for indicator in nav_indicators)
+        combined = f"{' '.join(classes) if classes else ''} {element_id or ''}".lower()
+        return _NAV_INDICATOR_RE.search(combined) is not None
     
     def _is_mostly_navigation_text(self, text: str) -> bool:
         """Check if text is mostly navigation content"""
@@ -381,39 +707,128 @@ class DOMContentAnalyzer:
         if len(sentences) < 3:
             return False
         
-        nav_sentence_count = 0
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            for pattern in self.config.navigation_patterns:
-                if re.search(pattern, sentence_lower):
-                    nav_sentence_count += 1
-                    break
+        nav_re = self.config._combined_nav_re
+        nav_sentence_count = sum(1 for sentence in sentences if nav_re.search(sentence))
         
         # If more than 50% are navigation sentences, consider it mostly navigation
         return nav_sentence_count / len(sentences) > 0.5
     
-    def _find_content_nodes(self, soup: BeautifulSoup) -> List[NodeAnalysis]:
-        """Find all nodes with significant text content"""
+    def _find_content_nodes(
+        self, soup: BeautifulSoup, text_cache: Optional[Dict[int, str]] = None
+    ) -> List[NodeAnalysis]:
+        """Find all nodes with significant text content
+        
+        The extracted text of every returned node is stored in ``text_cache``
+        when one is given, so later extraction does not walk the nodes again.
+        """
+        # Start traversal from body or html
+        start_element = soup.find('body') or soup.find('html') or soup
+        if not isinstance(start_element, Tag):
+            return []
+        
+        excluded_tags = self.config.excluded_tags
         content_nodes = []
+        # (joined text, approximate HTML length) of nodes whose parent has not
+        # been visited yet, by id()
+        subtree: Dict[int, Tuple[str, int]] = {}
         
-        def traverse_dom(element: Tag, depth: int = 0):
-            """Recursively traverse DOM and analyze nodes"""
-            analysis = self._analyze_dom_node(element, depth)
-            if analysis and analysis.text_length >= self.config.min_content_length:
-                content_nodes.append(analysis)
+        # Iterative post-order walk: a node's text and markup size are assembled
+        # from its own strings and its children's totals, so each string is
+        # visited once instead of once per ancestor
+        order = 0
+        stack = [(start_element, 0, 0, False)]
+        while stack:
+            element, depth, index, visited = stack.pop()
+            if not visited:
+                stack.append((element, depth, order, True))
+                order += 1
+                tag_children = [child for child in element.children if isinstance(child, Tag)]
+                for child in reversed(tag_children):
+                    stack.append((child, depth + 1, 0, False))
+                continue
             
-            # Traverse children
+            own_strings = element.name not in excluded_tags
+            parts = []
+            child_count = 0
+            html_length = _approx_tag_bytes(element)
             for child in element.children:
                 if isinstance(child, Tag):
-                    traverse_dom(child, depth + 1)
-        
-        # Start traversal from body or html
-        start_element = soup.find('body') or soup.find('html') or soup
-        if isinstance(start_element, Tag):
-            traverse_dom(start_element)
+                    child_count += 1
+                    text, child_html_length = subtree.pop(id(child))
+                    html_length += child_html_length
+                elif isinstance(child, NavigableString):
+                    html_length += len(child)
+                    if not own_strings:
+                        continue
+                    text = _WHITESPACE_RE.sub(' ', child.strip())
+                else:
+                    continue
+                if text:
+                    parts.append(text)
+            text_content = ' '.join(parts)
+            subtree[id(element)] = (text_content, html_length)
+            
+            analysis = self._analyze_dom_node(
+                element, depth, text_content, child_count, html_length, score=False
+            )
+            if analysis and analysis.text_length >= self.config.min_content_length:
+                # Every descendant was entered after index and before now
+                analysis.enter_idx = index
+                analysis.exit_idx = order
+                content_nodes.append(analysis)
+                if text_cache is not None:
+                    text_cache[id(element)] = text_content
         
+        # Report nodes in document order, as the recursive walk did
+        content_nodes.sort(key=lambda analysis: analysis.enter_idx)
+        self._score_nodes(content_nodes)
         return content_nodes
     
+    def _score_nodes(self, nodes: List[NodeAnalysis]) -> None:
+        """Assign content scores, in one compiled or vectorized pass for large candidate sets"""
+        if not NUMPY_AVAILABLE or len(nodes) < VECTOR_SCORE_MIN_NODES:
+            for node in nodes:
+                node.content_score = node._calculate_content_score()
+            return
+        
+        columns = np.array(
+            [
+                (node.text_length, node.html_length, node.depth, node.child_count,
+                 node.nav_count, node.max_repetitions, node.word_count)
+                for node in nodes
+            ],
+            dtype=np.float64,
+        ).T
+        if NUMBA_AVAILABLE:
+            scores = _score_kernel(*np.ascontiguousarray(columns))
+        else:
+            scores = self._score_vector(*columns)
+        for node, content_score in zip(nodes, scores.tolist()):
+            node.content_score = content_score
+    
+    @staticmethod
+    def _score_vector(text_len, html_len, depth, child_count, nav_count, max_rep, n_words):
+        """Array form of NodeAnalysis._calculate_content_score over float64 columns"""
+        length_score = np.minimum(np.log1p(text_len) / math.log(2000), 1.0)
+        density = np.divide(text_len, html_len, out=np.zeros_like(text_len), where=html_len > 0)
+        density_score = np.minimum(density * 3, 1.0)
+        depth_penalty = np.maximum(0.1, 1 - depth * 0.15)
+        child_score = np.select(
+            [child_count == 0, child_count <= 5, child_count <= 15],
+            [0.7, 1.0, 0.8],
+            np.maximum(0.2, 1 - child_count * 0.03),
+        )
+        nav_penalty = np.where(nav_count > 3, np.maximum(0.3, 1 - nav_count * 0.1), 1.0)
+        repetition_penalty = np.where(
+            n_words > 10, np.maximum(0.5, 1 - max_rep / np.maximum(n_words, 1)), 1.0
+        )
+        substantial_bonus = np.where(text_len > 1000, 1.2, 1.0)
+        
+        base_score = (length_score * 0.30 + density_score * 0.20 +
+                      depth_penalty * 0.20 + child_score * 0.15 +
+                      nav_penalty * 0.10 + repetition_penalty * 0.05)
+        return np.minimum(base_score * substantial_bonus, 1.0)
+    
     def _select_best_content_nodes(self, content_nodes: List[NodeAnalysis]) -> List[NodeAnalysis]:
         """Select the best content nodes, avoiding nested duplicates"""
         if not content_nodes:
@@ -430,14 +845,14 @@ class DOMContentAnalyzer:
             # Check if this node is nested within any already selected node
             is_nested = False
             for selected in selected_nodes:
-                if self._is_nested_within(node.element, selected.element):
+                if self._node_nested_within(node, selected):
                     is_nested = True
                     break
             
             # Also check if any selected node is nested within this node
             nested_indices = []
             for i, selected in enumerate(selected_nodes):
-                if self._is_nested_within(selected.element, node.element):
+                if self._node_nested_within(selected, node):
                     nested_indices.append(i)
             
             if nested_indices:
@@ -450,6 +865,12 @@ class DOMContentAnalyzer:
         
         return selected_nodes
     
+    def _node_nested_within(self, child: NodeAnalysis, parent: NodeAnalysis) -> bool:
+        """Check if child's element is nested within parent's element"""
+        if child.enter_idx is not None and parent.enter_idx is not None:
+            return parent.enter_idx < child.enter_idx and child.exit_idx <= parent.exit_idx
+        return self._is_nested_within(child.element, parent.element)
+    
     def _is_nested_within(self, child_element: Tag, parent_element: Tag) -> bool:
         """Check if child_element is nested within parent_element"""
         current = child_element.parent
@@ -459,15 +880,19 @@ class DOMContentAnalyzer:
             current = current.parent
         return False
     
-    def _extract_content_from_nodes(self, content_nodes: List[NodeAnalysis]) -> str:
+    def _extract_content_from_nodes(
+        self, content_nodes: List[NodeAnalysis], text_cache: Optional[Dict[int, str]] = None
+    ) -> str:
         """Extract and combine text from selected content nodes"""
         if not content_nodes:
             return ""
         
         content_parts = []
+        seen = set()
         for node in content_nodes:
-            text = self._get_text_content(node.element)
-            if text and text not in content_parts:  # Avoid duplicates
+            text = self._get_text_content(node.element, text_cache)
+            if text and text not in seen:  # Avoid duplicates
+                seen.add(text)
                 content_parts.append(text)
         
         return ' '.join(content_parts)
@@ -478,53 +903,50 @@ class DOMContentAnalyzer:
         
         for sentence in sentences:
             sentence = sentence.strip()
-            if not sentence:
+            length = len(sentence)
+            
+            # Skip empty and very short sentences that are likely fragments
+            if length < 15:
                 continue
             
-            # Skip very short sentences that are likely fragments
-            if len(sentence) < 15:
+            # Skip sentences with unusual patterns (long all-caps, keyboard
+            # shortcuts, too many ellipses, short call-to-action lines)
+            if _REJECT_SENTENCE_RE.search(sentence):
                 continue
             
             # Skip sentences with too many non-alphabetic characters
-            alpha_ratio = sum(c.isalpha() for c in sentence) / len(sentence)
+            alpha_ratio = sum(map(str.isalpha, sentence)) / length
             if alpha_ratio < 0.5:
                 continue
             
             # Skip sentences that are mostly navigation
             sentence_lower = sentence.lower()
-            nav_word_count = 0
-            nav_keywords = [
-                'home', 'menu', 'search', 'login', 'register', 'subscribe',
-                'contact', 'about', 'help', 'support', 'privacy', 'terms',
-                'github', 'sdk', 'api', 'documentation', 'guide', 'tutorial',
-                'quickstart', 'example', 'learn', 'explore', 'check', 'view'
-            ]
-            
             words = sentence_lower.split()
-            for word in words:
-                if word in nav_keywords:
-                    nav_word_count += 1
+            nav_word_count = sum(1 for word in words if word in _NAV_KEYWORDS)
             
             # If more than 40% of words are navigation keywords, skip
             if len(words) > 0 and nav_word_count / len(words) > 0.4:
                 continue
             
-            # Skip sentences with unusual patterns
-            if (re.search(r'^\s*[A-Z\s]{10,}$', sentence) or  # Long all-caps
-                re.search(r'[⌘]', sentence) or  # Keyboard shortcuts
-                sentence.count('...') > 2 or  # Too many ellipses
-                sentence.lower().startswith(('copy ', 'click ', 'view ', 'see ')) and len(sentence) < 50):
-                continue
-            
             # Skip sentences that look like lists or navigation items
             if (sentence.count(' ') < 3 and 
-                any(word in sentence.lower() for word in ['sdk', 'api', 'home', 'menu', 'search'])):
+                any(word in sentence_lower for word in _LIST_ITEM_KEYWORDS)):
                 continue
                 
             filtered_sentences.append(sentence)
         
         return filtered_sentences
     
+    def _resolve_limits(self, max_sentences: Optional[int], min_sentence_length: Optional[int]) -> Tuple[int, int]:
+        """Apply config defaults to the sentence limits and clamp them"""
+        max_sentences = max_sentences or self.config.max_sentences
+        min_sentence_length = min_sentence_length or self.config.min_sentence_length
+        return max(1, min(max_sentences, 500)), max(5, min(min_sentence_length, 200))
+    
+    def _error_result(self, url: str, error: str) -> Dict[str, Any]:
+        """Empty analysis result carrying an error message"""
+        return _empty_result(url=url, error=error)
+    
     def analyze(self, url: str, max_sentences: Optional[int] = None, min_sentence_length: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze web page using enhanced DOM-based content extraction
@@ -537,182 +959,223 @@ class DOMContentAnalyzer:
         Returns:
             Dictionary with analysis results
         """
-        # Use config defaults or override values
-        max_sentences = max_sentences or self.config.max_sentences
-        min_sentence_length = min_sentence_length or self.config.min_sentence_length
-        
         # Validate inputs
         if not url or not self._is_valid_url(url):
-            return {
-                "url": url,
-                "page_title": "",
-                "total_sentences": 0,
-                "unique_sentences": 0,
-                "total_text_length": 0,
-                "average_sentence_length": 0.0,
-                "most_common_sentences": [],
-                "content_nodes_found": 0,
-                "error": "Invalid URL provided"
-            }
+            return self._error_result(url, "Invalid URL provided")
         
-        # Clamp parameters
-        max_sentences = max(1, min(max_sentences, 500))
-        min_sentence_length = max(5, min(min_sentence_length, 200))
+        max_sentences, min_sentence_length = self._resolve_limits(max_sentences, min_sentence_length)
         
         try:
             # Fetch webpage safely
             response = self._fetch_safely(url)
+            return self._analyze_html(
+                url,
+                response.content,
+                response.headers.get('content-type', ''),
+                max_sentences,
+                min_sentence_length,
+            )
+        except requests.RequestException as e:
+            return self._error_result(url, f"Failed to fetch webpage: {str(e)}")
+        except Exception as e:
+            self.logger.error(f"Analysis failed for {url}: {e}")
+            return self._error_result(url, f"Analysis failed: {str(e)}")
+    
+    async def analyze_many(
+        self,
+        urls: List[str],
+        max_sentences: Optional[int] = None,
+        min_sentence_length: Optional[int] = None,
+        concurrency: int = ANALYZE_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze several web pages concurrently
+        
+        Pages are fetched over one pooled httpx client with at most
+        ``concurrency`` requests in flight; parsing and sentence analysis run
+        on worker threads so the event loop keeps fetching. Without httpx
+        installed, each URL goes through the synchronous ``analyze`` on a
+        worker thread instead. Results keep the input order.
+        """
+        await asyncio.to_thread(_ensure_punkt)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        if not HTTPX_AVAILABLE:
+            async def bounded_sync(url: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await asyncio.to_thread(self.analyze, url, max_sentences, min_sentence_length)
+            return list(await asyncio.gather(*(bounded_sync(url) for url in urls)))
+        
+        transport = httpx.AsyncHTTPTransport(
+            retries=3, limits=httpx.Limits(max_connections=max(1, concurrency))
+        )
+        async with httpx.AsyncClient(
+            transport=transport,
+            headers=REQUEST_HEADERS,
+            timeout=self.config.request_timeout,
+            follow_redirects=True,
+        ) as client:
+            async def bounded(url: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._analyze_async(client, url, max_sentences, min_sentence_length)
+            return list(await asyncio.gather(*(bounded(url) for url in urls)))
+    
+    async def _fetch_async(self, client: "httpx.AsyncClient", url: str) -> Tuple[bytes, str]:
+        """Async counterpart of _fetch_safely; returns the body and content type"""
+        max_size = self.config.max_content_size
+        async with client.stream('GET', url) as response:
+            response.raise_for_status()
             
-            # Check content type
-            content_type = response.headers.get('content-type', '').lower()
-            if 'html' not in content_type:
-                return {
-                    "url": url,
-                    "page_title": "",
-                    "total_sentences": 0,
-                    "unique_sentences": 0,
-                    "total_text_length": 0,
-                    "average_sentence_length": 0.0,
-                    "most_common_sentences": [],
-                    "content_nodes_found": 0,
-                    "error": f"Not an HTML page: {content_type}"
-                }
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Get title
-            title_tag = soup.find('title')
-            page_title = title_tag.get_text().strip() if title_tag else urlparse(url).netloc
-            
-            # Find content-rich nodes
-            self.logger.info(f"Analyzing DOM structure for {url}")
-            content_nodes = self._find_content_nodes(soup)
-            
-            if not content_nodes:
-                return {
-                    "url": url,
-                    "page_title": page_title,
-                    "total_sentences": 0,
-                    "unique_sentences": 0,
-                    "total_text_length": 0,
-                    "average_sentence_length": 0.0,
-                    "most_common_sentences": [],
-                    "content_nodes_found": 0,
-                    "error": "No content-rich nodes found in DOM"
-                }
-            
-            # Select best content nodes
-            best_nodes = self._select_best_content_nodes(content_nodes)
-            self.logger.info(f"Found {len(content_nodes)} content nodes, selected {len(best_nodes)} best nodes")
-            
-            # Extract text from selected nodes
-            text_content = self._extract_content_from_nodes(best_nodes)
-            
-            if not text_content:
-                return {
-                    "url": url,
-                    "page_title": page_title,
-                    "total_sentences": 0,
-                    "unique_sentences": 0,
-                    "total_text_length": 0,
-                    "average_sentence_length": 0.0,
-                    "most_common_sentences": [],
-                    "content_nodes_found": len(content_nodes),
-                    "error": "No text content extracted from content nodes"
-                }
-            
-            # Preprocess text for better sentence tokenization
-            preprocessed_text = self._preprocess_text_for_tokenization(text_content)
-            
-            # Tokenize sentences
-            sentences = sent_tokenize(preprocessed_text)
-            
-            # Apply post-processing quality filter
-            sentences = self._filter_low_quality_sentences(sentences)
-            
-            # Filter sentences by length
-            valid_sentences = [
-                sentence.strip() 
-                for sentence in sentences 
-                if len(sentence.strip()) >= min_sentence_length
-            ]
-            
-            if not valid_sentences:
-                return {
-                    "url": url,
-                    "page_title": page_title,
-                    "total_sentences": len(sentences),
-                    "unique_sentences": 0,
-                    "total_text_length": len(text_content),
-                    "average_sentence_length": 0.0,
-                    "most_common_sentences": [],
-                    "content_nodes_found": len(content_nodes),
-                    "error": f"No sentences found with minimum length of {min_sentence_length} characters"
-                }
-            
-            # Count sentence frequencies
-            normalized_for_counting = [s.lower().strip() for s in valid_sentences]
-            sentence_counts = Counter(normalized_for_counting)
-            
-            # Map back to original sentences
-            original_sentences = {}
-            for original, normalized in zip(valid_sentences, normalized_for_counting):
-                if normalized not in original_sentences:
-                    original_sentences[normalized] = original
-            
-            # Get most common sentences
-            most_common = sentence_counts.most_common(max_sentences)
-            
-            most_common_sentences = [
-                {
-                    "rank": idx + 1,
-                    "sentence": original_sentences[normalized_sentence],
-                    "frequency": count
-                }
-                for idx, (normalized_sentence, count) in enumerate(most_common)
-            ]
-            
-            # Calculate statistics
-            total_length = sum(len(s) for s in valid_sentences)
-            avg_length = total_length / len(valid_sentences) if valid_sentences else 0
-            
-            return {
-                "url": url,
-                "page_title": page_title,
-                "total_sentences": len(sentences),
-                "unique_sentences": len(sentence_counts),
-                "total_text_length": len(text_content),
-                "average_sentence_length": round(avg_length, 2),
-                "most_common_sentences": most_common_sentences,
-                "content_nodes_found": len(content_nodes)
-            }
+            content_length = response.headers.get('Content-Length')
+            if content_length and int(content_length) > max_size:
+                raise ValueError(f"Content too large: {content_length} bytes (max: {max_size})")
             
-        except requests.RequestException as e:
-            return {
-                "url": url,
-                "page_title": "",
-                "total_sentences": 0,
-                "unique_sentences": 0,
-                "total_text_length": 0,
-                "average_sentence_length": 0.0,
-                "most_common_sentences": [],
-                "content_nodes_found": 0,
-                "error": f"Failed to fetch webpage: {str(e)}"
-            }
+            content = bytearray()
+            async for chunk in response.aiter_bytes(self.config.chunk_size):
+                if len(content) + len(chunk) > max_size:
+                    raise ValueError(f"Content exceeds {max_size} bytes")
+                content.extend(chunk)
+            return bytes(content), response.headers.get('content-type', '')
+    
+    async def _analyze_async(
+        self,
+        client: "httpx.AsyncClient",
+        url: str,
+        max_sentences: Optional[int],
+        min_sentence_length: Optional[int],
+    ) -> Dict[str, Any]:
+        """Fetch one page on the shared client and analyze it off the event loop"""
+        if not url or not self._is_valid_url(url):
+            return self._error_result(url, "Invalid URL provided")
+        
+        max_sentences, min_sentence_length = self._resolve_limits(max_sentences, min_sentence_length)
+        
+        try:
+            content, content_type = await self._fetch_async(client, url)
+            return await asyncio.to_thread(
+                self._analyze_html, url, content, content_type, max_sentences, min_sentence_length
+            )
+        except httpx.HTTPError as e:
+            return self._error_result(url, f"Failed to fetch webpage: {str(e)}")
         except Exception as e:
             self.logger.error(f"Analysis failed for {url}: {e}")
-            return {
-                "url": url,
-                "page_title": "",
-                "total_sentences": 0,
-                "unique_sentences": 0,
-                "total_text_length": 0,
-                "average_sentence_length": 0.0,
-                "most_common_sentences": [],
-                "content_nodes_found": 0,
-                "error": f"Analysis failed: {str(e)}"
+            return self._error_result(url, f"Analysis failed: {str(e)}")
+    
+    def _analyze_html(
+        self,
+        url: str,
+        content: bytes,
+        content_type: str,
+        max_sentences: int,
+        min_sentence_length: int,
+    ) -> Dict[str, Any]:
+        """Run DOM content extraction and sentence analysis on a fetched page"""
+        # Check content type
+        content_type = content_type.lower()
+        if 'html' not in content_type:
+            return self._error_result(url, f"Not an HTML page: {content_type}")
+        
+        # Parse HTML. BeautifulSoup only builds a tree from the complete
+        # document, so parsing cannot start while the body is still arriving;
+        # analyze_many overlaps one page's parse with other pages' downloads
+        soup = BeautifulSoup(content, HTML_PARSER)
+        
+        # Get title
+        title_tag = soup.find('title')
+        page_title = title_tag.get_text().strip() if title_tag else urlparse(url).netloc
+        
+        # Find content-rich nodes; node texts are kept for this page only,
+        # since ids are reused once the tree is freed
+        self.logger.info(f"Analyzing DOM structure for {url}")
+        text_cache: Dict[int, str] = {}
+        content_nodes = self._find_content_nodes(soup, text_cache)
+        
+        if not content_nodes:
+            return _empty_result(
+                url=url,
+                page_title=page_title,
+                error="No content-rich nodes found in DOM"
+            )
+        
+        # Select best content nodes
+        best_nodes = self._select_best_content_nodes(content_nodes)
+        self.logger.info(f"Found {len(content_nodes)} content nodes, selected {len(best_nodes)} best nodes")
+        
+        # Extract text from selected nodes
+        text_content = self._extract_content_from_nodes(best_nodes, text_cache)
+        
+        if not text_content:
+            return _empty_result(
+                url=url,
+                page_title=page_title,
+                content_nodes_found=len(content_nodes),
+                error="No text content extracted from content nodes"
+            )
+        
+        # Preprocess text for better sentence tokenization
+        preprocessed_text = self._preprocess_text_for_tokenization(text_content)
+        
+        # Tokenize sentences
+        sentences = list(_cached_sent_tokenize(preprocessed_text))
+        
+        # Apply post-processing quality filter
+        sentences = self._filter_low_quality_sentences(sentences)
+        
+        # Filter sentences by length
+        valid_sentences = [
+            sentence
+            for sentence in map(str.strip, sentences)
+            if len(sentence) >= min_sentence_length
+        ]
+        
+        if not valid_sentences:
+            return _empty_result(
+                url=url,
+                page_title=page_title,
+                total_sentences=len(sentences),
+                total_text_length=len(text_content),
+                content_nodes_found=len(content_nodes),
+                error=f"No sentences found with minimum length of {min_sentence_length} characters"
+            )
+        
+        # Count sentence frequencies by fingerprint of the normalized text,
+        # remembering the first original spelling (sentences are already
+        # stripped)
+        sentence_counts = Counter()
+        original_sentences = {}
+        for original in valid_sentences:
+            fingerprint = _fingerprint(original.lower())
+            sentence_counts[fingerprint] += 1
+            if fingerprint not in original_sentences:
+                original_sentences[fingerprint] = original
+        
+        # Get most common sentences; with a limit Counter selects them with a
+        # heap instead of sorting every distinct sentence
+        most_common = sentence_counts.most_common(max_sentences)
+        
+        most_common_sentences = [
+            {
+                "rank": idx + 1,
+                "sentence": original_sentences[fingerprint],
+                "frequency": count
             }
+            for idx, (fingerprint, count) in enumerate(most_common)
+        ]
+        
+        # Calculate statistics; summing len over the list runs in C
+        total_length = sum(map(len, valid_sentences))
+        avg_length = total_length / len(valid_sentences) if valid_sentences else 0
+        
+        return {
+            "url": url,
+            "page_title": page_title,
+            "total_sentences": len(sentences),
+            "unique_sentences": len(sentence_counts),
+            "total_text_length": len(text_content),
+            "average_sentence_length": round(avg_length, 2),
+            "most_common_sentences": most_common_sentences,
+            "content_nodes_found": len(content_nodes)
+        }
     
     def _is_valid_url(self, url: str) -> bool:
         """Validate URL format"""
@@ -731,16 +1194,8 @@ class Plugin(BasePlugin):
     """Enhanced Web Sentence Analyzer Plugin - Advanced DOM-based content extraction"""
     
     def __init__(self):
-        """Initialize the plugin with enhanced DOM analyzer and NLTK setup"""
-        # Configure logging
-        self.logger = logging.getLogger(__name__)
-        
-        # Ensure NLTK punkt tokenizer is available
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            self.logger.info("Downloading NLTK punkt tokenizer...")
-            nltk.download('punkt', quiet=True)
+        """Initialize the plugin with enhanced DOM analyzer"""
+        self.logger = logger
         
         # Initialize DOM content analyzer
         self.analyzer = DOMContentAnalyzer()
@@ -767,22 +1222,16 @@ class Plugin(BasePlugin):
         """
         # Extract and validate parameters with bounds checking
         url = str(data.get('url', '')).strip()
-        max_sentences = min(max(int(data.get('max_sentences', 50)), 10), 500)
-        min_sentence_length = min(max(int(data.get('min_sentence_length', 10)), 5), 100)
+        low, high = MAX_SENTENCES_BOUNDS
+        max_sentences = min(max(int(data.get('max_sentences', 50)), low), high)
+        low, high = MIN_SENTENCE_LENGTH_BOUNDS
+        min_sentence_length = min(max(int(data.get('min_sentence_length', 10)), low), high)
         
         # Validate URL
         if not url:
-            return {
-                "url": "",
-                "page_title": "",
-                "total_sentences": 0,
-                "unique_sentences": 0,
-                "total_text_length": 0,
-                "average_sentence_length": 0.0,
-                "most_common_sentences": [],
-                "content_nodes_found": 0,
-                "error": "No URL provided for analysis"
-            }
+            return _empty_result(error="No URL provided for analysis")
         
+        _ensure_punkt()
+
         # Use the enhanced DOM analyzer
         return self.analyzer.analyze(url, max_sentences, min_sentence_length) 
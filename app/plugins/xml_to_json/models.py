@@ -1,28 +1,37 @@
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass
 from typing import List, Union, Optional, Literal
 from pydantic import BaseModel, Field
 
 # --- Define the building blocks (nodes) for content ---
+# Content nodes are plain slotted dataclasses: a converted document holds one
+# per XML element, and only the top-level PrincipiaDocument is validated by
+# Pydantic (node instances are accepted as-is, without re-validation).
 
-class BaseNode(BaseModel):
-    """A base model for all content nodes."""
+@dataclass(slots=True, frozen=True, kw_only=True)
+class BaseNode:
+    """A base class for all content nodes."""
     pass
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class TextNode(BaseNode):
     """Represents plain text content."""
     type: Literal["text"] = "text"
     content: str
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class EmphasisNode(BaseNode):
     """Represents emphasized text, from an <E> tag."""
     type: Literal["emphasis"] = "emphasis"
     content: str
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class StructuralNode(BaseNode):
     """Represents structural elements like lines or placeholders."""
     type: Literal["structural"] = "structural"
     element_type: str  # e.g., "HorizontalRule", "Span", "Image", "Link", "Table"
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class RawHtmlNode(BaseNode):
     """Represents a block of raw HTML content."""
     type: Literal["raw_html"] = "raw_html"
@@ -33,16 +42,19 @@ InlineContent = Union[TextNode, EmphasisNode, StructuralNode, RawHtmlNode]
 
 # --- Define the main block-level components of the document ---
 
-class BaseBlock(BaseModel):
-    """A base model for all block-level content."""
+@dataclass(slots=True, frozen=True, kw_only=True)
+class BaseBlock:
+    """A base class for all block-level content."""
     pass
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class HeadingNode(BaseBlock):
     """Represents a heading, from an <H> tag."""
     type: Literal["heading"] = "heading"
     level: int
     content: List[InlineContent]
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class ParagraphNode(BaseBlock):
     """Represents a paragraph, from a <P> tag."""
     type: Literal["paragraph"] = "paragraph"
@@ -50,11 +62,13 @@ class ParagraphNode(BaseBlock):
     semantic_label: Optional[str] = None
     content: List[InlineContent]
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class DivNode(BaseBlock):
     """Represents a division or container, from a <DIV> tag."""
     type: Literal["div"] = "div"
     content: List['ContentBlock'] # Using ForwardRef as a string
 
+@dataclass(slots=True, frozen=True, kw_only=True)
 class QuoteNode(BaseBlock):
     """Represents a blockquote, from a <Q> tag."""
     type: Literal["quote"] = "quote"
@@ -63,10 +77,6 @@ class QuoteNode(BaseBlock):
 # A Union type for any block-level content.
 ContentBlock = Union[HeadingNode, ParagraphNode, DivNode, QuoteNode, RawHtmlNode, StructuralNode]
 
-# Update forward references for nested models
-DivNode.model_rebuild()
-QuoteNode.model_rebuild()
-
 # --- Define the top-level document model ---
 
 class DocumentMetadata(BaseModel):
@@ -1,7 +1,10 @@
-import xml.etree.ElementTree as ET
-from typing import List, Union, Optional, Dict, Any, Type
-import tempfile
+import dataclasses
+import io
+import json
+import sys
+from typing import BinaryIO, Callable, Iterator, List, Union, Optional, Dict, Any, Type
 from pathlib import Path
+from uuid import uuid4
 from pydantic import BaseModel, Field
 from ...models.plugin import BasePlugin, BasePluginResponse
 
@@ -11,64 +14,310 @@ from .models import (
     ParagraphNode, DivNode, QuoteNode
 )
 
-def parse_element(element: ET.Element) -> List[Union[ContentBlock, InlineContent]]:
+try:
+    from lxml import etree as ET
+    LXML_AVAILABLE = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    LXML_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# libxml2 parser options: entities are not expanded and nothing is fetched
+# over the network; comments and processing instructions are dropped while
+# parsing. Whitespace-only text is kept, since it separates inline siblings
+# in metadata values; _append_text already skips it in the body
+_ITERPARSE_OPTIONS = dict(
+    huge_tree=True,
+    remove_comments=True,
+    remove_pis=True,
+    resolve_entities=False,
+    no_network=True,
+) if LXML_AVAILABLE else {}
+
+# Tag names of the Principia markup, interned once so the handler table,
+# the recursion set and the body check all share the same key objects
+(
+    _TAG_B, _TAG_H, _TAG_P, _TAG_DIV, _TAG_Q,
+    _TAG_RAW_BLOCK, _TAG_RAW, _TAG_E, _TAG_U, _TAG_S,
+) = map(sys.intern, ("B", "H", "P", "DIV", "Q", "RawBlock", "Raw", "E", "U", "S"))
+
+# Metadata paragraphs are <P> elements carrying an <S> label. lxml compiles
+# the expression once; ElementTree caches its own path parse per string
+_META_PATH = './/P[S]'
+_LABEL_TAG = _TAG_S
+if LXML_AVAILABLE:
+    _find_meta_paragraphs = ET.XPath(_META_PATH)
+else:
+    def _find_meta_paragraphs(root: ET.Element) -> List[ET.Element]:
+        return root.findall(_META_PATH)
+
+# Outputs are written straight into the managed downloads directory, whose
+# age-based cleanup removes them, instead of a mkdtemp per request
+DOWNLOADS_DIR = Path("/app/data/downloads")
+
+_Nodes = List[Union[ContentBlock, InlineContent]]
+
+def _append_text(text: Optional[str], nodes: _Nodes) -> None:
+    if text:
+        text = text.strip()
+        if text:
+            nodes.append(TextNode(content=text))
+
+# Block handlers append their node with an empty content list and return it;
+# the caller fills it from the element's children
+
+def _handle_heading(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> Optional[_Nodes]:
+    content: _Nodes = []
+    nodes.append(HeadingNode(level=int(child.attrib.get('l', 0)), content=content))
+    return content
+
+def _handle_paragraph(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> Optional[_Nodes]:
+    s_tag = child.find(_LABEL_TAG)
+    label = s_tag.text.strip() if s_tag is not None and s_tag.text else None
+    if meta is not None:
+        _record_metadata(child, meta)
+    content: _Nodes = []
+    nodes.append(ParagraphNode(semantic_label=label, content=content))
+    return content
+
+def _handle_div(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> Optional[_Nodes]:
+    content: _Nodes = []
+    nodes.append(DivNode(content=content))
+    return content
+
+def _handle_quote(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> Optional[_Nodes]:
+    content: _Nodes = []
+    nodes.append(QuoteNode(content=content))
+    return content
+
+def _handle_raw(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> Optional[_Nodes]:
+    text = child.text and child.text.strip()
+    if text:
+        nodes.append(RawHtmlNode(content=text))
+    return None
+
+def _handle_emphasis(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> Optional[_Nodes]:
+    text = child.text and child.text.strip()
+    if text:
+        nodes.append(EmphasisNode(content=text))
+    return None
+
+def _handle_structural(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> Optional[_Nodes]:
+    nodes.append(StructuralNode(element_type=child.attrib.get('t', 'Unknown')))
+    return None
+
+# Node builders by tag; <S> labels and unknown tags produce no node
+_HANDLERS: Dict[str, Callable[[ET.Element, _Nodes, Optional[Dict[str, str]]], Optional[_Nodes]]] = {
+    _TAG_H: _handle_heading,
+    _TAG_P: _handle_paragraph,
+    _TAG_DIV: _handle_div,
+    _TAG_Q: _handle_quote,
+    _TAG_RAW_BLOCK: _handle_raw,
+    _TAG_RAW: _handle_raw,
+    _TAG_E: _handle_emphasis,
+    _TAG_U: _handle_structural,
+}
+
+# Tags whose children are converted (and so walked for metadata) recursively
+_RECURSIVE_TAGS = frozenset({_TAG_H, _TAG_P, _TAG_DIV, _TAG_Q})
+
+def _convert_child(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> Optional[_Nodes]:
+    """Append the node for one child and its tail text, without its content
+
+    Returns the content list the child's own text and children belong in, for
+    block tags, or None.
+    """
+    tag = child.tag
+    handler = _HANDLERS.get(tag)
+    content = handler(child, nodes, meta) if handler is not None else None
+
+    # Content of the other tags is not converted, but metadata paragraphs
+    # nested in them still count
+    if meta is not None and tag not in _RECURSIVE_TAGS:
+        for p_tag in child.iter(_TAG_P):
+            _record_metadata(p_tag, meta)
+
+    _append_text(child.tail, nodes)
+    return content
+
+def _fill_content(element: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]]) -> None:
+    """Convert the text and children of element into nodes
+
+    Nested blocks are walked with an explicit stack of child iterators, in
+    document order, so deep nesting does not run into the recursion limit.
+    """
+    _append_text(element.text, nodes)
+    stack = []
+    children = iter(element)
+    while True:
+        for child in children:
+            content = _convert_child(child, nodes, meta)
+            if content is not None:
+                stack.append((children, nodes))
+                children, nodes = iter(child), content
+                _append_text(child.text, nodes)
+                break
+        else:
+            if not stack:
+                return
+            children, nodes = stack.pop()
+
+def _parse_child(child: ET.Element, nodes: _Nodes, meta: Optional[Dict[str, str]] = None) -> None:
+    """Append the nodes for one child element, followed by its tail text
+
+    When ``meta`` is given, labelled <P> metadata found in the child's subtree
+    is recorded in it during the same walk.
+    """
+    content = _convert_child(child, nodes, meta)
+    if content is not None:
+        _fill_content(child, content, meta)
+
+def parse_element(
+    element: ET.Element, meta: Optional[Dict[str, str]] = None
+) -> List[Union[ContentBlock, InlineContent]]:
     nodes = []
-    if element.text and element.text.strip():
-        nodes.append(TextNode(content=element.text.strip()))
-
-    for child in element:
-        tag = child.tag
-        if tag == "H":
-            nodes.append(HeadingNode(
-                level=int(child.attrib.get('l', 0)),
-                content=parse_element(child)
-            ))
-        elif tag == "P":
-            s_tag = child.find('S')
-            label = s_tag.text.strip() if s_tag is not None and s_tag.text else None
-            nodes.append(ParagraphNode(
-                semantic_label=label,
-                content=parse_element(child)
-            ))
-        elif tag == "DIV":
-            nodes.append(DivNode(content=parse_element(child)))
-        elif tag == "Q":
-            nodes.append(QuoteNode(content=parse_element(child)))
-        elif tag in ("RawBlock", "Raw"):
-             if child.text and child.text.strip():
-                nodes.append(RawHtmlNode(content=child.text.strip()))
-        elif tag == "E":
-            if child.text and child.text.strip():
-                nodes.append(EmphasisNode(content=child.text.strip()))
-        elif tag == "U":
-            nodes.append(StructuralNode(element_type=child.attrib.get('t', 'Unknown')))
-        elif tag == "S": 
-            pass
-            
-        if child.tail and child.tail.strip():
-            nodes.append(TextNode(content=child.tail.strip()))
+    _fill_content(element, nodes, meta)
     return nodes
 
+def _itertext_without(element: ET.Element, skip: ET.Element) -> Iterator[str]:
+    """Like element.itertext(), but without the own text of ``skip``
+
+    Walked with an explicit stack, like _fill_content; each entry holds the
+    tail text to emit once that element's subtree is done.
+    """
+    if not isinstance(element.tag, str):
+        return
+    if element.text and element is not skip:
+        yield element.text
+    stack = [(iter(element), None)]
+    while stack:
+        children, tail = stack[-1]
+        for child in children:
+            if isinstance(child.tag, str):
+                if child.text and child is not skip:
+                    yield child.text
+                stack.append((iter(child), child.tail))
+                break
+            if child.tail:
+                yield child.tail
+        else:
+            stack.pop()
+            if tail:
+                yield tail
+
+def _record_metadata(p_tag: ET.Element, meta: Dict[str, str]) -> None:
+    """Store the value of a <P> labelled by an <S> child under that label"""
+    label_tag = p_tag.find(_LABEL_TAG)
+    if label_tag is None or not label_tag.text:
+        return
+    label = label_tag.text.strip().lower().replace(' ', '_')
+    content = "".join(_itertext_without(p_tag, label_tag)).strip()
+    if ':' in content:
+        content = content.split(':', 1)[1].strip()
+    meta[label] = content
+
 def extract_metadata(root: ET.Element) -> DocumentMetadata:
     meta = {}
-    for p_tag in root.findall('.//P[S]'):
-        label_tag = p_tag.find('S')
-        if label_tag is not None and label_tag.text:
-            label = label_tag.text.strip().lower().replace(' ', '_')
-            content = "".join(p_tag.itertext()).replace(label_tag.text, "").strip()
-            if ':' in content:
-                content = content.split(':', 1)[1].strip()
-            meta[label] = content
+    for p_tag in _find_meta_paragraphs(root):
+        _record_metadata(p_tag, meta)
     return DocumentMetadata(**meta)
 
-def create_structured_dataset(xml_content: str) -> PrincipiaDocument:
-    root = ET.fromstring(xml_content)
-    body_element = root.find('B')
-    if body_element is None:
+def create_structured_dataset(xml_content: Union[str, bytes]) -> PrincipiaDocument:
+    # lxml rejects str input that carries an encoding declaration
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode("utf-8")
+    return create_structured_dataset_from_stream(io.BytesIO(xml_content))
+
+def create_structured_dataset_from_stream(source: BinaryIO) -> PrincipiaDocument:
+    """
+    Build the document with iterparse instead of holding the whole tree.
+
+    Each direct child of <B> is converted, collecting metadata paragraphs in
+    the same walk, and removed from the tree before the next one is parsed. A child's tail
+    text is only complete once the parser moves on, so a child is handled
+    when its next sibling starts or when <B> ends.
+    """
+    meta: Dict[str, str] = {}
+    body_nodes: List[Union[ContentBlock, InlineContent]] = []
+    body = None
+    in_body = False
+    body_text_done = False
+    pending = None
+    depth = 0
+
+    def flush() -> None:
+        nonlocal body_text_done, pending
+        if not body_text_done:
+            if body.text and body.text.strip():
+                body_nodes.append(TextNode(content=body.text.strip()))
+            body_text_done = True
+        if pending is None:
+            return
+        _parse_child(pending, body_nodes, meta)
+        body.remove(pending)
+        pending = None
+
+    for event, elem in ET.iterparse(source, events=("start", "end"), **_ITERPARSE_OPTIONS):
+        if event == "start":
+            depth += 1
+            if depth == 2 and body is None and elem.tag == _TAG_B:
+                body = elem
+                in_body = True
+            elif depth == 3 and in_body:
+                flush()
+            continue
+
+        if depth == 3 and in_body:
+            pending = elem
+        elif depth == 2:
+            if elem is body:
+                flush()
+                in_body = False
+            # Nothing outside the first <B> is converted
+            elem.clear()
+        depth -= 1
+
+    if body is None:
         raise ValueError("Could not find the main <B> content block in the XML.")
-    metadata = extract_metadata(body_element)
-    parsed_body = parse_element(body_element)
-    return PrincipiaDocument(metadata=metadata, body=parsed_body)
+    return PrincipiaDocument(metadata=DocumentMetadata(**meta), body=body_nodes)
+
+
+def _dumps_indented(value: Any, indent: int) -> bytes:
+    """Two-space indented JSON for value, nested ``indent`` spaces deep"""
+    if ORJSON_AVAILABLE:
+        # orjson serializes the node dataclasses natively
+        output = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    else:
+        if dataclasses.is_dataclass(value):
+            value = dataclasses.asdict(value)
+        output = json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+    # Newlines inside JSON strings are escaped, so every raw one starts a line
+    return output.replace(b"\n", b"\n" + b" " * indent)
+
+def write_document_json(document: PrincipiaDocument, f: BinaryIO) -> None:
+    """
+    Write the document as two-space indented JSON, one body node at a time.
+
+    The bytes match dumping the whole document at once, but neither the
+    full JSON text nor a dict copy of the node tree is held in memory.
+    """
+    f.write(b'{\n  "metadata": ')
+    f.write(_dumps_indented(document.metadata.model_dump(), 2))
+    if not document.body:
+        f.write(b',\n  "body": []\n}')
+        return
+    f.write(b',\n  "body": [')
+    separator = b"\n    "
+    for node in document.body:
+        f.write(separator)
+        f.write(_dumps_indented(node, 4))
+        separator = b",\n    "
+    f.write(b"\n  ]\n}")
 
 
 class XmlToJsonResponse(BasePluginResponse):
@@ -102,25 +351,33 @@ class Plugin(BasePlugin):
         """Return the Pydantic model for this plugin's response"""
         return XmlToJsonResponse
     
-    def execute(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def execute(self, data: Dict[str, Any]) -> XmlToJsonResponse:
         file_info = data.get("input_file")
         if not file_info:
             raise ValueError("Missing XML file input")
 
-        xml_content = file_info["content"].decode("utf-8")
-        structured_doc = create_structured_dataset(xml_content)
-        
-        json_output = structured_doc.model_dump_json(indent=2)
+        if "temp_path" in file_info:
+            # Streamed upload: parse straight from disk, so the document is
+            # never held in memory, then drop the spooled file
+            temp_input_path = Path(file_info["temp_path"])
+            try:
+                with open(temp_input_path, "rb") as source:
+                    structured_doc = create_structured_dataset_from_stream(source)
+            finally:
+                temp_input_path.unlink(missing_ok=True)
+        elif "content" in file_info:
+            # Raw bytes let the parser honour the document's encoding declaration
+            structured_doc = create_structured_dataset(file_info["content"])
+        else:
+            raise ValueError("Input file data is missing. 'input_file' must contain either 'temp_path' or 'content'.")
         
-        temp_dir = tempfile.mkdtemp()
         input_filename = Path(file_info["filename"])
         output_filename = f"{input_filename.stem}.json"
-        output_path = Path(temp_dir) / output_filename
+        output_path = DOWNLOADS_DIR / f"{input_filename.stem}_{uuid4().hex[:8]}.json"
+        DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(json_output)
+        with open(output_path, "wb") as f:
+            write_document_json(structured_doc, f)
             
-        return {
-            "file_path": str(output_path),
-            "file_name": output_filename
-        } 
+        # Returning the model itself lets run() skip validating a dict copy
+        return XmlToJsonResponse(file_path=str(output_path), file_name=output_filename) 
@@ -0,0 +1,57 @@
+import errno
+import os
+import shutil
+from pathlib import Path
+
+COPY_BUFFER_SIZE = 1 << 20  # 1MB, for the user-space copy fallback
+COPY_RANGE_SIZE = 1 << 30  # Bytes requested per copy_file_range call
+
+# copy_file_range(2) errors that mean "not supported here" rather than a failed copy
+_COPY_RANGE_UNSUPPORTED = frozenset((errno.ENOSYS, errno.EINVAL, errno.EXDEV, errno.EOPNOTSUPP))
+
+
+def move_file(src: Path, dst: Path) -> int:
+    """
+    Move src to dst and return the size of the moved file.
+
+    Renames when both paths share a filesystem. Across devices the data is
+    copied in kernel space with copy_file_range(2) (or reflinked on capable
+    filesystems), falling back to a buffered copy where that is unsupported.
+    src is unlinked only once dst is complete; a failed copy removes dst.
+    """
+    try:
+        os.rename(src, dst)
+        return os.stat(dst).st_size
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            _copy_file(src_file, dst_file)
+            size = dst_file.tell()
+    except BaseException:
+        try:
+            os.unlink(dst)
+        except FileNotFoundError:
+            pass
+        raise
+    os.unlink(src)
+    return size
+
+
+def _copy_file(src_file, dst_file):
+    """Copy all of src_file into dst_file, preferring copy_file_range(2)"""
+    try:
+        while os.copy_file_range(src_file.fileno(), dst_file.fileno(), COPY_RANGE_SIZE):
+            pass
+    except (AttributeError, OSError) as e:
+        if isinstance(e, OSError) and e.errno not in _COPY_RANGE_UNSUPPORTED:
+            raise
+        # Not supported here; restart with a plain buffered copy
+        src_file.seek(0)
+        dst_file.seek(0)
+        dst_file.truncate()
+    # copy_file_range may stop short of EOF on some filesystems; finish from
+    # the offsets it advanced on both files (a no-op when it copied everything)
+    shutil.copyfileobj(src_file, dst_file, COPY_BUFFER_SIZE)
@@ -15,22 +15,35 @@ from app.core.plugin_manager import PluginManager
 from app.core.chain_manager import ChainManager
 
 
-@pytest.fixture
-def client():
-    """FastAPI test client"""
-    # Disable auth for tests
+@pytest.fixture(scope="session", autouse=True)
+def test_settings():
+    """Disable auth and rate limiting for the whole test session"""
     settings.enable_auth = False
     settings.rate_limit_enabled = False
+
+
+# App startup and plugin discovery are the slowest setup steps, so the client
+# and managers are built once per session. Tests that change server state
+# must undo it themselves.
+@pytest.fixture(scope="session")
+def client(test_settings):
+    """FastAPI test client"""
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def plugin_manager():
     """Plugin manager instance"""
     return PluginManager()
 
 
 @pytest.fixture
+def fresh_plugin_manager():
+    """Plugin manager private to one test, for tests that refresh or mutate it"""
+    return PluginManager()
+
+
+@pytest.fixture(scope="session")
 def chain_manager(plugin_manager):
     """Chain manager instance"""
     return ChainManager(plugin_manager)
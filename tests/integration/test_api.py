@@ -1,8 +1,12 @@
 """
 Integration tests for API endpoints
 """
+import tempfile
+
 import pytest
 
+from app.core.config import settings
+
 
 class TestAPIEndpoints:
     """Test suite for API endpoints"""
@@ -90,6 +94,63 @@ class TestAPIEndpoints:
         assert "chains" in data
 
 
+class TestExecuteBatchEndpoint:
+    """Test suite for the batch execution endpoint"""
+
+    @pytest.fixture
+    def upload_dir(self, monkeypatch, tmp_path):
+        """Spool uploads into a private directory so leftovers can be seen"""
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        return tmp_path
+
+    def test_unknown_plugin_fails_every_file_and_removes_uploads(self, client, upload_dir):
+        response = client.post(
+            "/api/plugin/nonexistent/execute-batch",
+            files=[("input_files", ("a.md", b"# A")), ("input_files", ("b.md", b"# B"))]
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["success"] is False
+        assert len(data["results"]) == 2
+        assert all("not found" in result["error"] for result in data["results"])
+        assert list(upload_dir.iterdir()) == []
+
+    def test_rejected_files_are_removed(self, client, upload_dir):
+        response = client.post(
+            "/api/plugin/pandoc_converter/execute-batch",
+            data={"output_format": "html5"},
+            files=[("input_files", ("notes.exe", b"binary")), ("input_files", ("tool.exe", b"binary"))]
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["success"] is False
+        assert all("Invalid file type" in result["error"] for result in data["results"])
+        assert list(upload_dir.iterdir()) == []
+
+    def test_too_many_files_is_rejected(self, client, upload_dir, monkeypatch):
+        monkeypatch.setattr(settings, "max_batch_files", 2)
+        response = client.post(
+            "/api/plugin/pandoc_converter/execute-batch",
+            files=[("input_files", (f"{name}.md", b"# Text")) for name in "abc"]
+        )
+
+        assert response.status_code == 413
+        assert "at most 2 files" in response.json()["detail"]
+        assert list(upload_dir.iterdir()) == []
+
+    def test_oversized_file_is_rejected_and_earlier_uploads_removed(self, client, upload_dir, monkeypatch):
+        monkeypatch.setattr(settings, "max_upload_size_bytes", 16)
+        response = client.post(
+            "/api/plugin/pandoc_converter/execute-batch",
+            files=[("input_files", ("small.md", b"# Small")), ("input_files", ("large.md", b"#" * 64))]
+        )
+
+        assert response.status_code == 413
+        assert list(upload_dir.iterdir()) == []
+
+
 class TestAuthenticationEndpoints:
     """Test suite for authentication endpoints"""
 
@@ -0,0 +1,56 @@
+"""
+Chain definition builders shared by the chain unit tests
+"""
+from app.models.chain import ChainDefinition, ChainNode, ChainConnection, ChainNodeType
+
+
+def make_node(node_id, plugin_id="text_stat", node_type=ChainNodeType.PLUGIN, x=0):
+    """Chain node at (x, 0) with an empty config"""
+    return ChainNode(
+        id=node_id,
+        type=node_type,
+        plugin_id=plugin_id if node_type == ChainNodeType.PLUGIN else None,
+        position={"x": x, "y": 0},
+        config={}
+    )
+
+
+def make_connections(*edges):
+    """Connections conn1, conn2, ... for (source, target) node id pairs"""
+    return [
+        ChainConnection(id=f"conn{i}", source_node_id=source, target_node_id=target)
+        for i, (source, target) in enumerate(edges, start=1)
+    ]
+
+
+def make_chain(nodes=(), connections=()):
+    """Chain definition with the usual test id and name"""
+    return ChainDefinition(
+        id="test-chain",
+        name="Test Chain",
+        description="",
+        nodes=list(nodes),
+        connections=list(connections)
+    )
+
+
+def make_single_node_chain(plugin_id="text_stat"):
+    """Chain with one plugin node, node1"""
+    return make_chain([make_node("node1", plugin_id)])
+
+
+def make_linear_chain(n, plugin_id="text_stat"):
+    """Chain node1 -> node2 -> ... -> node<n>"""
+    node_ids = [f"node{i}" for i in range(1, n + 1)]
+    return make_chain(
+        [make_node(node_id, plugin_id, x=i) for i, node_id in enumerate(node_ids)],
+        make_connections(*zip(node_ids, node_ids[1:]))
+    )
+
+
+def make_cycle_chain():
+    """Two plugin nodes depending on each other"""
+    return make_chain(
+        [make_node("node1"), make_node("node2", x=1)],
+        make_connections(("node1", "node2"), ("node2", "node1"))
+    )
@@ -4,7 +4,7 @@ Unit tests for AI Optimizer
 import pytest
 from datetime import datetime
 from app.ai.chain_optimizer import ChainOptimizer
-from app.ai.execution_history import ExecutionHistoryManager, ExecutionRecord
+from app.ai.execution_history import ExecutionHistoryManager, ExecutionRecord, InMemoryHistoryStore
 from app.models.chain import ChainDefinition, ChainNode, ChainConnection, ChainNodeType
 
 
@@ -151,6 +151,12 @@ class TestChainOptimizer:
         assert len(similar) == 0
 
 
+@pytest.fixture
+def history_manager():
+    """History manager backed by memory instead of a JSON Lines file"""
+    return ExecutionHistoryManager(store=InMemoryHistoryStore())
+
+
 class TestExecutionHistory:
     """Test suite for ExecutionHistoryManager"""
 
@@ -160,10 +166,49 @@ class TestExecutionHistory:
         assert manager is not None
         assert manager.history_file.exists()
 
-    def test_record_and_retrieve_execution(self, tmp_path):
-        """Test recording and retrieving execution"""
+    def test_in_memory_manager_has_the_same_attributes(self, tmp_path):
+        """Test the backend does not change the manager's public attributes"""
+        manager = ExecutionHistoryManager(data_dir=str(tmp_path / "history"), store=InMemoryHistoryStore())
+
+        assert manager.data_dir == tmp_path / "history"
+        assert manager.history_file == tmp_path / "history" / "executions.jsonl"
+        assert not manager.data_dir.exists()
+
+    def test_cached_records_cannot_be_reassigned(self, tmp_path):
+        """Test records shared with the file store's cache are read-only"""
         manager = ExecutionHistoryManager(data_dir=str(tmp_path))
+        manager.record_execution(ExecutionRecord(
+            id="exec-0",
+            chain_id="test-chain",
+            timestamp=datetime.now(),
+            duration_seconds=1.0,
+            success=True
+        ))
+        record = manager.get_all_executions()[0]
+
+        with pytest.raises((TypeError, ValueError)):
+            record.success = False
+        assert manager.get_all_executions()[0].success is True
+
+    def test_file_history_persists_across_managers(self, tmp_path):
+        """Test records written by one manager are read back by another"""
+        writer = ExecutionHistoryManager(data_dir=str(tmp_path))
+        reader = ExecutionHistoryManager(data_dir=str(tmp_path))
+
+        for i in range(2):
+            writer.record_execution(ExecutionRecord(
+                id=f"exec-{i}",
+                chain_id="test-chain",
+                timestamp=datetime.now(),
+                duration_seconds=1.0,
+                success=True
+            ))
+            assert [r.id for r in reader.get_all_executions()][0] == f"exec-{i}"
+
+        assert [r.id for r in writer.get_all_executions()] == ["exec-1", "exec-0"]
 
+    def test_record_and_retrieve_execution(self, history_manager):
+        """Test recording and retrieving execution"""
         record = ExecutionRecord(
             id="test-exec-1",
             chain_id="test-chain",
@@ -176,17 +221,15 @@ class TestExecutionHistory:
             node_plugins={"node1": "text_stat"}
         )
 
-        manager.record_execution(record)
+        history_manager.record_execution(record)
 
         # Retrieve all executions
-        executions = manager.get_all_executions()
+        executions = history_manager.get_all_executions()
         assert len(executions) == 1
         assert executions[0].id == "test-exec-1"
 
-    def test_get_executions_for_chain(self, tmp_path):
+    def test_get_executions_for_chain(self, history_manager):
         """Test filtering executions by chain"""
-        manager = ExecutionHistoryManager(data_dir=str(tmp_path))
-
         # Record for chain A
         record1 = ExecutionRecord(
             id="exec-1",
@@ -207,18 +250,16 @@ class TestExecutionHistory:
             plugins_used=["pandoc_converter"]
         )
 
-        manager.record_execution(record1)
-        manager.record_execution(record2)
+        history_manager.record_execution(record1)
+        history_manager.record_execution(record2)
 
         # Get executions for chain A
-        chain_a_execs = manager.get_executions_for_chain("chain-a")
+        chain_a_execs = history_manager.get_executions_for_chain("chain-a")
         assert len(chain_a_execs) == 1
         assert chain_a_execs[0].chain_id == "chain-a"
 
-    def test_get_plugin_performance(self, tmp_path):
+    def test_get_plugin_performance(self, history_manager):
         """Test getting plugin performance stats"""
-        manager = ExecutionHistoryManager(data_dir=str(tmp_path))
-
         # Record execution with plugin
         record = ExecutionRecord(
             id="exec-1",
@@ -231,19 +272,17 @@ class TestExecutionHistory:
             node_plugins={"node1": "text_stat"}
         )
 
-        manager.record_execution(record)
+        history_manager.record_execution(record)
 
         # Get performance
-        perf = manager.get_plugin_performance("text_stat")
+        perf = history_manager.get_plugin_performance("text_stat")
 
         assert perf["total_executions"] == 1
         assert perf["success_rate"] == 1.0
         assert perf["average_duration"] == 2.5
 
-    def test_get_average_duration(self, tmp_path):
+    def test_get_average_duration(self, history_manager):
         """Test calculating average duration"""
-        manager = ExecutionHistoryManager(data_dir=str(tmp_path))
-
         # Record multiple executions
         for i in range(3):
             record = ExecutionRecord(
@@ -254,15 +293,13 @@ class TestExecutionHistory:
                 success=True,
                 plugins_used=["text_stat"]
             )
-            manager.record_execution(record)
+            history_manager.record_execution(record)
 
-        avg = manager.get_average_duration()
+        avg = history_manager.get_average_duration()
         assert avg == 2.0  # (1 + 2 + 3) / 3
 
-    def test_plugin_duration_extraction_backward_compat(self, tmp_path):
+    def test_plugin_duration_extraction_backward_compat(self, history_manager):
         """Test extracting plugin durations from legacy records without node plugin map."""
-        manager = ExecutionHistoryManager(data_dir=str(tmp_path))
-
         record = ExecutionRecord(
             id="exec-legacy",
             chain_id="test-chain",
@@ -273,5 +310,5 @@ class TestExecutionHistory:
             node_durations={"node-abc": 1.2}
         )
 
-        durations = manager.get_plugin_durations_from_record(record, "text_stat")
+        durations = history_manager.get_plugin_durations_from_record(record, "text_stat")
         assert durations == [1.2]
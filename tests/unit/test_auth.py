@@ -4,6 +4,8 @@ Unit tests for Authentication
 import pytest
 from datetime import timedelta
 from jose import jwt
+from passlib.context import CryptContext
+from app.core import auth
 from app.core.auth import (
     verify_password, get_password_hash, authenticate_user,
     create_access_token, get_user
@@ -11,9 +13,29 @@ from app.core.auth import (
 from app.core.config import settings
 
 
+@pytest.fixture(autouse=True)
+def plaintext_passwords(request, monkeypatch):
+    """Skip bcrypt's key derivation outside the password hashing test
+
+    Stored hashes are swapped for their plaintext so the cheap scheme can
+    verify them; the get_user cache is cleared around the swap.
+    """
+    if request.node.get_closest_marker("real_bcrypt"):
+        yield
+        return
+    monkeypatch.setattr(auth, "pwd_context", CryptContext(schemes=["plaintext"], deprecated="auto"))
+    for username, user in auth.fake_users_db.items():
+        monkeypatch.setitem(auth.fake_users_db, username, {**user, "hashed_password": "secret"})
+    get_user.cache_clear()
+    yield
+    monkeypatch.undo()
+    get_user.cache_clear()
+
+
 class TestAuthentication:
     """Test suite for Authentication"""
 
+    @pytest.mark.real_bcrypt
     def test_password_hashing(self):
         """Test password hashing and verification"""
         password = "testpassword123"
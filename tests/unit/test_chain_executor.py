@@ -1,9 +1,16 @@
 """
 Unit tests for Chain Executor
 """
+import asyncio
+import json
+
 import pytest
 from app.core.chain_executor import ChainExecutor, ChainValidator
-from app.models.chain import ChainDefinition, ChainNode, ChainConnection, ChainNodeType
+from app.core.chain_storage import ChainFileStorage
+from app.models.chain import ChainNodeType, ValidationErrorCode
+from tests.unit._chain_factories import (
+    make_chain, make_connections, make_cycle_chain, make_linear_chain, make_node, make_single_node_chain
+)
 
 
 class TestChainValidator:
@@ -12,86 +19,83 @@ class TestChainValidator:
     def test_validate_empty_chain(self, plugin_manager):
         """Test validating an empty chain"""
         validator = ChainValidator(plugin_manager)
-        chain = ChainDefinition(
-            id="test-chain",
-            name="Test Chain",
-            description="",
-            nodes=[],
-            connections=[]
-        )
-        result = validator.validate_chain(chain)
+        result = validator.validate_chain(make_chain())
 
-        assert result.is_valid == False
-        assert "at least one node" in " ".join(result.errors).lower()
+        assert not result
+        assert ValidationErrorCode.EMPTY_CHAIN in result.error_codes
 
     def test_validate_single_node_chain(self, plugin_manager):
         """Test validating a chain with a single node"""
         validator = ChainValidator(plugin_manager)
-        chain = ChainDefinition(
-            id="test-chain",
-            name="Test Chain",
-            description="",
-            nodes=[
-                ChainNode(
-                    id="node1",
-                    type=ChainNodeType.PLUGIN,
-                    plugin_id="text_stat",
-                    position={"x": 0, "y": 0},
-                    config={}
-                )
-            ],
-            connections=[]
-        )
-        result = validator.validate_chain(chain)
+        result = validator.validate_chain(make_single_node_chain())
 
-        assert result.is_valid == True
+        assert result
         assert len(result.errors) == 0
+        assert result.adjacency == {}
+        assert result.in_degree == {"node1": 0}
 
     def test_validate_chain_with_missing_plugin(self, plugin_manager):
         """Test validating a chain with a missing plugin"""
         validator = ChainValidator(plugin_manager)
-        chain = ChainDefinition(
-            id="test-chain",
-            name="Test Chain",
-            description="",
-            nodes=[
-                ChainNode(
-                    id="node1",
-                    type=ChainNodeType.PLUGIN,
-                    plugin_id="nonexistent_plugin",
-                    position={"x": 0, "y": 0},
-                    config={}
-                )
-            ],
-            connections=[]
-        )
-        result = validator.validate_chain(chain)
+        result = validator.validate_chain(make_single_node_chain("nonexistent_plugin"))
 
-        assert result.is_valid == False
-        assert "nonexistent_plugin" in " ".join(result.errors)
-        assert len(result.missing_plugins) == 1
+        assert not result
+        assert result.error_codes == [ValidationErrorCode.PLUGIN_NOT_FOUND]
+        assert result.missing_plugins == {"nonexistent_plugin"}
 
     def test_detect_circular_dependency(self, plugin_manager):
         """Test detecting circular dependencies in chains"""
         validator = ChainValidator(plugin_manager)
-        chain = ChainDefinition(
-            id="test-chain",
-            name="Test Chain",
-            description="",
-            nodes=[
-                ChainNode(id="node1", type=ChainNodeType.PLUGIN, plugin_id="text_stat", position={"x": 0, "y": 0}, config={}),
-                ChainNode(id="node2", type=ChainNodeType.PLUGIN, plugin_id="text_stat", position={"x": 1, "y": 0}, config={})
-            ],
-            connections=[
-                ChainConnection(id="conn1", source_node_id="node1", target_node_id="node2"),
-                ChainConnection(id="conn2", source_node_id="node2", target_node_id="node1")  # Creates cycle
-            ]
-        )
-        result = validator.validate_chain(chain)
+        result = validator.validate_chain(make_cycle_chain())
+
+        assert not result
+        assert result.cycle_detected is True
+        assert ValidationErrorCode.CIRCULAR_DEPENDENCY in result.error_codes
+        assert result.cycle_path == ["node1", "node2", "node1"]
 
-        assert result.is_valid == False
-        assert result.cycle_detected == True
-        assert "circular" in " ".join(result.errors).lower()
+    def test_validation_cached_until_plugins_change(self, plugin_manager, monkeypatch):
+        """Test repeated validation of one structure reuses the cached result"""
+        validator = ChainValidator(plugin_manager)
+        chain = make_single_node_chain()
+        calls = []
+        validate = validator._validate_chain
+        monkeypatch.setattr(validator, "_validate_chain", lambda c: calls.append(c.id) or validate(c))
+
+        first = validator.validate_chain(chain)
+        second = validator.validate_chain(chain)
+        assert first == second
+        assert first is not second
+        assert len(calls) == 1
+
+        # A plugin refresh bumps the generation and invalidates cached results
+        monkeypatch.setattr(plugin_manager, "generation", plugin_manager.generation + 1)
+        validator.validate_chain(chain)
+        assert len(calls) == 2
+
+    def test_nodes_and_connections_are_frozen(self):
+        """Test chain nodes and connections are immutable and hashable"""
+        node = make_node("node1")
+        conn, = make_connections(("node1", "node2"))
+
+        with pytest.raises(Exception):
+            node.plugin_id = "other"
+        assert node in {node}
+        assert conn in {conn}
+
+    def test_plugin_lookups_cached_per_generation(self, plugin_manager, monkeypatch):
+        """Test each plugin is looked up once per plugin set generation"""
+        validator = ChainValidator(plugin_manager)
+        chain = make_chain([make_node(f"node{i}") for i in range(3)])
+        lookups = []
+        get_plugin = plugin_manager.get_plugin
+        monkeypatch.setattr(plugin_manager, "get_plugin", lambda plugin_id: lookups.append(plugin_id) or get_plugin(plugin_id))
+
+        assert validator.validate_chain(chain)
+        assert lookups == ["text_stat"]
+
+        monkeypatch.setattr(plugin_manager, "generation", plugin_manager.generation + 1)
+        assert validator.validate_chain(chain)
+        assert lookups == ["text_stat", "text_stat"]
 
 
 class TestChainExecutor:
@@ -101,47 +105,38 @@ class TestChainExecutor:
     async def test_execute_single_node_chain(self, plugin_manager, sample_text):
         """Test executing a chain with a single plugin node"""
         executor = ChainExecutor(plugin_manager)
-        chain = ChainDefinition(
-            id="test-chain",
-            name="Test Chain",
-            description="",
-            nodes=[
-                ChainNode(
-                    id="node1",
-                    type=ChainNodeType.PLUGIN,
-                    plugin_id="text_stat",
-                    position={"x": 0, "y": 0},
-                    config={}
-                )
-            ],
-            connections=[]
-        )
-
-        result = await executor.execute_chain(chain, {"text": sample_text})
+        result = await executor.execute_chain(make_single_node_chain(), {"text": sample_text})
 
-        assert result.success == True
+        assert result
         assert result.error is None
         assert "word_count" in result.results
         assert "node1" in result.node_execution_stats
-        assert result.node_execution_stats["node1"]["success"] == True
-        assert result.node_execution_stats["node1"]["plugin_id"] == "text_stat"
-        assert result.node_execution_stats["node1"]["duration_seconds"] >= 0.0
+        stats = result.node_execution_stats["node1"]
+        assert stats.success is True
+        assert stats.plugin_id == "text_stat"
+        assert stats.duration_ns >= 0
+        assert stats.duration_seconds == stats.duration_ns / 1e9
+
+    @pytest.mark.asyncio
+    async def test_executors_share_injected_validator(self, plugin_manager, sample_text, monkeypatch):
+        """Test executors given one validator reuse its cached results"""
+        validator = ChainValidator(plugin_manager)
+        calls = []
+        validate = validator._validate_chain
+        monkeypatch.setattr(validator, "_validate_chain", lambda c: calls.append(c.id) or validate(c))
+
+        for executor in (ChainExecutor(plugin_manager, validator), ChainExecutor(plugin_manager, validator)):
+            assert executor.validator is validator
+            assert await executor.execute_chain(make_single_node_chain(), {"text": sample_text})
+        assert len(calls) == 1
 
     @pytest.mark.asyncio
     async def test_execute_invalid_chain(self, plugin_manager):
         """Test executing an invalid chain"""
         executor = ChainExecutor(plugin_manager)
-        chain = ChainDefinition(
-            id="test-chain",
-            name="Test Chain",
-            description="",
-            nodes=[],
-            connections=[]
-        )
-
-        result = await executor.execute_chain(chain, {})
+        result = await executor.execute_chain(make_chain(), {})
 
-        assert result.success == False
+        assert not result
         assert result.error is not None
         assert "validation failed" in result.error.lower()
 
@@ -149,53 +144,94 @@ class TestChainExecutor:
     async def test_build_execution_graph(self, plugin_manager):
         """Test building execution graph with topological sort"""
         executor = ChainExecutor(plugin_manager)
-        chain = ChainDefinition(
-            id="test-chain",
-            name="Test Chain",
-            description="",
-            nodes=[
-                ChainNode(id="node1", type=ChainNodeType.PLUGIN, plugin_id="text_stat", position={"x": 0, "y": 0}, config={}),
-                ChainNode(id="node2", type=ChainNodeType.PLUGIN, plugin_id="text_stat", position={"x": 1, "y": 0}, config={}),
-                ChainNode(id="node3", type=ChainNodeType.PLUGIN, plugin_id="text_stat", position={"x": 2, "y": 0}, config={})
-            ],
-            connections=[
-                ChainConnection(id="conn1", source_node_id="node1", target_node_id="node2"),
-                ChainConnection(id="conn2", source_node_id="node2", target_node_id="node3")
-            ]
-        )
+        chain = make_linear_chain(3)
 
         execution_graph = executor._build_execution_graph(chain)
 
-        # Should have 3 batches (sequential execution)
-        assert len(execution_graph) == 3
-        assert execution_graph[0][0].id == "node1"
-        assert execution_graph[1][0].id == "node2"
-        assert execution_graph[2][0].id == "node3"
+        # Only the head of the chain starts ready; each successor waits on one dependency
+        assert execution_graph.ready == ["node1"]
+        assert execution_graph.in_degree == {"node1": 0, "node2": 1, "node3": 1}
+        assert execution_graph.successors["node1"] == ["node2"]
+        assert execution_graph.successors["node2"] == ["node3"]
+        assert execution_graph.successors["node3"] == []
+
+        # A valid validation result carries the same index, so it is reused
+        validation = executor.validator.validate_chain(chain)
+        reused_graph = executor._build_execution_graph(chain, validation)
+        assert reused_graph.in_degree == execution_graph.in_degree
+        assert reused_graph.ready == ["node1"]
+        assert reused_graph.successors["node2"] == ["node3"]
 
     @pytest.mark.asyncio
-    async def test_failed_node_captures_telemetry(self, plugin_manager):
-        """Test failed node still records execution telemetry"""
+    async def test_ready_queue_does_not_wait_for_slow_siblings(self, plugin_manager):
+        """Test a node is dispatched once its own dependencies finish"""
         executor = ChainExecutor(plugin_manager)
-        chain = ChainDefinition(
-            id="test-chain",
-            name="Test Chain",
-            description="",
-            nodes=[
-                ChainNode(
-                    id="node1",
-                    type=ChainNodeType.PLUGIN,
-                    plugin_id="text_stat",
-                    position={"x": 0, "y": 0},
-                    config={}
-                )
-            ],
-            connections=[]
+        chain = make_chain(
+            [make_node(node_id, node_type=ChainNodeType.TRANSFORM) for node_id in ("fast", "slow", "after_fast")],
+            make_connections(("fast", "after_fast"))
         )
+        finished = []
 
+        async def fake_execute_node(node, context):
+            if node.id == "slow":
+                await asyncio.sleep(0.05)
+            finished.append(node.id)
+            return {}
+
+        executor._execute_node = fake_execute_node
         result = await executor.execute_chain(chain, {})
 
-        assert result.success == False
+        assert result
+        assert finished.index("after_fast") < finished.index("slow")
+        assert result.execution_graph == [["fast", "slow"], ["after_fast"]]
+
+    @pytest.mark.asyncio
+    async def test_failed_node_captures_telemetry(self, plugin_manager):
+        """Test failed node still records execution telemetry"""
+        executor = ChainExecutor(plugin_manager)
+        result = await executor.execute_chain(make_single_node_chain(), {})
+
+        assert not result
         assert result.error is not None
         assert "node1" in result.node_execution_stats
-        assert result.node_execution_stats["node1"]["success"] == False
-        assert result.node_execution_stats["node1"]["duration_seconds"] >= 0.0
+        stats = result.node_execution_stats["node1"]
+        assert stats.success is False
+        assert stats.duration_ns >= 0
+        assert stats.duration_seconds == stats.duration_ns / 1e9
+
+
+class TestStoredExecutions:
+    """Test suite for loading persisted execution results"""
+
+    def test_loads_legacy_node_stats(self, tmp_path):
+        """Test executions stored with duration_seconds telemetry still load"""
+        storage = ChainFileStorage(str(tmp_path))
+        date_dir = storage.executions_dir / "2025-01-01"
+        date_dir.mkdir()
+        (date_dir / "exec-1.json").write_text(json.dumps({
+            "success": True,
+            "chain_id": "test-chain",
+            "execution_id": "exec-1",
+            "results": {},
+            "node_results": {},
+            "execution_time": 0.5,
+            "node_execution_stats": {
+                "node1": {
+                    "duration_seconds": 0.25,
+                    "success": True,
+                    "error": None,
+                    "plugin_id": "text_stat",
+                    "node_type": "plugin"
+                }
+            },
+            "started_at": "2025-01-01T00:00:00",
+            "completed_at": "2025-01-01T00:00:01"
+        }))
+
+        executions = storage.get_execution_history("test-chain")
+
+        assert len(executions) == 1
+        stats = executions[0].node_execution_stats["node1"]
+        assert stats.duration_ns == 250_000_000
+        assert stats.duration_seconds == 0.25
+        assert executions[0].model_dump()["node_execution_stats"]["node1"]["duration_seconds"] == 0.25
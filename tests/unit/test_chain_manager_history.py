@@ -1,10 +1,15 @@
 """
 Unit tests for ChainManager AI history recording.
 """
+import asyncio
+import threading
+from datetime import datetime
+
 import pytest
 
+from app.ai.execution_history import ExecutionRecord
 from app.core.chain_manager import ChainManager
-from app.models.chain import ChainDefinition, ChainNode, ChainNodeType
+from tests.unit._chain_factories import make_single_node_chain
 
 
 class TestChainManagerHistory:
@@ -14,25 +19,12 @@ class TestChainManagerHistory:
     async def test_records_node_telemetry_for_ai(self, plugin_manager, sample_text, tmp_path):
         """Node telemetry should be persisted as node durations and plugin mapping."""
         manager = ChainManager(plugin_manager, base_dir=str(tmp_path))
-        chain = ChainDefinition(
-            id="chain-test",
-            name="Telemetry Chain",
-            description="",
-            nodes=[
-                ChainNode(
-                    id="node1",
-                    type=ChainNodeType.PLUGIN,
-                    plugin_id="text_stat",
-                    position={"x": 0, "y": 0},
-                    config={}
-                )
-            ],
-            connections=[]
-        )
+        chain = make_single_node_chain()
 
         result = await manager.execute_chain_definition(chain, {"text": sample_text})
-        assert result.success == True
+        assert result
 
+        await manager.flush_history()
         records = manager.history_manager.get_all_executions(limit=1)
         assert len(records) == 1
 
@@ -40,3 +32,40 @@ class TestChainManagerHistory:
         assert record.node_plugins["node1"] == "text_stat"
         assert record.node_results["node1"] == "success"
         assert record.node_durations["node1"] >= 0.0
+
+    def test_records_synchronously_without_event_loop(self, plugin_manager, sample_text, tmp_path):
+        """Records made outside an event loop are written immediately."""
+        manager = ChainManager(plugin_manager, base_dir=str(tmp_path))
+        chain = make_single_node_chain()
+        result = asyncio.run(manager.executor.execute_chain(chain, {"text": sample_text}))
+
+        manager._record_execution_for_ai(chain, result, {"text": sample_text})
+
+        records = manager.history_manager.get_all_executions()
+        assert [record.id for record in records] == [result.execution_id]
+
+    def test_records_queued_from_several_loops_are_all_written(self, plugin_manager, tmp_path):
+        """Chains running on event loops in different threads share one history queue."""
+        manager = ChainManager(plugin_manager, base_dir=str(tmp_path))
+
+        def run_loop(thread_index):
+            async def queue_records():
+                for index in range(25):
+                    record = ExecutionRecord(
+                        id=f"{thread_index}-{index}", chain_id="chain", timestamp=datetime.now(),
+                        duration_seconds=0.1, success=True
+                    )
+                    manager._queue_history_record(record, asyncio.get_running_loop())
+                    await asyncio.sleep(0)
+                await manager.flush_history()
+            asyncio.run(queue_records())
+
+        threads = [threading.Thread(target=run_loop, args=(thread_index,)) for thread_index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        asyncio.run(manager.flush_history())
+
+        written = sorted(record.id for record in manager.history_manager.get_all_executions())
+        assert written == sorted(f"{thread_index}-{index}" for thread_index in range(4) for index in range(25))
@@ -0,0 +1,90 @@
+"""
+Unit tests for the shared file move helper.
+"""
+import errno
+import os
+
+import pytest
+
+from app.utils import files
+from app.utils.files import move_file
+
+PAYLOAD = bytes(range(256)) * 4096  # 1MB
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(PAYLOAD)
+    return src
+
+
+@pytest.fixture
+def cross_device(monkeypatch):
+    """Make every rename fail as if src and dst were on different filesystems"""
+    def rename(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+    monkeypatch.setattr(files.os, "rename", rename)
+
+
+class TestMoveFile:
+    """Test suite for move_file on one filesystem and across devices."""
+
+    def test_same_device_renames(self, source, tmp_path, monkeypatch):
+        def no_copy(*args):
+            raise AssertionError("a same-device move should not copy")
+        monkeypatch.setattr(files.os, "copy_file_range", no_copy, raising=False)
+        dst = tmp_path / "dst.bin"
+
+        assert move_file(source, dst) == len(PAYLOAD)
+        assert dst.read_bytes() == PAYLOAD
+        assert not source.exists()
+
+    def test_cross_device_copies_and_unlinks(self, source, tmp_path, cross_device):
+        dst = tmp_path / "dst.bin"
+
+        assert move_file(source, dst) == len(PAYLOAD)
+        assert dst.read_bytes() == PAYLOAD
+        assert not source.exists()
+
+    def test_cross_device_without_copy_file_range(self, source, tmp_path, cross_device, monkeypatch):
+        def unsupported(*args):
+            raise OSError(errno.ENOSYS, "Function not implemented")
+        monkeypatch.setattr(files.os, "copy_file_range", unsupported, raising=False)
+        dst = tmp_path / "dst.bin"
+
+        assert move_file(source, dst) == len(PAYLOAD)
+        assert dst.read_bytes() == PAYLOAD
+
+    @pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range is not available")
+    def test_short_copy_file_range_is_finished(self, source, tmp_path, cross_device, monkeypatch):
+        """A copy_file_range that stops early should not truncate the move."""
+        real_copy_file_range = os.copy_file_range
+        calls = []
+
+        def short_copy(src_fd, dst_fd, count):
+            calls.append(count)
+            return real_copy_file_range(src_fd, dst_fd, 1000) if len(calls) == 1 else 0
+        monkeypatch.setattr(files.os, "copy_file_range", short_copy)
+        dst = tmp_path / "dst.bin"
+
+        assert move_file(source, dst) == len(PAYLOAD)
+        assert dst.read_bytes() == PAYLOAD
+
+    def test_failed_copy_keeps_source_and_removes_partial_output(self, source, tmp_path, cross_device,
+                                                                 monkeypatch):
+        def failing(*args):
+            raise OSError(errno.ENOSPC, "No space left on device")
+        monkeypatch.setattr(files.os, "copy_file_range", failing, raising=False)
+        dst = tmp_path / "dst.bin"
+
+        with pytest.raises(OSError) as excinfo:
+            move_file(source, dst)
+
+        assert excinfo.value.errno == errno.ENOSPC
+        assert source.read_bytes() == PAYLOAD
+        assert not dst.exists()
+
+    def test_missing_source_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            move_file(tmp_path / "missing.bin", tmp_path / "dst.bin")
@@ -0,0 +1,164 @@
+"""
+Unit tests for the pandoc converter plugin.
+"""
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.plugins.pandoc_converter.plugin import Plugin
+from app.plugins.pandoc_converter.services.chunking import ChunkingService
+from app.plugins.pandoc_converter.services.pandoc_executor import PandocExecutor
+from app.plugins.pandoc_converter.services.memory import MemoryMonitor
+from app.plugins.pandoc_converter.services.text_extractor import TextExtractor
+
+requires_pandoc = pytest.mark.skipif(shutil.which("pandoc") is None, reason="pandoc is not installed")
+
+
+@pytest.fixture
+def plugin(monkeypatch, tmp_path):
+    """Pandoc plugin writing its outputs under tmp_path"""
+    plugin = Plugin()
+    monkeypatch.setattr(plugin.file_handler, "downloads_dir", tmp_path / "downloads")
+    return plugin
+
+
+def markdown_file(name, text):
+    """In-memory upload of a markdown file"""
+    return {"filename": name, "content": text.encode("utf-8")}
+
+
+@requires_pandoc
+class TestExecuteBatch:
+    """Test suite for converting several files with one option set."""
+
+    def test_returns_one_result_per_file_in_input_order(self, plugin):
+        """Each file should get its own output, in the order the files were given."""
+        names = ["notes.md", "alpha.md", "notes.md"]
+        input_files = [markdown_file(name, f"# Heading {i}\n\nBody {i}.") for i, name in enumerate(names)]
+
+        results = plugin.execute_batch({"input_files": input_files, "output_format": "html5"})
+
+        assert [r["conversion_details"]["input_file"]["filename"] for r in results] == names
+        assert len({r["file_path"] for r in results}) == 3
+        for i, result in enumerate(results):
+            assert "error" not in result
+            assert f"Body {i}." in Path(result["file_path"]).read_text()
+
+    def test_bad_file_does_not_fail_the_batch(self, plugin):
+        """A file that cannot be converted should get an error entry of its own."""
+        input_files = [
+            markdown_file("first.md", "First file."),
+            markdown_file("empty.md", ""),
+            markdown_file("last.md", "Last file."),
+        ]
+
+        results = plugin.execute_batch({"input_files": input_files, "output_format": "plain"})
+
+        assert len(results) == 3
+        assert "Input file is empty" in results[1]["error"]
+        assert results[1]["conversion_details"]["conversion_successful"] is False
+        assert Path(results[0]["file_path"]).read_text().strip() == "First file."
+        assert Path(results[2]["file_path"]).read_text().strip() == "Last file."
+
+
+class TestExtractFromPath:
+    """Test suite for text extraction through a memory map."""
+
+    HTML = (
+        "<!DOCTYPE html>\n<html><head><title>Report</title>\n"
+        "<style type=\"text/css\">p { color: red; }</style>\n"
+        "<script>var hidden = \"<p>not text</p>\";</script></head>\n"
+        "<body><!-- a comment <b>with markup</b> -->\n"
+        "<p>Fish &amp; chips &lt;3 caf&#233; &quot;quoted&quot;</p>\n"
+        "<div>  two  spaces   apart  </div><SCRIPT type=\"x\">ignored()</SCRIPT >\n"
+        "<p>last <i>line</i></p></body></html>\n"
+    )
+
+    @pytest.mark.parametrize("output_format", ["txt", "md", "html"])
+    def test_matches_buffered_parser(self, tmp_path, output_format):
+        """The mmap scan should write exactly what BeautifulSoup extraction writes."""
+        source = tmp_path / "report.html"
+        source.write_text(self.HTML, encoding="utf-8")
+        mapped_dir, buffered_dir = tmp_path / "mapped", tmp_path / "buffered"
+        mapped_dir.mkdir()
+        buffered_dir.mkdir()
+        extractor = TextExtractor()
+
+        mapped = extractor.extract_from_path(source, output_format, mapped_dir)
+        buffered = extractor.extract_from_html(source, output_format, buffered_dir)
+
+        assert mapped.read_text(encoding="utf-8") == buffered.read_text(encoding="utf-8")
+        assert "Fish & chips <3 café \"quoted\"" in mapped.read_text(encoding="utf-8")
+        assert "hidden" not in mapped.read_text(encoding="utf-8")
+
+    def test_empty_file_uses_buffered_parser(self, tmp_path):
+        source = tmp_path / "empty.html"
+        source.write_bytes(b"")
+
+        output = TextExtractor().extract_from_path(source, "txt", tmp_path)
+
+        assert output.read_text() == ""
+
+    def test_read_errors_propagate(self, tmp_path):
+        """Errors other than an empty file should not fall back to reading into RAM."""
+        with pytest.raises(FileNotFoundError):
+            TextExtractor().extract_from_path(tmp_path / "missing.html", "txt", tmp_path)
+
+
+class TestMergeChunks:
+    """Test suite for joining converted chunks into one output."""
+
+    def test_merges_in_order_and_removes_chunks(self, tmp_path):
+        chunks = []
+        for i in range(3):
+            chunk = tmp_path / f"chunk_{i}.md"
+            chunk.write_text(f"part {i}")
+            chunks.append(chunk)
+
+        merged = ChunkingService().merge_chunks(chunks, "md", tmp_path, "doc")
+
+        assert merged.read_text() == "part 0\n\n---\n\npart 1\n\n---\n\npart 2"
+        assert not any(chunk.exists() for chunk in chunks)
+
+
+@requires_pandoc
+class TestExecuteInputSources:
+    """Test suite for in-memory uploads piped through stdin and uploads spooled to disk."""
+
+    def test_in_memory_upload_is_piped_to_pandoc(self, plugin):
+        result = plugin.execute({"input_file": markdown_file("piped.md", "Piped *text*."), "output_format": "html5"})
+
+        assert "<em>text</em>" in Path(result["file_path"]).read_text()
+
+    def test_streamed_upload_is_converted_from_disk(self, plugin, tmp_path):
+        """Uploads spooled to disk should be converted like in-memory ones."""
+        upload = tmp_path / "upload.md"
+        upload.write_text("Streamed *text*.")
+        input_file = {"filename": "streamed.md", "temp_path": str(upload), "size": upload.stat().st_size}
+
+        result = plugin.execute({"input_file": input_file, "output_format": "html5"})
+
+        assert "<em>text</em>" in Path(result["file_path"]).read_text()
+        assert not upload.exists()
+
+
+class TestBuildCommand:
+    """Test suite for the pandoc command line built for stdin input."""
+
+    def build(self, advanced_options):
+        executor = PandocExecutor(MemoryMonitor())
+        return executor.build_command(
+            None, Path("out.html"), "html5", advanced_options, False, input_format="markdown"
+        )
+
+    def test_stdin_reader_is_added(self):
+        assert self.build(["--toc"])[:4] == ["pandoc", "--toc", "-f", "markdown"]
+
+    @pytest.mark.parametrize("advanced_options", [
+        ["-f", "gfm"], ["-fgfm"], ["--from=gfm"], ["--read", "gfm"],
+    ])
+    def test_user_reader_wins(self, advanced_options):
+        command = self.build(advanced_options)
+        assert "markdown" not in command
+        assert command[1:1 + len(advanced_options)] == advanced_options
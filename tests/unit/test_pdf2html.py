@@ -0,0 +1,485 @@
+"""
+Unit tests for the pdf2html plugin, with the docker client and the shared
+volume replaced by stubs and temporary directories.
+"""
+import errno
+import hashlib
+import os
+import re
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.plugins.pdf2html import plugin as pdf2html
+from app.plugins.pdf2html.plugin import ContainerPool, Plugin, _move_and_hash
+
+CLEANUP_AGE_SECONDS = 3600  # The web route sweeps downloads older than an hour
+
+
+class ExecAPIStub:
+    """Docker low-level API stub whose exec yields the given stderr blocks"""
+
+    def __init__(self, blocks=(), exit_code=0, stall=False, error=None):
+        self.blocks = blocks
+        self.exit_code = exit_code
+        self.stall = stall
+        self.error = error
+        self.released = threading.Event()
+
+    def exec_create(self, container, cmd, stdout=True, stderr=True):
+        return {"Id": "exec-1"}
+
+    def exec_start(self, exec_id, stream=False, demux=False):
+        def frames():
+            if self.stall:
+                # A quiet process: nothing arrives until the test lets go
+                self.released.wait(10)
+            if self.error is not None:
+                raise self.error
+            for block in self.blocks:
+                yield None, block
+        return frames()
+
+    def exec_inspect(self, exec_id):
+        return {"ExitCode": self.exit_code}
+
+
+@pytest.fixture
+def plugin():
+    return Plugin()
+
+
+@pytest.fixture
+def downloads_dir(monkeypatch, tmp_path):
+    """Downloads directory (and with it the conversion cache) under tmp_path"""
+    downloads_dir = tmp_path / "downloads"
+    monkeypatch.setattr(pdf2html, "DOWNLOADS_DIR", downloads_dir)
+    return downloads_dir
+
+
+def age(path, seconds):
+    """Backdate a file's mtime"""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+class TestExecWithSdk:
+    """Test suite for running commands in the service through the Docker API."""
+
+    def test_returns_exit_code_and_stderr_tail(self, plugin):
+        api = ExecAPIStub(blocks=[b"first\n", None, b"second\n"], exit_code=3)
+
+        returncode, stdout, stderr = plugin._exec_with_sdk(SimpleNamespace(api=api), "svc", ["true"])
+
+        assert (returncode, stdout, stderr) == (3, "", "first\nsecond\n")
+
+    def test_silent_stall_hits_the_deadline(self, plugin):
+        """A command that produces no output should still time out on schedule."""
+        api = ExecAPIStub(stall=True)
+        started = time.monotonic()
+        try:
+            with pytest.raises(subprocess.TimeoutExpired):
+                plugin._exec_with_sdk(SimpleNamespace(api=api), "svc", ["pdf2htmlEX"], timeout=0.2)
+        finally:
+            api.released.set()
+        assert time.monotonic() - started < 5
+
+    def test_socket_timeout_is_a_timeout(self, plugin):
+        api = ExecAPIStub(error=socket.timeout("timed out"))
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            plugin._exec_with_sdk(SimpleNamespace(api=api), "svc", ["pdf2htmlEX"])
+
+    def test_stall_kills_the_work_dirs_processes(self, plugin, monkeypatch):
+        api = ExecAPIStub(stall=True)
+        docker_client = SimpleNamespace(api=api)
+        killed = []
+        monkeypatch.setattr(Plugin, "_get_docker_client", classmethod(lambda cls: docker_client))
+        monkeypatch.setattr(plugin, "_kill_in_container",
+                            lambda client, container, work_dir: killed.append((client, container, work_dir)))
+        try:
+            with pytest.raises(subprocess.TimeoutExpired):
+                plugin._exec_in_container("svc", ["pdf2htmlEX"], ["/shared/a", "/shared/b"], timeout=0.2)
+        finally:
+            api.released.set()
+
+        assert killed == [(docker_client, "svc", "/shared/a"), (docker_client, "svc", "/shared/b")]
+
+
+class TestConversionCache:
+    """Test suite for the content-addressed cache of finished conversions."""
+
+    SETTINGS = {"zoom": 1.3, "embed_css": True}
+
+    def cached_entry(self, plugin, digest="d1", html="<html>cached</html>", seconds_old=0):
+        cache_path = plugin._conversion_cache_path(digest, self.SETTINGS)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(html)
+        age(cache_path, seconds_old)
+        return cache_path
+
+    def test_key_depends_on_digest_and_settings(self, plugin, downloads_dir):
+        key = plugin._conversion_cache_path("d1", {"zoom": 1.3, "embed_css": True})
+
+        assert key == plugin._conversion_cache_path("d1", {"embed_css": True, "zoom": 1.3})
+        assert key != plugin._conversion_cache_path("d2", {"zoom": 1.3, "embed_css": True})
+        assert key != plugin._conversion_cache_path("d1", {"zoom": 1.0, "embed_css": True})
+        assert key.parent == downloads_dir / pdf2html.CACHE_DIR_NAME
+
+    def test_miss_returns_none(self, plugin, downloads_dir):
+        assert plugin._restore_from_cache(plugin._conversion_cache_path("d1", self.SETTINGS), "doc.html") is None
+
+    def test_restored_old_entry_outlives_the_downloads_cleanup(self, plugin, downloads_dir):
+        """A hit on an entry older than the cleanup age must not be swept before it is served."""
+        cache_path = self.cached_entry(plugin, seconds_old=2 * CLEANUP_AGE_SECONDS)
+
+        restored = plugin._restore_from_cache(cache_path, "doc.html")
+
+        assert restored.parent == downloads_dir
+        assert restored.read_text() == "<html>cached</html>"
+        assert time.time() - restored.stat().st_mtime < CLEANUP_AGE_SECONDS
+        assert time.time() - cache_path.stat().st_mtime < CLEANUP_AGE_SECONDS
+
+    def test_restore_copies_when_links_are_not_possible(self, plugin, downloads_dir, monkeypatch):
+        cache_path = self.cached_entry(plugin, seconds_old=2 * CLEANUP_AGE_SECONDS)
+
+        def no_link(src, dst):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        monkeypatch.setattr(pdf2html.os, "link", no_link)
+        restored = plugin._restore_from_cache(cache_path, "doc.html")
+
+        assert restored.read_text() == "<html>cached</html>"
+        assert time.time() - restored.stat().st_mtime < CLEANUP_AGE_SECONDS
+        assert time.time() - cache_path.stat().st_mtime < CLEANUP_AGE_SECONDS
+
+    def test_store_links_the_download(self, plugin, downloads_dir):
+        download = downloads_dir / "doc_1234.html"
+        download.parent.mkdir(parents=True)
+        download.write_text("<html>fresh</html>")
+        cache_path = plugin._conversion_cache_path("d1", self.SETTINGS)
+
+        plugin._store_in_cache(download, cache_path)
+
+        assert os.path.samefile(download, cache_path)
+
+    def test_store_evicts_least_recently_used(self, plugin, downloads_dir, monkeypatch):
+        monkeypatch.setattr(pdf2html, "CACHE_MAX_ENTRIES", 2)
+        oldest = self.cached_entry(plugin, "oldest", seconds_old=300)
+        used = self.cached_entry(plugin, "used", seconds_old=600)
+        plugin._restore_from_cache(used, "doc.html")
+        download = downloads_dir / "new_1234.html"
+        download.write_text("<html>new</html>")
+        newest = plugin._conversion_cache_path("newest", self.SETTINGS)
+
+        plugin._store_in_cache(download, newest)
+
+        assert not oldest.exists()
+        assert used.exists()
+        assert newest.exists()
+
+
+class TestContainerPool:
+    """Test suite for the bounded pool of pdf2htmlEX service containers."""
+
+    def test_spreads_conversions_over_containers(self):
+        pool = ContainerPool(4)
+        pool.update(["a", "b"])
+
+        with pool.acquire(timeout=1) as first, pool.acquire(timeout=1) as second:
+            with pool.acquire(timeout=1) as third:
+                assert sorted([first, second]) == ["a", "b"]
+                assert third in ("a", "b")
+
+    def test_slots_bound_conversions_in_flight(self):
+        pool = ContainerPool(1)
+        pool.update(["a"])
+
+        with pool.acquire(timeout=1):
+            with pytest.raises(RuntimeError, match="busy"):
+                with pool.acquire(timeout=0.05):
+                    pass
+        with pool.acquire(timeout=0.05) as container_name:
+            assert container_name == "a"
+
+    def test_no_known_containers_releases_the_slot(self):
+        pool = ContainerPool(1)
+
+        with pytest.raises(RuntimeError, match="No pdf2htmlEX service containers"):
+            with pool.acquire(timeout=0.05):
+                pass
+        pool.update(["a"])
+        with pool.acquire(timeout=0.05) as container_name:
+            assert container_name == "a"
+
+    def test_update_keeps_slots_and_in_flight_counts(self):
+        pool = ContainerPool(2)
+        pool.update(["a", "b"])
+
+        with pool.acquire(timeout=1) as held:
+            pool.update(["a", "b", "c"])
+            # The container still busy is not handed out while idle ones exist
+            with pool.acquire(timeout=1) as other:
+                assert other != held
+                pool.update(["c"])
+        # Releasing containers dropped by the update must not fail or leak slots
+        with pool.acquire(timeout=0.05) as first, pool.acquire(timeout=0.05) as second:
+            assert first == second == "c"
+
+
+class TestKillInContainer:
+    """Test suite for killing a timed out conversion inside the service."""
+
+    def test_sdk_kills_by_work_dir(self, plugin):
+        calls = []
+        container = SimpleNamespace(exec_run=calls.append)
+        docker_client = SimpleNamespace(containers=SimpleNamespace(get=lambda name: container))
+
+        plugin._kill_in_container(docker_client, "svc", "/shared/ab12")
+
+        assert calls == [["pkill", "-9", "-f", "/shared/ab12/"]]
+
+    def test_cli_kills_by_work_dir(self, plugin, monkeypatch):
+        calls = []
+        monkeypatch.setattr(pdf2html.subprocess, "run", lambda cmd, **kwargs: calls.append(cmd))
+
+        plugin._kill_in_container(None, "svc", "/shared/ab12")
+
+        assert calls == [["docker", "exec", "svc", "pkill", "-9", "-f", "/shared/ab12/"]]
+
+    def test_pattern_leaves_other_work_dirs_alone(self, plugin):
+        calls = []
+        container = SimpleNamespace(exec_run=calls.append)
+        plugin._kill_in_container(SimpleNamespace(containers=SimpleNamespace(get=lambda name: container)),
+                                  "svc", "/shared/ab12")
+        pattern = calls[0][-1]
+
+        assert re.search(pattern, "pdf2htmlEX --zoom 1.3 --dest-dir /shared/ab12 /shared/ab12/doc.pdf")
+        assert not re.search(pattern, "pdf2htmlEX --zoom 1.3 --dest-dir /shared/ab123 /shared/ab123/doc.pdf")
+
+    def test_failures_are_logged_not_raised(self, plugin):
+        def missing(name):
+            raise RuntimeError("No such container")
+
+        plugin._kill_in_container(SimpleNamespace(containers=SimpleNamespace(get=missing)), "svc", "/shared/ab12")
+
+
+class TestMoveAndHash:
+    """Test suite for moving an uploaded PDF while hashing it."""
+
+    PDF = b"%PDF-1.4\n" + bytes(range(256)) * 40000  # Spans several hash blocks
+
+    @pytest.fixture
+    def upload(self, tmp_path):
+        upload = tmp_path / "upload.pdf"
+        upload.write_bytes(self.PDF)
+        return upload
+
+    def expected(self):
+        return len(self.PDF), hashlib.blake2b(self.PDF, digest_size=16).hexdigest()
+
+    def test_same_device_renames_then_hashes(self, upload, tmp_path, monkeypatch):
+        monkeypatch.setattr(pdf2html, "HASH_BLOCK_SIZE", 1 << 16)
+        dst = tmp_path / "shared.pdf"
+
+        assert _move_and_hash(upload, dst) == self.expected()
+        assert dst.read_bytes() == self.PDF
+        assert not upload.exists()
+
+    def test_cross_device_hashes_while_copying(self, upload, tmp_path, monkeypatch):
+        def rename(src, dst):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        monkeypatch.setattr(pdf2html.os, "rename", rename)
+        monkeypatch.setattr(pdf2html, "HASH_BLOCK_SIZE", 1 << 16)
+        dst = tmp_path / "shared.pdf"
+
+        assert _move_and_hash(upload, dst) == self.expected()
+        assert dst.read_bytes() == self.PDF
+        assert not upload.exists()
+
+    def test_other_rename_errors_propagate(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            _move_and_hash(tmp_path / "missing.pdf", tmp_path / "shared.pdf")
+
+
+FAKE_PDF2HTMLEX = """#!/bin/sh
+# Stands in for pdf2htmlEX: writes <input stem>.html into --dest-dir
+while [ $# -gt 1 ]; do
+    if [ "$1" = "--dest-dir" ]; then dest="$2"; shift 2; else shift; fi
+done
+case "$1" in *broken*) echo "Error: broken PDF" >&2; exit 3;; esac
+name=$(basename "$1" .pdf)
+printf '<html>%s</html>' "$name" > "$dest/$name.html"
+"""
+
+
+@pytest.fixture
+def local_service(plugin, downloads_dir, monkeypatch, tmp_path):
+    """
+    Run the plugin's docker exec commands on this machine against a fake pdf2htmlEX.
+
+    The shared volume is the same directory on both sides, and every exec's
+    command is recorded in the returned list.
+    """
+    if shutil.which("timeout") is None:
+        pytest.skip("coreutils timeout is not installed")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake = bin_dir / "pdf2htmlEX"
+    fake.write_text(FAKE_PDF2HTMLEX)
+    fake.chmod(0o755)
+    shared_dir = tmp_path / "shared"
+    monkeypatch.setattr(pdf2html, "SHARED_DIR", shared_dir)
+    monkeypatch.setattr(pdf2html, "CONTAINER_SHARED_DIR", str(shared_dir))
+    monkeypatch.setattr(plugin, "_check_pdf2htmlex_service", lambda discover=False: {
+        "service_available": True, "container_name": "svc", "container_names": ["svc"], "error_message": None
+    })
+    commands = []
+
+    def exec_locally(container_name, command, work_dirs, timeout=pdf2html.CONVERSION_TIMEOUT):
+        commands.append(command)
+        completed = subprocess.run(command, capture_output=True, timeout=30,
+                                   env={**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}"})
+        return {
+            "container_missing": False,
+            "returncode": completed.returncode,
+            "stdout": "",
+            "stderr": completed.stderr.decode(),
+            "execution_time": 0.0
+        }
+    monkeypatch.setattr(plugin, "_exec_in_container", exec_locally)
+    return commands
+
+
+def pdf(name, body=b"%PDF-1.4 body"):
+    """In-memory upload of a PDF"""
+    return {"filename": name, "content": body + name.encode()}
+
+
+class TestExecuteBatch:
+    """Test suite for converting several PDFs with one docker exec per pool slot."""
+
+    def test_one_exec_converts_every_pdf_in_order(self, plugin, local_service, monkeypatch):
+        monkeypatch.setattr(pdf2html, "_CONTAINER_POOL", ContainerPool(1))
+        names = ["b.pdf", "a.pdf", "c.pdf"]
+
+        results = plugin.execute_batch({"input_files": [pdf(name) for name in names]})
+
+        assert len(local_service) == 1
+        assert [result["file_name"] for result in results] == ["b.html", "a.html", "c.html"]
+        for name, result in zip(names, results):
+            assert Path(result["file_path"]).read_text() == f"<html>{Path(name).stem}</html>"
+            assert result["conversion_details"]["batch_size"] == 3
+
+    def test_pdfs_are_split_across_pool_slots(self, plugin, local_service, monkeypatch):
+        monkeypatch.setattr(pdf2html, "_CONTAINER_POOL", ContainerPool(2))
+
+        results = plugin.execute_batch({"input_files": [pdf(f"{i}.pdf") for i in range(4)]})
+
+        assert len(local_service) == 2
+        assert all("error" not in result for result in results)
+
+    def test_failed_pdfs_do_not_fail_the_batch(self, plugin, local_service, monkeypatch):
+        monkeypatch.setattr(pdf2html, "_CONTAINER_POOL", ContainerPool(1))
+        input_files = [pdf("good.pdf"), pdf("broken.pdf"), pdf("notes.txt"), pdf("last.pdf")]
+
+        results = plugin.execute_batch({"input_files": input_files})
+
+        assert "error" not in results[0] and "error" not in results[3]
+        assert "exit code 3" in results[1]["error"]
+        assert "broken PDF" in results[1]["error"]
+        assert "Invalid file extension" in results[2]["error"]
+        assert results[2]["conversion_details"] == {
+            "input_file": {"filename": "notes.txt"}, "conversion_successful": False
+        }
+
+    def test_cached_pdfs_skip_the_exec(self, plugin, local_service):
+        input_files = [pdf("a.pdf"), pdf("b.pdf")]
+        plugin.execute_batch({"input_files": input_files})
+        local_service.clear()
+
+        results = plugin.execute_batch({"input_files": [pdf("a.pdf"), pdf("b.pdf")]})
+
+        assert local_service == []
+        assert [result["conversion_details"]["cache_hit"] for result in results] == [True, True]
+
+    def test_unavailable_service_fails_every_pdf(self, plugin, monkeypatch):
+        monkeypatch.setattr(plugin, "_check_pdf2htmlex_service", lambda discover=False: {
+            "service_available": False, "container_name": None, "container_names": [],
+            "error_message": "pdf2htmlEX service container not found or not running"
+        })
+
+        results = plugin.execute_batch({"input_files": [pdf("a.pdf"), pdf("b.pdf")]})
+
+        assert all("not available" in result["error"] for result in results)
+
+
+class TestBatchCommand:
+    """Test suite for the sh -c loop that converts a batch inside the service."""
+
+    SETTINGS = {
+        "zoom": 1.3, "embed_css": True, "embed_javascript": True, "embed_images": True,
+        "optimize_text": True, "font_format": "woff", "printing": 0, "font_size_multiplier": 4.0,
+    }
+
+    def stage(self, plugin, filename):
+        shared_dir = plugin._ensure_shared_directory()
+        (shared_dir / filename).write_bytes(b"%PDF-1.4")
+        return {"shared_dir": shared_dir, "input_filename": filename}
+
+    def test_file_names_are_passed_as_arguments(self, plugin, local_service, tmp_path):
+        """Names reach pdf2htmlEX verbatim, never through the shell's parser."""
+        names = ["my file's.pdf", "$(touch injected).pdf", "-dash.pdf"]
+        jobs = [self.stage(plugin, name) for name in names]
+
+        result = plugin._execute_batch_in_service("svc", jobs, self.SETTINGS)
+
+        assert [job_result["returncode"] for job_result in result["job_results"]] == [0, 0, 0]
+        for job, name in zip(jobs, names):
+            assert (job["shared_dir"] / f"{Path(name).stem}.html").exists()
+        assert not list(tmp_path.rglob("injected"))
+        command = local_service[0]
+        assert command[:2] == ["sh", "-c"]
+        assert command[3:] == ["sh"] + [arg for job in jobs for arg in (
+            f"{pdf2html.CONTAINER_SHARED_DIR}/{job['shared_dir'].name}", job["input_filename"]
+        )]
+
+    def test_options_are_quoted(self, plugin, local_service, tmp_path):
+        jobs = [self.stage(plugin, "a.pdf")]
+        settings = {**self.SETTINGS, "font_format": "woff; touch injected"}
+
+        result = plugin._execute_batch_in_service("svc", jobs, settings)
+
+        assert result["job_results"][0]["returncode"] == 0
+        assert "'--font-format=woff; touch injected'" in local_service[0][2]
+        assert not list(tmp_path.rglob("injected"))
+
+    def test_each_job_gets_its_own_status_and_log(self, plugin, local_service):
+        jobs = [self.stage(plugin, "good.pdf"), self.stage(plugin, "broken.pdf")]
+
+        result = plugin._execute_batch_in_service("svc", jobs, self.SETTINGS)
+
+        good, broken = result["job_results"]
+        assert (good["returncode"], good["stderr"]) == (0, "")
+        assert broken["returncode"] == 3
+        assert broken["stderr"] == "Error: broken PDF\n"
+        assert broken["batch_size"] == 2
+        assert broken["command"].endswith(f"{jobs[1]['shared_dir'].name}/broken.pdf")
+
+    def test_missing_status_falls_back_to_the_exec_result(self, plugin, monkeypatch):
+        """A job the loop never reported on (e.g. the exec died) counts as failed."""
+        jobs = [{"shared_dir": Path("/nonexistent/ab12"), "input_filename": "a.pdf"}]
+        monkeypatch.setattr(plugin, "_exec_in_container", lambda *args, **kwargs: {
+            "container_missing": False, "returncode": 137, "stdout": "", "stderr": "Killed",
+            "execution_time": 1.0
+        })
+
+        result = plugin._execute_batch_in_service("svc", jobs, self.SETTINGS)
+
+        assert result["job_results"][0]["returncode"] == 137
+        assert result["job_results"][0]["stderr"] == "Killed"
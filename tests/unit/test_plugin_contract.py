@@ -1,4 +1,6 @@
-from typing import Any, Dict, Type
+import ast
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
 
 import pytest
 from pydantic import BaseModel, Field, ValidationError
@@ -7,6 +9,7 @@ from app.core.plugin_manager import PluginManager
 from app.models.plugin import (
     BasePlugin,
     BasePluginResponse,
+    BatchItemError,
     InputField,
     InputFieldType,
     OutputFormat,
@@ -52,7 +55,8 @@ def test_derive_input_fields_from_input_model():
     fields = ExamplePlugin.derive_input_fields()
     assert len(fields) == 2
 
-    text_field = next(field for field in fields if field.name == "text")
+    fields_by_name = {field.name: field for field in fields}
+    text_field = fields_by_name["text"]
     assert text_field.label == "Input Text"
     assert text_field.field_type == InputFieldType.TEXTAREA
     assert text_field.required is True
@@ -61,6 +65,11 @@ def test_derive_input_fields_from_input_model():
     assert text_field.validation["min_length"] == 3
     assert text_field.validation["max_length"] == 100
 
+    # Derived once per class; later calls return equal copies
+    again = ExamplePlugin.derive_input_fields()
+    assert again == fields
+    assert again[0] is not fields[0]
+
 
 def test_run_validates_input_model():
     plugin = ExamplePlugin()
@@ -72,6 +81,79 @@ def test_run_validates_input_model():
         plugin.run({"text": "hi"})
 
 
+def test_run_accepts_response_model_instance():
+    class ModelReturningPlugin(ExamplePlugin):
+        def execute(self, data: Dict[str, Any]) -> ExampleResponse:
+            return ExampleResponse(ok=True, text_length=len(data["text"]))
+
+    result = ModelReturningPlugin().run({"text": "hello"})
+    assert result == {"ok": True, "text_length": 5}
+
+
+class ExampleFileInput(BaseModel):
+    input_file: Dict[str, Any]
+    prefix: str = Field(default="", max_length=5)
+
+
+class ExampleFilePlugin(BasePlugin):
+    @classmethod
+    def get_input_model(cls) -> Type[BaseModel]:
+        return ExampleFileInput
+
+    @classmethod
+    def get_response_model(cls) -> Type[BasePluginResponse]:
+        return ExampleResponse
+
+    def execute(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        content = data["input_file"]["content"]
+        if not content:
+            raise ValueError("Input file is empty")
+        return {"ok": True, "text_length": len(data["prefix"]) + len(content)}
+
+
+def test_run_batch_executes_each_file_with_shared_options():
+    result = ExampleFilePlugin().run_batch({
+        "prefix": "ab",
+        "input_files": [{"content": b"one"}, {"content": b""}, {"content": b"three"}],
+    })
+
+    assert result == [
+        {"ok": True, "text_length": 5},
+        {"error": "Input file is empty"},
+        {"ok": True, "text_length": 7},
+    ]
+    assert isinstance(result[1], BatchItemError)
+    assert not isinstance(result[0], BatchItemError)
+
+
+def test_run_batch_validates_responses_with_an_error_field():
+    class OptionalErrorResponse(BasePluginResponse):
+        ok: bool
+        error: Optional[str] = None
+
+    class OptionalErrorPlugin(ExampleFilePlugin):
+        @classmethod
+        def get_response_model(cls) -> Type[BasePluginResponse]:
+            return OptionalErrorResponse
+
+        def execute(self, data: Dict[str, Any]) -> Dict[str, Any]:
+            return {"ok": "yes", "error": None}
+
+    result = OptionalErrorPlugin().run_batch({"input_files": [{"content": b"one"}]})
+
+    # A successful response with error=None is still validated (and coerced)
+    assert result == [{"ok": True, "error": None}]
+    assert not isinstance(result[0], BatchItemError)
+
+
+def test_run_batch_validates_shared_options():
+    with pytest.raises(ValidationError):
+        ExampleFilePlugin().run_batch({"prefix": "too long", "input_files": [{"content": b"one"}]})
+
+    with pytest.raises(ValueError, match="Missing input files"):
+        ExampleFilePlugin().run_batch({"prefix": "ab", "input_files": []})
+
+
 def test_manifest_runtime_parity_reports_drift():
     manifest = PluginManifest(
         id="example",
@@ -140,31 +222,39 @@ def test_manifest_runtime_parity_clean_when_aligned():
     assert warnings == []
 
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _assert_has_input_model(plugin_path: str) -> None:
+    """Check a plugin's Plugin class defines get_input_model without importing it."""
+    tree = ast.parse((REPO_ROOT / plugin_path).read_text(encoding="utf-8"))
+    plugin_class = next(
+        node for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == "Plugin"
+    )
+    assert any(
+        isinstance(node, ast.FunctionDef) and node.name == "get_input_model"
+        for node in plugin_class.body
+    ), f"{plugin_path} Plugin does not define get_input_model"
+
+
 def test_migrated_plugins_define_input_model():
+    # One real import keeps the runtime path covered
     from app.plugins.text_stat.plugin import Plugin as TextStatPlugin
-    from app.plugins.bag_of_words.plugin import Plugin as BagOfWordsPlugin
-    from app.plugins.context_aware_stopwords.plugin import Plugin as ContextAwareStopwordsPlugin
-    from app.plugins.web_sentence_analyzer.plugin import Plugin as WebSentenceAnalyzerPlugin
-    from app.plugins.doc_viewer.plugin import Plugin as DocViewerPlugin
-    from app.plugins.xml_to_json.plugin import Plugin as XmlToJsonPlugin
-    from app.plugins.pdf2html.plugin import Plugin as Pdf2HtmlPlugin
-    from app.plugins.pandoc_converter.plugin import Plugin as PandocConverterPlugin
 
     assert TextStatPlugin.get_input_model() is not None
-    assert BagOfWordsPlugin.get_input_model() is not None
-    assert ContextAwareStopwordsPlugin.get_input_model() is not None
-    assert WebSentenceAnalyzerPlugin.get_input_model() is not None
-    assert DocViewerPlugin.get_input_model() is not None
-    assert XmlToJsonPlugin.get_input_model() is not None
-    assert Pdf2HtmlPlugin.get_input_model() is not None
-    assert PandocConverterPlugin.get_input_model() is not None
-
-    # sentence_merger and json_to_xml import optional/heavy dependencies at module load time
-    # in this environment; assert migration marker without importing the modules.
+
+    # The rest are checked from source so collection does not pay for their
+    # (often heavy or optional) module-level imports
     for plugin_path in [
+        "app/plugins/bag_of_words/plugin.py",
+        "app/plugins/context_aware_stopwords/plugin.py",
+        "app/plugins/web_sentence_analyzer/plugin.py",
+        "app/plugins/doc_viewer/plugin.py",
+        "app/plugins/xml_to_json/plugin.py",
+        "app/plugins/pdf2html/plugin.py",
+        "app/plugins/pandoc_converter/plugin.py",
         "app/plugins/sentence_merger/plugin.py",
         "app/plugins/json_to_xml/plugin.py",
     ]:
-        with open(plugin_path, "r", encoding="utf-8") as file:
-            source = file.read()
-        assert "def get_input_model(" in source
+        _assert_has_input_model(plugin_path)
@@ -1,6 +1,10 @@
 """
 Unit tests for Plugin Manager
 """
+import shutil
+import sys
+from pathlib import Path
+
 import pytest
 from app.core.plugin_manager import PluginManager
 from app.models.plugin import PluginInput
@@ -56,7 +60,7 @@ class TestPluginManager:
         )
         result = plugin_manager.execute_plugin(plugin_input)
 
-        assert result.success == True
+        assert result.success is True
         assert result.error is None
         assert result.data is not None
         assert "word_count" in result.data
@@ -71,7 +75,7 @@ class TestPluginManager:
         )
         result = plugin_manager.execute_plugin(plugin_input)
 
-        assert result.success == False or result.data["word_count"] == 0
+        assert result.success is False or result.data["word_count"] == 0
 
     def test_execute_nonexistent_plugin(self, plugin_manager):
         """Test executing a plugin that doesn't exist"""
@@ -81,7 +85,7 @@ class TestPluginManager:
         )
         result = plugin_manager.execute_plugin(plugin_input)
 
-        assert result.success == False
+        assert result.success is False
         assert "not found" in result.error.lower()
 
     def test_plugin_dependency_checking(self, plugin_manager):
@@ -90,11 +94,51 @@ class TestPluginManager:
         assert hasattr(plugin, 'dependency_status')
         assert 'all_met' in plugin.dependency_status
 
-    def test_refresh_plugins(self, plugin_manager):
+    def test_refresh_plugins(self, fresh_plugin_manager):
         """Test refreshing the plugin list"""
-        initial_count = len(plugin_manager.get_all_plugins())
-        plugin_manager.refresh_plugins()
-        refreshed_count = len(plugin_manager.get_all_plugins())
+        initial_count = len(fresh_plugin_manager.get_all_plugins())
+        fresh_plugin_manager.refresh_plugins()
+        refreshed_count = len(fresh_plugin_manager.get_all_plugins())
 
         assert refreshed_count == initial_count
         assert refreshed_count == 10
+
+
+class TestExecutePluginBatch:
+    """Test suite for executing a file plugin on several files"""
+
+    def test_unknown_plugin_fails_every_file(self, plugin_manager):
+        plugin_input = PluginInput(
+            plugin_id="nonexistent_plugin",
+            data={"input_files": [{"filename": "a.md", "content": b"a"}, {"filename": "b.md", "content": b"b"}]}
+        )
+        results = plugin_manager.execute_plugin_batch(plugin_input)
+
+        assert len(results) == 2
+        assert all(result.success is False for result in results)
+        assert all("not found" in result.error for result in results)
+
+    @pytest.mark.skipif(shutil.which("pandoc") is None, reason="pandoc is not installed")
+    def test_pandoc_batch_returns_one_response_per_file(self, plugin_manager, monkeypatch, tmp_path):
+        """Rejected and failing files get their own error; the rest are converted."""
+        plugin_class = plugin_manager.loader.get_plugin_class("pandoc_converter")
+        monkeypatch.setattr(sys.modules[plugin_class.__module__]._FILE_HANDLER, "downloads_dir", tmp_path)
+        plugin_input = PluginInput(
+            plugin_id="pandoc_converter",
+            data={
+                "output_format": "html5",
+                "input_files": [
+                    {"filename": "first.md", "content": b"# First"},
+                    {"filename": "notes.exe", "content": b"binary"},
+                    {"filename": "empty.md", "content": b""},
+                    {"filename": "last.md", "content": b"# Last"},
+                ],
+            }
+        )
+        results = plugin_manager.execute_plugin_batch(plugin_input)
+
+        assert [result.success for result in results] == [True, False, False, True]
+        assert "Invalid file type" in results[1].error
+        assert "Input file is empty" in results[2].error
+        assert "First" in Path(results[0].file_data["file_path"]).read_text()
+        assert "Last" in Path(results[3].file_data["file_path"]).read_text()
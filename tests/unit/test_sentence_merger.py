@@ -0,0 +1,188 @@
+"""
+Unit tests for the sentence merger's clustering and merging.
+
+The sentence transformer is replaced by a stub that embeds each sentence on
+the axis of its topic word, so no model weights are needed.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("sklearn")
+pytest.importorskip("spacy")
+
+from app.plugins.sentence_merger import plugin as sentence_merger
+
+TOPICS = ("orbits", "tides", "comets", "eclipses", "seasons", "meteors", "auroras", "galaxies")
+
+
+class TopicModel:
+    """Stand-in sentence transformer: one unit axis per topic word"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.append(list(texts))
+        embeddings = np.zeros((len(texts), len(TOPICS)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            embeddings[row, next(axis for axis, topic in enumerate(TOPICS) if topic in text)] = 1.0
+        return embeddings
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = TopicModel()
+    monkeypatch.setattr(sentence_merger, "_get_st_model", lambda: model)
+    monkeypatch.setattr(sentence_merger, "_get_nlp", lambda: None)
+    monkeypatch.setattr(sentence_merger, "_EMBEDDING_CACHE", sentence_merger.EmbeddingCache(1000))
+    return model
+
+
+@pytest.fixture
+def merger(model):
+    return sentence_merger.SentenceMerger()
+
+
+def unit_rows(points):
+    """Normalize rows and store them the way get_embeddings does"""
+    return (points / np.linalg.norm(points, axis=1, keepdims=True)).astype(sentence_merger.EMBEDDING_DTYPE)
+
+
+def partition(labels):
+    """Clusters as sets of row indices, independent of label numbering"""
+    clusters = {}
+    for index, label in enumerate(labels):
+        clusters.setdefault(label, set()).add(index)
+    return {frozenset(indices) for indices in clusters.values()}
+
+
+class TestClustering:
+    """Test suite for the exact and approximate clustering backends"""
+
+    def test_hnsw_labels_match_agglomerative_on_separated_clusters(self, merger):
+        pytest.importorskip("hnswlib")
+        rng = np.random.default_rng(7)
+        centers = np.eye(8, 32)
+        points = centers.repeat(12, axis=0) + rng.normal(scale=0.02, size=(96, 32))
+        embeddings = unit_rows(points[rng.permutation(96)])
+
+        exact = partition(merger._agglomerative_cluster_labels(embeddings))
+        approximate = partition(merger._hnsw_cluster_labels(embeddings))
+
+        assert len(exact) == 8
+        assert approximate == exact
+
+    def test_cosine_distance_matrix_matches_float32_reference(self, merger, monkeypatch):
+        # Several full tiles plus a partial one
+        monkeypatch.setattr(sentence_merger, "DISTANCE_TILE_ROWS", 7)
+        embeddings = unit_rows(np.random.default_rng(3).normal(size=(30, 16)))
+
+        reference = embeddings.astype(np.float32)
+        expected = np.clip(1.0 - reference @ reference.T, 0.0, 2.0)
+        np.fill_diagonal(expected, 0.0)
+        distances = merger._cosine_distance_matrix(embeddings)
+
+        assert distances.dtype == np.float32
+        np.testing.assert_allclose(distances, expected, atol=1e-6)
+
+    def test_hnsw_backend_without_hnswlib_is_an_error(self, model, monkeypatch):
+        monkeypatch.setattr(sentence_merger, "HNSWLIB_AVAILABLE", False)
+
+        with pytest.raises(ValueError, match="hnswlib"):
+            sentence_merger.SentenceMerger(clustering_backend="hnsw")
+        # 'auto' quietly keeps to exact clustering
+        merger = sentence_merger.SentenceMerger(clustering_backend="auto")
+        assert merger._use_hnsw(sentence_merger.HNSW_MIN_SENTENCES * 10) is False
+
+
+class TestMergeSentences:
+    """Test suite for merging clustered sentences"""
+
+    @pytest.mark.parametrize("topic_count", [
+        sentence_merger.PARALLEL_MIN_CLUSTERS - 1,  # merged in the calling thread
+        sentence_merger.PARALLEL_MIN_CLUSTERS + 1,  # merged on the worker pool
+    ])
+    def test_clusters_follow_document_order(self, merger, topic_count):
+        topics = TOPICS[:topic_count][::-1]
+        sentences = [f"The first short note is about {topic}." for topic in topics]
+        sentences += [f"A second and noticeably longer note is also about {topic}." for topic in topics]
+
+        merged_sentences, cluster_details = merger.merge_sentences(sentences)
+
+        assert [details["sentences"] for details in cluster_details] == [
+            [sentences[index], sentences[index + topic_count]] for index in range(topic_count)
+        ]
+        # Without spaCy the longest sentence of each cluster is kept
+        assert merged_sentences == sentences[topic_count:]
+        assert all(details["similarity_score"] == pytest.approx(1.0) for details in cluster_details)
+
+
+class TestEmbeddingCache:
+    """Test suite for the process-wide embedding cache"""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = sentence_merger.EmbeddingCache(max_entries=2)
+        cache.set_many({"a": np.zeros(2), "b": np.ones(2)})
+        cache.get_many(["a"])  # a is now the most recently used
+        cache.set_many({"c": np.full(2, 2.0)})
+
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+    def test_disk_hits_are_pulled_back_into_memory(self, tmp_path):
+        pytest.importorskip("diskcache")
+        writer = sentence_merger.EmbeddingCache(max_entries=10, directory=str(tmp_path))
+        writer.set_many({"a": np.arange(3, dtype=np.float16)})
+        writer._disk.close()
+
+        reader = sentence_merger.EmbeddingCache(max_entries=10, directory=str(tmp_path))
+        assert "a" not in reader._entries
+        found = reader.get_many(["a", "missing"])
+        reader._disk.close()
+
+        assert list(found) == ["a"]
+        np.testing.assert_array_equal(found["a"], np.arange(3, dtype=np.float16))
+        assert "a" in reader._entries
+
+    def test_get_embeddings_encodes_only_missing_sentences_in_order(self, merger, model):
+        orbits = "The planets move around the sun in orbits."
+        tides = "The moon raises the tides on the earth."
+        comets = "Icy comets grow tails near the sun."
+        merger.get_embeddings([orbits, tides])
+        model.encoded.clear()
+
+        embeddings = merger.get_embeddings([tides, comets, orbits, comets])
+
+        # Each distinct uncached sentence is encoded once
+        assert model.encoded == [[comets]]
+        assert embeddings.dtype == sentence_merger.EMBEDDING_DTYPE
+        assert list(embeddings.argmax(axis=1)) == [TOPICS.index(topic) for topic in ("tides", "comets", "orbits", "comets")]
+
+
+class TestSentenceSplitting:
+    """Test suite for splitting input text into sentences"""
+
+    @staticmethod
+    def split(text):
+        return [sentence.strip() for sentence in sentence_merger.Plugin()._iter_sentences(text)]
+
+    def test_abbreviations_do_not_end_sentences(self):
+        text = "Dr. Smith and Prof. Jones compared results, e.g. Table two. Then Mrs. Lee left."
+
+        assert self.split(text) == [
+            "Dr. Smith and Prof. Jones compared results, e.g. Table two",
+            "Then Mrs. Lee left.",
+        ]
+
+    def test_back_to_back_abbreviations_do_not_end_sentences(self):
+        # The placeholder-based splitter this replaced split after the second one
+        assert self.split("Ms.etc.  XXMrsX") == ["Ms.etc.  XXMrsX"]
+        assert self.split("vs.etc.\nMri.e") == ["vs.etc.\nMri.e"]
+
+    def test_exclamation_and_question_marks_end_sentences(self):
+        text = "Is it late? Yes! It is. not a boundary? lowercase follows"
+
+        assert self.split(text) == ["Is it late", "Yes", "It is. not a boundary? lowercase follows"]
+
+    def test_sentences_keep_their_line_breaks(self):
+        assert self.split("A first line\nwraps here. Second one") == ["A first line\nwraps here", "Second one"]
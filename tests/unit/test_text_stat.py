@@ -0,0 +1,49 @@
+"""
+Unit tests for the text statistics plugin's character counts.
+"""
+from collections import Counter
+
+import pytest
+
+from app.plugins.text_stat import plugin as text_stat
+
+# Prose whose first-occurrence character order is far from code-point order
+PROSE = "Zebras quietly graze; 42 owls VEX jumpy dwarves! (Why?) Fjords hum.\n"
+
+
+@pytest.fixture
+def plugin():
+    return text_stat.Plugin()
+
+
+class TestCharacterFrequency:
+    """Test suite for counting characters"""
+
+    @pytest.mark.skipif(not text_stat.NUMPY_AVAILABLE, reason="numpy is not installed")
+    def test_long_ascii_text_is_counted_with_bincount(self, plugin):
+        text = PROSE * (text_stat.BINCOUNT_MIN_LENGTH // len(PROSE) + 1)
+
+        counts = plugin._count_characters(text)
+
+        # The bincount path builds a plain dict; the fallback returns the Counter
+        assert type(counts) is dict
+        assert counts == dict(Counter(text))
+        assert list(counts) == list(Counter(text))
+
+    def test_execute_reports_counter_frequencies_in_first_occurrence_order(self, plugin):
+        text = PROSE * (text_stat.BINCOUNT_MIN_LENGTH // len(PROSE) + 1)
+
+        frequency = plugin.execute({"text": text})["character_frequency"]
+
+        assert list(frequency.items()) == list(Counter(text).items())
+
+    def test_long_non_ascii_text_falls_back_to_counter(self, plugin):
+        text = (PROSE + "Café déjà vu — naïve.\n") * (text_stat.BINCOUNT_MIN_LENGTH // len(PROSE) + 1)
+
+        counts = plugin._count_characters(text)
+
+        assert isinstance(counts, Counter)
+        assert list(counts.items()) == list(Counter(text).items())
+
+    def test_short_text_is_counted_with_counter(self, plugin):
+        assert list(plugin._count_characters(PROSE).items()) == list(Counter(PROSE).items())
@@ -0,0 +1,322 @@
+"""
+Unit tests for the web sentence analyzer.
+"""
+import io
+from urllib.parse import urlparse
+
+import pytest
+import requests
+from bs4 import BeautifulSoup, Tag
+from nltk.tokenize import sent_tokenize
+from requests.structures import CaseInsensitiveDict
+
+from app.plugins.web_sentence_analyzer import plugin as web_plugin
+from app.plugins.web_sentence_analyzer.plugin import DOMContentAnalyzer, HTML_PARSER, NodeAnalysis
+
+NESTED_PAGE = """
+<html><head><title>Orbits</title></head>
+<body>
+  <nav class="menu"><a href="/">Home</a> <a href="/search">Search</a></nav>
+  <main>
+    <article>
+      <h1>Planetary motion</h1>
+      <section>
+        <p>The planets move around the sun in elliptical orbits, with the sun at one focus.</p>
+        <p>A line joining a planet and the sun sweeps out equal areas in equal intervals of time.</p>
+        <script>var tracking = "not part of the text";</script>
+      </section>
+      <section>
+        <div><div><p>The square of the orbital period of a planet is proportional to the cube
+          of the semi-major axis of its orbit.</p></div></div>
+        <p>These three laws were published by Johannes Kepler between 1609 and 1619.
+          <em>They replaced</em> circular orbits with <strong>ellipses</strong>.</p>
+      </section>
+    </article>
+    <aside><p>Related reading about comets, tides and the long history of astronomy.</p></aside>
+  </main>
+  <footer>Copyright notice and the usual legal text that every page carries.</footer>
+</body></html>
+"""
+
+
+def recursive_content_nodes(analyzer, soup):
+    """The recursive walk _find_content_nodes replaced, kept as the reference"""
+    content_nodes = []
+
+    def traverse_dom(element, depth=0):
+        analysis = analyzer._analyze_dom_node(element, depth)
+        if analysis and analysis.text_length >= analyzer.config.min_content_length:
+            content_nodes.append(analysis)
+        for child in element.children:
+            if isinstance(child, Tag):
+                traverse_dom(child, depth + 1)
+
+    traverse_dom(soup.find('body') or soup.find('html') or soup)
+    return content_nodes
+
+
+@pytest.fixture
+def analyzer():
+    return DOMContentAnalyzer()
+
+
+@pytest.fixture
+def soup():
+    return BeautifulSoup(NESTED_PAGE, HTML_PARSER)
+
+
+class TestFindContentNodes:
+    """Test suite for the iterative DOM walk against the recursive one."""
+
+    def test_finds_the_same_nodes_as_the_recursive_walk(self, analyzer, soup):
+        """Nodes, their text lengths, child counts and depths should match in document order."""
+        expected = recursive_content_nodes(analyzer, soup)
+
+        nodes = analyzer._find_content_nodes(soup)
+
+        assert expected
+        assert [node.element for node in nodes] == [node.element for node in expected]
+        assert [(node.text_length, node.child_count, node.depth) for node in nodes] == [
+            (node.text_length, node.child_count, node.depth) for node in expected
+        ]
+
+    def test_extracts_the_same_text_as_the_recursive_walk(self, analyzer, soup):
+        """The selected sections' text, which sentences are split from, should not change."""
+        expected_nodes = analyzer._select_best_content_nodes(recursive_content_nodes(analyzer, soup))
+        expected_text = analyzer._extract_content_from_nodes(expected_nodes)
+
+        text_cache = {}
+        nodes = analyzer._select_best_content_nodes(analyzer._find_content_nodes(soup, text_cache))
+
+        assert [node.element for node in nodes] == [node.element for node in expected_nodes]
+        assert analyzer._extract_content_from_nodes(nodes, text_cache) == expected_text
+        assert "Kepler" in expected_text and "tracking" not in expected_text
+
+
+# A paragraph of ordinary prose with the constructs the fast split special-cases
+MEETING_NOTES = (
+    "Dr. Adams opened the meeting at nine. The agenda covered budgets, hiring and the new office. "
+    "Mr. Brown asked whether the budget included travel? It did not. "
+    '"We need a decision this week," said the chair. '
+    "The team agreed to meet again on Friday. Everyone left by noon! "
+    "The minutes were sent to all staff (including contractors). Questions went to the office manager. "
+)
+
+
+def punkt_installed():
+    try:
+        sent_tokenize("One sentence. Another one.")
+    except LookupError:
+        return False
+    return True
+
+
+class TestFastSentenceSplit:
+    """Test suite for the regex sentence split used on long texts."""
+
+    def test_initials_do_not_end_sentences(self):
+        text = "The theory was proposed by J. Smith in a short paper. Later work by A. B. Jones extended it."
+
+        assert web_plugin._fast_sent_split(text) == [
+            "The theory was proposed by J. Smith in a short paper.",
+            "Later work by A. B. Jones extended it.",
+        ]
+
+    def test_known_abbreviations_do_not_end_sentences(self):
+        text = "Dr. Jones met Prof. Brown near St. Mary's vs. the old site, e.g. Fig. Two. Then they left."
+
+        assert web_plugin._fast_sent_split(text) == [
+            "Dr. Jones met Prof. Brown near St. Mary's vs. the old site, e.g. Fig. Two.",
+            "Then they left.",
+        ]
+
+    def test_abbreviation_starting_a_later_sentence(self):
+        text = "The agenda was long. Mr. Brown asked about travel. J. Smith answered."
+
+        assert web_plugin._fast_sent_split(text) == [
+            "The agenda was long.",
+            "Mr. Brown asked about travel.",
+            "J. Smith answered.",
+        ]
+
+    def test_quoted_and_bracketed_sentence_starts(self):
+        text = 'He said it was done. "Next we eat," she replied. (Then silence.) [A note follows.] The end.'
+
+        assert web_plugin._fast_sent_split(text) == [
+            "He said it was done.",
+            '"Next we eat," she replied.',
+            "(Then silence.)",
+            "[A note follows.]",
+            "The end.",
+        ]
+
+    def test_long_texts_take_the_fast_split(self, monkeypatch):
+        text = MEETING_NOTES * (web_plugin.FAST_SPLIT_MIN_CHARS // len(MEETING_NOTES) + 1)
+        monkeypatch.setattr(web_plugin, "sent_tokenize", lambda text: pytest.fail("punkt used on a long text"))
+
+        assert web_plugin._sent_tokenize(text) == tuple(web_plugin._fast_sent_split(text))
+
+    @pytest.mark.skipif(not punkt_installed(), reason="NLTK punkt data is not installed")
+    def test_agrees_with_punkt_on_a_long_text(self):
+        text = (MEETING_NOTES * (web_plugin.FAST_SPLIT_MIN_CHARS // len(MEETING_NOTES) + 1)).strip()
+        assert len(text) >= web_plugin.FAST_SPLIT_MIN_CHARS
+
+        fast = web_plugin._fast_sent_split(text)
+        punkt = sent_tokenize(text)
+
+        # The same page must not split differently just because it is long
+        assert fast == punkt
+
+
+def random_score_nodes(np, count, seed=5):
+    """Nodes with random scoring features, hitting every branch edge, built without a DOM"""
+    rng = np.random.default_rng(seed)
+    nodes = []
+    for _ in range(count):
+        node = NodeAnalysis.__new__(NodeAnalysis)
+        node.text_length = int(rng.integers(0, 5000))
+        node.html_length = int(rng.integers(1, 20000)) if rng.random() > 0.1 else 0
+        node.depth = int(rng.integers(0, 12))
+        node.child_count = int(rng.choice([0, 1, 5, 6, 15, 16, int(rng.integers(0, 60))]))
+        node.nav_count = int(rng.integers(0, 10))
+        node.word_count = int(rng.choice([10, 11, int(rng.integers(0, 800))]))
+        node.max_repetitions = int(rng.integers(0, node.word_count + 1))
+        node.text_density = node._calculate_text_density()
+        nodes.append(node)
+    return nodes
+
+
+def score_columns(np, nodes):
+    """The float64 feature columns DOMContentAnalyzer._score_nodes builds"""
+    return np.ascontiguousarray(np.array(
+        [
+            (node.text_length, node.html_length, node.depth, node.child_count,
+             node.nav_count, node.max_repetitions, node.word_count)
+            for node in nodes
+        ],
+        dtype=np.float64,
+    ).T)
+
+
+class TestContentScores:
+    """Test suite for the batch forms of NodeAnalysis._calculate_content_score."""
+
+    def test_vector_scores_match_the_per_node_formula(self):
+        np = pytest.importorskip("numpy")
+        nodes = random_score_nodes(np, 500)
+        expected = [node._calculate_content_score() for node in nodes]
+
+        scores = DOMContentAnalyzer._score_vector(*score_columns(np, nodes))
+
+        np.testing.assert_allclose(scores, expected, rtol=1e-12)
+
+    def test_large_candidate_sets_are_scored_in_one_pass(self, analyzer):
+        np = pytest.importorskip("numpy")
+        nodes = random_score_nodes(np, web_plugin.VECTOR_SCORE_MIN_NODES + 10)
+        expected = [node._calculate_content_score() for node in nodes]
+
+        analyzer._score_nodes(nodes)
+
+        assert [node.content_score for node in nodes] == pytest.approx(expected, rel=1e-9)
+
+    def test_loop_scores_match_the_per_node_formula(self):
+        np = pytest.importorskip("numpy")
+        nodes = random_score_nodes(np, 500)
+        expected = [node._calculate_content_score() for node in nodes]
+
+        scores = web_plugin._score_loop(*score_columns(np, nodes))
+
+        np.testing.assert_allclose(scores, expected, rtol=1e-12)
+
+    @pytest.mark.skipif(not web_plugin.NUMBA_AVAILABLE, reason="numba is not installed")
+    def test_compiled_kernel_matches_the_per_node_formula(self):
+        np = pytest.importorskip("numpy")
+        nodes = random_score_nodes(np, 500)
+        expected = [node._calculate_content_score() for node in nodes]
+
+        scores = web_plugin._score_kernel(*score_columns(np, nodes))
+
+        # fastmath may reassociate the weighted sum
+        np.testing.assert_allclose(scores, expected, rtol=1e-9)
+
+
+def serve(url):
+    """Status, headers and body of the fake site behind both HTTP clients"""
+    path = urlparse(url).path
+    if path == "/missing":
+        return 404, {"content-type": "text/html"}, b"Not found"
+    if path == "/large":
+        body = b"<html><body>" + b"x" * 4096 + b"</body></html>"
+    else:
+        body = NESTED_PAGE.replace("<title>Orbits</title>", f"<title>{path.strip('/')}</title>").encode()
+    return 200, {"content-type": "text/html; charset=utf-8", "content-length": str(len(body))}, body
+
+
+class ServeAdapter(requests.adapters.BaseAdapter):
+    """requests transport answering from serve(), for the path without httpx"""
+
+    def send(self, request, **kwargs):
+        status, headers, body = serve(request.url)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+ANALYZE_MANY_URLS = [
+    "https://example.com/first",
+    "not a url",
+    "https://example.com/large",
+    "https://example.com/second",
+    "https://example.com/missing",
+]
+
+
+class TestAnalyzeMany:
+    """Test suite for analyzing several pages concurrently."""
+
+    @pytest.fixture
+    def offline_analyzer(self, monkeypatch):
+        # Short pages take the regex split, so the punkt data is not needed
+        monkeypatch.setattr(web_plugin, "_ensure_punkt", lambda: None)
+        monkeypatch.setattr(web_plugin, "FAST_SPLIT_MIN_CHARS", 0)
+        analyzer = DOMContentAnalyzer(web_plugin.AnalyzerConfig(max_content_size=1024))
+        analyzer.session.mount("https://", ServeAdapter())
+        return analyzer
+
+    def assert_results(self, results):
+        assert [result["url"] for result in results] == ANALYZE_MANY_URLS
+        first, invalid, large, second, missing = results
+        assert first["page_title"] == "first" and "error" not in first
+        assert any("Kepler" in entry["sentence"] for entry in first["most_common_sentences"])
+        assert second["page_title"] == "second" and "error" not in second
+        assert invalid["error"] == "Invalid URL provided"
+        assert "Content too large" in large["error"]
+        assert "Failed to fetch webpage" in missing["error"]
+
+    @pytest.mark.asyncio
+    async def test_fetches_with_httpx(self, offline_analyzer, monkeypatch):
+        httpx = pytest.importorskip("httpx")
+
+        def handler(request):
+            status, headers, body = serve(str(request.url))
+            return httpx.Response(status, headers=headers, content=body)
+
+        monkeypatch.setattr(web_plugin, "HTTPX_AVAILABLE", True)
+        monkeypatch.setattr(httpx, "AsyncHTTPTransport", lambda **kwargs: httpx.MockTransport(handler))
+        # The synchronous path must not be used
+        monkeypatch.setattr(offline_analyzer, "analyze", lambda *args: pytest.fail("sync analyze used"))
+
+        self.assert_results(await offline_analyzer.analyze_many(ANALYZE_MANY_URLS, concurrency=2))
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_sync_analyze_without_httpx(self, offline_analyzer, monkeypatch):
+        monkeypatch.setattr(web_plugin, "HTTPX_AVAILABLE", False)
+
+        self.assert_results(await offline_analyzer.analyze_many(ANALYZE_MANY_URLS, concurrency=2))
@@ -0,0 +1,124 @@
+"""
+Unit tests for the XML to JSON plugin's document conversion.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.plugins.xml_to_json import plugin as xml_to_json
+from app.plugins.xml_to_json.models import EmphasisNode
+from app.plugins.xml_to_json.plugin import Plugin, create_structured_dataset
+
+SAMPLE_XML = b"""<?xml version="1.0" encoding="utf-8"?>
+<R>
+  <M>Front matter outside the body</M>
+  <B>
+    <P><S>Title</S> <E>Philosophiae</E> <E>Naturalis</E> Principia</P>
+    <P><S>Author</S>: Isaac <E>Newton</E></P>
+    <!-- converter note -->
+    <H l="1">Book <E>One</E></H>
+    <DIV>
+      <P>Of the <E>motion</E> of bodies <U t="Span"/> in &amp; out</P>
+      <Q><P>Every body perseveres</P></Q>
+    </DIV>
+    <RawBlock>&lt;hr/&gt;</RawBlock>
+    <U t="HorizontalRule"/>
+  </B>
+</R>
+"""
+
+
+@pytest.fixture(autouse=True)
+def downloads_dir(monkeypatch, tmp_path):
+    """Write converted documents under tmp_path instead of the app's downloads"""
+    downloads_dir = tmp_path / "downloads"
+    monkeypatch.setattr(xml_to_json, "DOWNLOADS_DIR", downloads_dir)
+    return downloads_dir
+
+
+def text(content):
+    return {"type": "text", "content": content}
+
+
+def emphasis(content):
+    return {"type": "emphasis", "content": content}
+
+
+def paragraph(*content, label=None):
+    return {"type": "paragraph", "semantic_label": label, "content": list(content)}
+
+
+SAMPLE_JSON = {
+    "metadata": {
+        "title": "Philosophiae Naturalis Principia",
+        "author": "Isaac Newton",
+        "release_date": None,
+        "language": None,
+        "credits": None,
+    },
+    "body": [
+        paragraph(emphasis("Philosophiae"), emphasis("Naturalis"), text("Principia"), label="Title"),
+        paragraph(text(": Isaac"), emphasis("Newton"), label="Author"),
+        {"type": "heading", "level": 1, "content": [text("Book"), emphasis("One")]},
+        {"type": "div", "content": [
+            paragraph(
+                text("Of the"), emphasis("motion"), text("of bodies"),
+                {"type": "structural", "element_type": "Span"}, text("in & out"),
+            ),
+            {"type": "quote", "content": [paragraph(text("Every body perseveres"))]},
+        ]},
+        {"type": "raw_html", "content": "<hr/>"},
+        {"type": "structural", "element_type": "HorizontalRule"},
+    ],
+}
+
+
+class TestStructuredDataset:
+    """Test suite for parsing Principia XML into a structured document."""
+
+    def test_whitespace_between_inline_siblings_is_kept(self):
+        """Blank text between inline elements should still separate metadata words."""
+        xml = (
+            b"<R><B>"
+            b"<P><S>Author</S> <E>Isaac</E> <E>Newton</E></P>"
+            b"<P><E>Principia</E> <E>Mathematica</E></P>"
+            b"</B></R>"
+        )
+
+        document = create_structured_dataset(xml)
+
+        assert document.metadata.author == "Isaac Newton"
+        assert document.body[1].content == [
+            EmphasisNode(content="Principia"),
+            EmphasisNode(content="Mathematica"),
+        ]
+
+    def test_converts_sample_document(self):
+        """A representative document should produce the expected metadata and body."""
+        result = Plugin().execute({"input_file": {"filename": "principia.xml", "content": SAMPLE_XML}})
+
+        output = Path(result.file_path).read_bytes()
+        assert result.file_name == "principia.json"
+        assert json.loads(output) == SAMPLE_JSON
+        # Streamed node by node, but byte-identical to dumping the whole document
+        assert output.decode("utf-8") == create_structured_dataset(SAMPLE_XML).model_dump_json(indent=2)
+
+    def test_streamed_upload_matches_in_memory_content(self, tmp_path):
+        """Parsing a spooled upload from disk should give the same JSON as in-memory content."""
+        upload = tmp_path / "upload.xml"
+        upload.write_bytes(SAMPLE_XML)
+
+        result = Plugin().execute({"input_file": {"filename": "principia.xml", "temp_path": str(upload)}})
+
+        assert json.loads(Path(result.file_path).read_bytes()) == SAMPLE_JSON
+        assert not upload.exists()
+
+    def test_output_is_written_to_the_downloads_directory(self, downloads_dir):
+        """Outputs should land where the downloads cleanup removes them, one file per request."""
+        first = Plugin().execute({"input_file": {"filename": "principia.xml", "content": SAMPLE_XML}})
+        second = Plugin().execute({"input_file": {"filename": "principia.xml", "content": SAMPLE_XML}})
+
+        assert Path(first.file_path).parent == downloads_dir
+        assert first.file_path != second.file_path
+        assert sorted(downloads_dir.iterdir()) == sorted([Path(first.file_path), Path(second.file_path)])